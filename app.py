@@ -10,9 +10,12 @@ from dotenv import load_dotenv
 
 load_dotenv()  # Load .env file before anything else
 
-from flask import Flask, render_template
+from flask import Flask, request
 from config import Config
+from database.resilience import SupabaseUnavailable, error_response
 from database.supabase_db import init_app as init_supabase_app
+from services.models import RowJSONProvider
+from services import session_store
 
 
 def create_app():
@@ -20,8 +23,12 @@ def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
 
+    # jsonify() serializes the services' row models directly
+    app.json = RowJSONProvider(app)
+
     # Session configuration for "Stay logged in"
     app.config["PERMANENT_SESSION_LIFETIME"] = timedelta(days=30)
+    session_store.init_app(app)
 
     # Initialize Supabase
     init_supabase_app(app)
@@ -33,6 +40,10 @@ def create_app():
     from routes.reports import reports_bp
     from routes.kanban import kanban_bp
     from routes.focus import focus_bp
+    from routes.batch import batch_bp
+    from routes.events import events_bp
+    from routes.search import search_bp
+    from routes.views import views_bp, render_cached
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(tasks_bp)
@@ -40,12 +51,28 @@ def create_app():
     app.register_blueprint(reports_bp)
     app.register_blueprint(kanban_bp)
     app.register_blueprint(focus_bp)
+    app.register_blueprint(batch_bp)
+    app.register_blueprint(events_bp)
+    app.register_blueprint(search_bp)
+    app.register_blueprint(views_bp)
+
+    # Routes that don't catch it still answer 503 with Retry-After
+    app.register_error_handler(SupabaseUnavailable, error_response)
+
+    from services.auth_service import AuthService
+
+    @app.before_request
+    def refresh_access_token():
+        # Static files, unknown paths and the sign-in pages don't use the token
+        if request.endpoint in (None, "static") or request.blueprint == "auth":
+            return
+        AuthService.refresh_if_expiring()
 
     # Main route - protected
     @app.route("/")
     @login_required
     def index():
-        return render_template("index.html")
+        return render_cached("index.html")
 
     return app
 
@@ -17,3 +17,57 @@ class Config:
     # Supabase configuration (set these in environment variables)
     SUPABASE_URL = os.environ.get("SUPABASE_URL")
     SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
+    # Access tokens are verified locally with the project's JWT secret (HS256),
+    # or with its JWKS for asymmetric keys (needs the cryptography package)
+    SUPABASE_JWT_SECRET = os.environ.get("SUPABASE_JWT_SECRET")
+    JWKS_CACHE_SECONDS = int(os.environ.get("JWKS_CACHE_SECONDS", "3600"))
+
+    # Resilience of Supabase queries (database/resilience.py): seconds per HTTP
+    # attempt, seconds per query including retries, retries of failed reads,
+    # and the failures in a row that open a table's circuit for a cooldown
+    SUPABASE_TIMEOUT = float(os.environ.get("SUPABASE_TIMEOUT", "5"))
+    SUPABASE_DEADLINE = float(os.environ.get("SUPABASE_DEADLINE", "10"))
+    SUPABASE_READ_RETRIES = int(os.environ.get("SUPABASE_READ_RETRIES", "2"))
+    BREAKER_FAILURES = int(os.environ.get("BREAKER_FAILURES", "5"))
+    BREAKER_COOLDOWN = float(os.environ.get("BREAKER_COOLDOWN", "30"))
+
+    # Optional direct Postgres connection for server-side stats
+    # (database/postgres_db.py); unset keeps every query on PostgREST
+    DATABASE_URL = os.environ.get("DATABASE_URL")
+    PG_POOL_MIN = int(os.environ.get("PG_POOL_MIN", "1"))
+    PG_POOL_MAX = int(os.environ.get("PG_POOL_MAX", "4"))
+    # Role whose RLS policies apply ("" for a local Postgres without Supabase roles)
+    PG_RLS_ROLE = os.environ.get("PG_RLS_ROLE", "authenticated")
+    # Prepared statements need a session (not transaction) pooler
+    PG_PREPARE = os.environ.get("PG_PREPARE", "True").lower() == "true"
+
+    # Where sessions live (services/session_store.py): "cookie" (signed cookie) or
+    # "sqlite" (a file shared by the host's workers; the cookie is then only an id).
+    # SESSION_PATH defaults to sessions.sqlite3 in the cache's private directory
+    SESSION_STORE = os.environ.get("SESSION_STORE", "cookie")
+    SESSION_PATH = os.environ.get("SESSION_PATH")
+    # Unchanged sessions are re-saved (extending their lifetime) at most this often
+    SESSION_TOUCH_SECONDS = int(os.environ.get("SESSION_TOUCH_SECONDS", str(24 * 60 * 60)))
+
+    # Live updates over Server-Sent Events (services/events.py). Each open tab
+    # holds a request, so only enable on a long-running threaded or async
+    # server; leave off on serverless hosts such as Vercel and on sync workers
+    EVENTS_ENABLED = os.environ.get("EVENTS_ENABLED", "False").lower() == "true"
+
+    # Threads shared by all requests for running independent queries concurrently
+    QUERY_WORKERS = int(os.environ.get("QUERY_WORKERS", "8"))
+
+    # Cache shared by the workers on a host (services/cache.py):
+    # "memory" (this process only), "sqlite" (a WAL file) or "shm" (shared memory).
+    # "shm" only holds values up to CACHE_SHM_SLOT_BYTES; larger ones are not
+    # cached at all (counted as "oversize" in the cache stats, with a warning)
+    CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "memory")
+    CACHE_TTL = int(os.environ.get("CACHE_TTL", "300"))
+    CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", "1024"))
+    # SQLite file path or shared-memory segment name (default: cache.sqlite3 in
+    # a private progresso-<uid> directory under the temp dir / "progresso-cache-<uid>")
+    CACHE_PATH = os.environ.get("CACHE_PATH")
+    # Largest pickled value the "shm" backend stores, at least 1024 (one slot
+    # per entry, so the segment is CACHE_MAX_ENTRIES x this). Raise it if the
+    # log warns about oversize values, e.g. for long summaries or heatmaps
+    CACHE_SHM_SLOT_BYTES = int(os.environ.get("CACHE_SHM_SLOT_BYTES", str(32 * 1024)))
@@ -0,0 +1,59 @@
+-- Progresso Database Migration: Compound indexes matching service query shapes
+-- Run this in Supabase SQL Editor if you already have tables
+-- Verify plans locally with: python explain_queries.py postgresql://localhost/progresso_explain
+
+-- Step 1: Tasks
+-- TaskService.get_all_tasks: user_id = ? AND is_archived = false ORDER BY created_at DESC
+CREATE INDEX IF NOT EXISTS idx_tasks_user_archived_created
+    ON tasks(user_id, is_archived, created_at DESC);
+
+-- Step 2: Progress logs
+-- calculate_health_score / calculate_streak / get_task_stats total count:
+-- task_id = ? AND is_completed = true [AND log_date >= ?] [ORDER BY log_date DESC]
+CREATE INDEX IF NOT EXISTS idx_progress_logs_task_completed_date
+    ON progress_logs(task_id, log_date DESC) WHERE is_completed = TRUE;
+
+-- get_summary: task_id = ? AND week_start_date = ?
+CREATE INDEX IF NOT EXISTS idx_progress_logs_task_week
+    ON progress_logs(task_id, week_start_date);
+
+-- get_task_stats average: task_id = ? AND metric_value IS NOT NULL (index-only scan)
+CREATE INDEX IF NOT EXISTS idx_progress_logs_task_values
+    ON progress_logs(task_id) INCLUDE (metric_value) WHERE metric_value IS NOT NULL;
+
+-- Step 3: Kanban items
+-- get_all_items ordering and the "max position in column" lookup:
+-- user_id = ? [AND status = ?] ORDER BY status, position
+CREATE INDEX IF NOT EXISTS idx_kanban_user_status_position
+    ON kanban_items(user_id, status, position);
+
+-- get_next_date: user_id = ? ORDER BY due_date DESC LIMIT 1
+CREATE INDEX IF NOT EXISTS idx_kanban_user_due_date
+    ON kanban_items(user_id, due_date DESC);
+
+-- Step 4: Focus sessions
+-- get_today_sessions / clear_today_sessions: user_id = ? AND started_at in range
+CREATE INDEX IF NOT EXISTS idx_focus_sessions_user_started
+    ON focus_sessions(user_id, started_at DESC);
+
+-- get_total_today / get_stats / _calculate_streak:
+-- user_id = ? AND is_completed = true [AND started_at in range], summing duration_minutes
+CREATE INDEX IF NOT EXISTS idx_focus_sessions_user_completed_started
+    ON focus_sessions(user_id, started_at) INCLUDE (duration_minutes) WHERE is_completed = TRUE;
+
+-- Step 5: Drop indexes the ones above (or a UNIQUE constraint) make redundant
+-- Each one still costs a write on every insert/update
+DROP INDEX IF EXISTS idx_tasks_user;                -- prefix of idx_tasks_user_archived_created
+DROP INDEX IF EXISTS idx_tasks_archived;            -- boolean, never queried alone
+DROP INDEX IF EXISTS idx_progress_logs_task_id;     -- prefix of UNIQUE(task_id, log_date)
+DROP INDEX IF EXISTS idx_kanban_user;               -- prefix of idx_kanban_user_status_position
+DROP INDEX IF EXISTS idx_kanban_status;             -- never queried without user_id
+DROP INDEX IF EXISTS idx_kanban_due_date;           -- replaced by idx_kanban_user_due_date
+DROP INDEX IF EXISTS idx_focus_sessions_user;       -- prefix of idx_focus_sessions_user_started
+DROP INDEX IF EXISTS idx_focus_sessions_date;       -- never queried without user_id
+
+-- Step 6: Refresh planner statistics
+ANALYZE tasks;
+ANALYZE progress_logs;
+ANALYZE kanban_items;
+ANALYZE focus_sessions;
@@ -0,0 +1,109 @@
+-- Progresso Database Migration: Per-user data version counters
+-- Run this in Supabase SQL Editor if you already have tables
+-- Every write to tasks, progress_logs, kanban_items or focus_sessions bumps the
+-- writer's counter for that domain, so a reader can tell whether its copy is
+-- still current with one primary-key lookup (see services/data_versions.py)
+-- instead of re-reading and hashing the rows. The updated_at columns, which
+-- nothing maintained so far, now follow every UPDATE as well.
+
+-- Step 1: Counter table (one row per user and domain, created on first write)
+CREATE TABLE IF NOT EXISTS user_data_versions (
+    user_id UUID NOT NULL,
+    domain TEXT NOT NULL CHECK (domain IN ('tasks', 'progress', 'kanban', 'focus')),
+    version BIGINT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (user_id, domain)
+);
+
+-- Step 2: Bump once per statement and user (a column reorder is one bump, not one per card)
+-- SECURITY DEFINER so clients only need read access to the counters
+CREATE OR REPLACE FUNCTION bump_user_data_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO user_data_versions (user_id, domain)
+    SELECT DISTINCT user_id, TG_ARGV[0] FROM changed_rows
+    ON CONFLICT (user_id, domain) DO UPDATE SET
+        version = user_data_versions.version + 1,
+        updated_at = NOW();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path FROM CURRENT;
+
+-- Transition tables need one trigger per event
+DROP TRIGGER IF EXISTS tasks_version_insert ON tasks;
+CREATE TRIGGER tasks_version_insert AFTER INSERT ON tasks
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_user_data_version('tasks');
+DROP TRIGGER IF EXISTS tasks_version_update ON tasks;
+CREATE TRIGGER tasks_version_update AFTER UPDATE ON tasks
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_user_data_version('tasks');
+DROP TRIGGER IF EXISTS tasks_version_delete ON tasks;
+CREATE TRIGGER tasks_version_delete AFTER DELETE ON tasks
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_user_data_version('tasks');
+
+DROP TRIGGER IF EXISTS progress_logs_version_insert ON progress_logs;
+CREATE TRIGGER progress_logs_version_insert AFTER INSERT ON progress_logs
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_user_data_version('progress');
+DROP TRIGGER IF EXISTS progress_logs_version_update ON progress_logs;
+CREATE TRIGGER progress_logs_version_update AFTER UPDATE ON progress_logs
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_user_data_version('progress');
+DROP TRIGGER IF EXISTS progress_logs_version_delete ON progress_logs;
+CREATE TRIGGER progress_logs_version_delete AFTER DELETE ON progress_logs
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_user_data_version('progress');
+
+DROP TRIGGER IF EXISTS kanban_items_version_insert ON kanban_items;
+CREATE TRIGGER kanban_items_version_insert AFTER INSERT ON kanban_items
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_user_data_version('kanban');
+DROP TRIGGER IF EXISTS kanban_items_version_update ON kanban_items;
+CREATE TRIGGER kanban_items_version_update AFTER UPDATE ON kanban_items
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_user_data_version('kanban');
+DROP TRIGGER IF EXISTS kanban_items_version_delete ON kanban_items;
+CREATE TRIGGER kanban_items_version_delete AFTER DELETE ON kanban_items
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_user_data_version('kanban');
+
+DROP TRIGGER IF EXISTS focus_sessions_version_insert ON focus_sessions;
+CREATE TRIGGER focus_sessions_version_insert AFTER INSERT ON focus_sessions
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_user_data_version('focus');
+DROP TRIGGER IF EXISTS focus_sessions_version_update ON focus_sessions;
+CREATE TRIGGER focus_sessions_version_update AFTER UPDATE ON focus_sessions
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_user_data_version('focus');
+DROP TRIGGER IF EXISTS focus_sessions_version_delete ON focus_sessions;
+CREATE TRIGGER focus_sessions_version_delete AFTER DELETE ON focus_sessions
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_user_data_version('focus');
+
+-- Step 3: Keep updated_at current (focus_sessions has no updated_at)
+CREATE OR REPLACE FUNCTION set_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tasks_set_updated_at ON tasks;
+CREATE TRIGGER tasks_set_updated_at BEFORE UPDATE ON tasks
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+DROP TRIGGER IF EXISTS progress_logs_set_updated_at ON progress_logs;
+CREATE TRIGGER progress_logs_set_updated_at BEFORE UPDATE ON progress_logs
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+DROP TRIGGER IF EXISTS kanban_items_set_updated_at ON kanban_items;
+CREATE TRIGGER kanban_items_set_updated_at BEFORE UPDATE ON kanban_items
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+-- Step 4: Row Level Security (counters are written only by the trigger function)
+ALTER TABLE user_data_versions ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can view own data versions" ON user_data_versions;
+CREATE POLICY "Users can view own data versions" ON user_data_versions FOR SELECT
+USING ((select auth.uid()) = user_id);
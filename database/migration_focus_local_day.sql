@@ -0,0 +1,31 @@
+-- Progresso Database Migration: Bucket focus sessions by the user's local day
+-- Run this in Supabase SQL Editor if you already have tables
+-- FocusService writes local_day (started_at's date in the browser's timezone) on insert,
+-- so today/week/streak become lookups on (user_id, local_day) instead of timestamp ranges
+
+-- Step 1: Add the column
+ALTER TABLE focus_sessions ADD COLUMN IF NOT EXISTS local_day DATE;
+
+-- Step 2: Backfill existing rows
+-- Their timezone was never recorded; older rows were written with the server's
+-- naive local time, which Supabase stored as UTC
+UPDATE focus_sessions
+SET local_day = (started_at AT TIME ZONE 'UTC')::date
+WHERE local_day IS NULL;
+
+ALTER TABLE focus_sessions ALTER COLUMN local_day SET NOT NULL;
+
+-- Step 3: Indexes keyed on the day bucket
+-- get_today_sessions / clear_today_sessions: user_id = ? AND local_day = ? ORDER BY started_at DESC
+CREATE INDEX IF NOT EXISTS idx_focus_sessions_user_day
+    ON focus_sessions(user_id, local_day, started_at DESC);
+
+-- get_total_today / get_stats / _calculate_streak: completed sessions by day, summing duration_minutes
+CREATE INDEX IF NOT EXISTS idx_focus_sessions_user_completed_day
+    ON focus_sessions(user_id, local_day) INCLUDE (duration_minutes) WHERE is_completed = TRUE;
+
+-- Step 4: Drop the started_at range indexes these replace
+DROP INDEX IF EXISTS idx_focus_sessions_user_started;
+DROP INDEX IF EXISTS idx_focus_sessions_user_completed_started;
+
+ANALYZE focus_sessions;
@@ -0,0 +1,68 @@
+-- Progresso Database Migration: Paged DONE column and automatic archiving
+-- Run this in Supabase SQL Editor if you already have tables
+-- The board used to load every card a user ever finished. It now reads the
+-- DONE column a page at a time (KanbanService.get_column_page), and cards
+-- that have been DONE for 30 days move to ARCHIVED, off the board.
+
+-- Step 1: ARCHIVED status and the time a card was marked done
+ALTER TABLE kanban_items DROP CONSTRAINT IF EXISTS kanban_items_status_check;
+ALTER TABLE kanban_items ADD CONSTRAINT kanban_items_status_check
+    CHECK (status IN ('TODO', 'IN_PROGRESS', 'DONE', 'ARCHIVED'));
+
+ALTER TABLE kanban_items ADD COLUMN IF NOT EXISTS done_at TIMESTAMPTZ;
+UPDATE kanban_items SET done_at = COALESCE(updated_at, created_at, NOW())
+WHERE status = 'DONE' AND done_at IS NULL;
+
+-- Step 2: Stamp done_at when a card enters DONE, clear it when it goes back to the board
+CREATE OR REPLACE FUNCTION kanban_items_set_done_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.status = 'DONE' AND (TG_OP = 'INSERT' OR OLD.status <> 'DONE') THEN
+        NEW.done_at = NOW();
+    ELSIF NEW.status IN ('TODO', 'IN_PROGRESS') THEN
+        NEW.done_at = NULL;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS kanban_items_set_done_at ON kanban_items;
+CREATE TRIGGER kanban_items_set_done_at
+    BEFORE INSERT OR UPDATE OF status ON kanban_items
+    FOR EACH ROW EXECUTE FUNCTION kanban_items_set_done_at();
+
+-- Step 3: Archive cards that have been DONE for longer than p_after
+-- Runs as the caller, so a client can only archive its own cards under RLS
+CREATE OR REPLACE FUNCTION archive_done_kanban_items(p_after INTERVAL DEFAULT INTERVAL '30 days')
+RETURNS INTEGER AS $$
+    WITH archived AS (
+        UPDATE kanban_items
+        SET status = 'ARCHIVED'
+        WHERE status = 'DONE' AND done_at < NOW() - p_after
+        RETURNING 1
+    )
+    SELECT count(*)::int FROM archived;
+$$ LANGUAGE sql SECURITY INVOKER;
+
+-- The nightly sweep: DONE cards by age, across all users
+CREATE INDEX IF NOT EXISTS idx_kanban_done_at ON kanban_items(done_at) WHERE status = 'DONE';
+
+-- Step 4: Run the sweep nightly (pg_cron: Database > Extensions in the Supabase dashboard)
+CREATE EXTENSION IF NOT EXISTS pg_cron;
+SELECT cron.schedule('archive-done-kanban-items', '15 3 * * *', 'SELECT archive_done_kanban_items()');
+
+-- Step 5: Re-key DONE in its current order, just below the countdown keys that
+-- ranking.prepend_key() gives newly finished cards ("0" then the countdown, which
+-- sorts before "0z"). Keys left by earlier versions were each squeezed in above
+-- the previous top and grew by a character every few cards.
+UPDATE kanban_items
+SET rank_key = ranked.rank_key
+FROM (
+    SELECT id,
+           '0z' || lpad(row_number() OVER (PARTITION BY user_id ORDER BY rank_key, id)::text, 9, '0') || 'V' AS rank_key
+    FROM kanban_items
+    WHERE status = 'DONE'
+) ranked
+WHERE ranked.id = kanban_items.id;
+
+ANALYZE kanban_items;
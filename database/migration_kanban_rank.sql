@@ -0,0 +1,61 @@
+-- Progresso Database Migration: Lexicographic rank keys for Kanban ordering
+-- Run this in Supabase SQL Editor if you already have tables
+-- Integer positions meant a "max position in column" read before every insert
+-- or move, and reordering renumbered the column one row at a time. A rank key
+-- can always be generated between two neighbours (services/ranking.py), so a
+-- single write places a card and nothing else in the column changes.
+
+-- Step 1: Add the rank column; "C" collation compares keys byte by byte
+ALTER TABLE kanban_items ADD COLUMN IF NOT EXISTS rank_key TEXT COLLATE "C";
+
+-- Step 2: Backfill from the existing order. Zero-padded row numbers sort
+-- before every clock-derived key the app hands out from now on.
+UPDATE kanban_items
+SET rank_key = ranked.rank_key
+FROM (
+    SELECT id,
+           lpad(row_number() OVER (PARTITION BY user_id, status ORDER BY position, due_date, id)::text, 9, '0') || 'V' AS rank_key
+    FROM kanban_items
+) ranked
+WHERE ranked.id = kanban_items.id
+  AND kanban_items.rank_key IS NULL;
+
+ALTER TABLE kanban_items ALTER COLUMN rank_key SET NOT NULL;
+
+-- Step 3: Replace the position index and column
+CREATE INDEX IF NOT EXISTS idx_kanban_user_status_rank ON kanban_items(user_id, status, rank_key);
+DROP INDEX IF EXISTS idx_kanban_user_status_position;
+ALTER TABLE kanban_items DROP COLUMN IF EXISTS position;
+
+-- Step 4: Assign a missing due_date in the INSERT itself (the day after the
+-- user's latest card, as KanbanService.get_next_date did with a separate read)
+CREATE OR REPLACE FUNCTION kanban_items_default_due_date()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.due_date IS NULL THEN
+        SELECT COALESCE(max(due_date) + 1, CURRENT_DATE) INTO NEW.due_date
+        FROM kanban_items
+        WHERE user_id = NEW.user_id;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS kanban_items_default_due_date ON kanban_items;
+CREATE TRIGGER kanban_items_default_due_date
+    BEFORE INSERT ON kanban_items
+    FOR EACH ROW EXECUTE FUNCTION kanban_items_default_due_date();
+
+-- Step 5: Whole-column reorder in one statement (PUT /api/kanban/reorder)
+-- SECURITY INVOKER, so RLS still limits it to the caller's rows
+CREATE OR REPLACE FUNCTION reorder_kanban_items(p_status TEXT, p_ids INTEGER[], p_ranks TEXT[], p_user_id UUID DEFAULT NULL)
+RETURNS SETOF kanban_items AS $$
+    UPDATE kanban_items k
+    SET status = p_status, rank_key = r.rank_key, updated_at = NOW()
+    FROM unnest(p_ids, p_ranks) AS r(id, rank_key)
+    WHERE k.id = r.id
+      AND (p_user_id IS NULL OR k.user_id = p_user_id)
+    RETURNING k.*;
+$$ LANGUAGE sql SECURITY INVOKER;
+
+ANALYZE kanban_items;
@@ -0,0 +1,42 @@
+-- Progresso Database Migration: Denormalize user_id onto progress_logs
+-- Run this in Supabase SQL Editor if you already have tables
+-- The old policy ran EXISTS (SELECT 1 FROM tasks ...) for every row scanned;
+-- with user_id on the row, reads become a plain equality check
+
+-- Step 1: Add the column (filled from the session on insert)
+ALTER TABLE progress_logs ADD COLUMN IF NOT EXISTS user_id UUID DEFAULT auth.uid();
+
+-- Step 2: Backfill from the parent task
+UPDATE progress_logs
+SET user_id = tasks.user_id
+FROM tasks
+WHERE tasks.id = progress_logs.task_id
+  AND progress_logs.user_id IS NULL;
+
+ALTER TABLE progress_logs ALTER COLUMN user_id SET NOT NULL;
+
+-- Step 3: Index for ProgressService.get_week_progress (user_id = ? AND week_start_date = ?)
+CREATE INDEX IF NOT EXISTS idx_progress_logs_user_week ON progress_logs(user_id, week_start_date);
+DROP INDEX IF EXISTS idx_progress_logs_week_start;  -- never queried without user_id now
+
+-- Step 4: Replace the correlated-subquery policy
+-- (select auth.uid()) is evaluated once per statement instead of once per row.
+-- Writes still check the parent task, so a log can't be attached to someone else's task;
+-- that EXISTS runs once per written row, not per scanned row.
+DROP POLICY IF EXISTS "Users can access own progress" ON progress_logs;
+DROP POLICY IF EXISTS "Users can view own progress" ON progress_logs;
+DROP POLICY IF EXISTS "Users can insert own progress" ON progress_logs;
+DROP POLICY IF EXISTS "Users can update own progress" ON progress_logs;
+DROP POLICY IF EXISTS "Users can delete own progress" ON progress_logs;
+
+CREATE POLICY "Users can view own progress" ON progress_logs FOR SELECT
+USING ((select auth.uid()) = user_id);
+CREATE POLICY "Users can insert own progress" ON progress_logs FOR INSERT
+WITH CHECK ((select auth.uid()) = user_id AND EXISTS (SELECT 1 FROM tasks WHERE tasks.id = progress_logs.task_id AND tasks.user_id = (select auth.uid())));
+CREATE POLICY "Users can update own progress" ON progress_logs FOR UPDATE
+USING ((select auth.uid()) = user_id)
+WITH CHECK ((select auth.uid()) = user_id AND EXISTS (SELECT 1 FROM tasks WHERE tasks.id = progress_logs.task_id AND tasks.user_id = (select auth.uid())));
+CREATE POLICY "Users can delete own progress" ON progress_logs FOR DELETE
+USING ((select auth.uid()) = user_id);
+
+ANALYZE progress_logs;
@@ -0,0 +1,88 @@
+-- Progresso Database Migration: Full-text search
+-- Run this in Supabase SQL Editor if you already have tables
+-- /api/search matches words in card titles and descriptions, habit names and
+-- descriptions, progress notes and focus notes. Each table gets a generated
+-- tsvector column with a GIN index, so a search reads the index instead of
+-- every row the user ever wrote.
+
+-- Step 1: Lets one GIN index also hold user_id, so a search only touches the user's entries
+CREATE EXTENSION IF NOT EXISTS btree_gin;
+
+-- Step 2: Generated search columns (titles and names outrank descriptions)
+ALTER TABLE kanban_items ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED;
+
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED;
+
+ALTER TABLE progress_logs ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(notes, ''))) STORED;
+
+ALTER TABLE focus_sessions ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(notes, ''))) STORED;
+
+-- Step 3: GIN indexes (search_user_content: user_id = ? AND search_vector @@ ?)
+CREATE INDEX IF NOT EXISTS idx_kanban_search ON kanban_items USING GIN (user_id, search_vector);
+CREATE INDEX IF NOT EXISTS idx_tasks_search ON tasks USING GIN (user_id, search_vector);
+CREATE INDEX IF NOT EXISTS idx_progress_logs_search ON progress_logs USING GIN (user_id, search_vector);
+CREATE INDEX IF NOT EXISTS idx_focus_sessions_search ON focus_sessions USING GIN (user_id, search_vector);
+
+-- Step 4: One ranked page of matches across the four tables
+-- websearch_to_tsquery accepts what people type: words, "quoted phrases", or, -excluded
+CREATE OR REPLACE FUNCTION search_user_content(
+    p_query TEXT,
+    p_limit INTEGER DEFAULT 20,
+    p_offset INTEGER DEFAULT 0,
+    p_user_id UUID DEFAULT NULL
+)
+RETURNS TABLE (
+    kind TEXT,
+    id INTEGER,
+    title TEXT,
+    body TEXT,
+    day DATE,
+    task_id INTEGER,
+    kanban_item_id INTEGER,
+    rank REAL
+) AS $$
+    WITH q AS (SELECT websearch_to_tsquery('english', p_query) AS query)
+    SELECT * FROM (
+        SELECT 'kanban', k.id, k.title::text, k.description, k.due_date, NULL::int, k.id,
+               ts_rank(k.search_vector, q.query)
+        FROM kanban_items k, q
+        WHERE k.search_vector @@ q.query
+          AND (p_user_id IS NULL OR k.user_id = p_user_id)
+        UNION ALL
+        SELECT 'task', t.id, t.name::text, t.description::text, NULL::date, t.id, NULL::int,
+               ts_rank(t.search_vector, q.query)
+        FROM tasks t, q
+        WHERE t.search_vector @@ q.query
+          AND (p_user_id IS NULL OR t.user_id = p_user_id)
+        UNION ALL
+        SELECT 'progress', l.id, t.name::text, l.notes::text, l.log_date, l.task_id, NULL::int,
+               ts_rank(l.search_vector, q.query)
+        FROM progress_logs l JOIN tasks t ON t.id = l.task_id, q
+        WHERE l.search_vector @@ q.query
+          AND (p_user_id IS NULL OR l.user_id = p_user_id)
+        UNION ALL
+        SELECT 'focus', f.id, k.title::text, f.notes, f.local_day, NULL::int, f.kanban_item_id,
+               ts_rank(f.search_vector, q.query)
+        FROM focus_sessions f LEFT JOIN kanban_items k ON k.id = f.kanban_item_id, q
+        WHERE f.search_vector @@ q.query
+          AND (p_user_id IS NULL OR f.user_id = p_user_id)
+    ) AS hits (kind, id, title, body, day, task_id, kanban_item_id, rank)
+    ORDER BY rank DESC, kind, id
+    LIMIT p_limit OFFSET p_offset;
+$$ LANGUAGE sql STABLE;
+
+-- Step 5: Refresh planner statistics
+ANALYZE kanban_items;
+ANALYZE tasks;
+ANALYZE progress_logs;
+ANALYZE focus_sessions;
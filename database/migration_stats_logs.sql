@@ -0,0 +1,16 @@
+-- Progresso Database Migration: Index for the batched statistics load
+-- Run this in Supabase SQL Editor if you already have tables
+-- ProgressService now reads all of a user's logs in keyset pages for StatsEngine
+-- instead of running count / value / health / streak queries per task.
+
+-- Step 1: load_stats_logs: user_id = ? AND task_id IN (...) [AND id > ?] ORDER BY id LIMIT 1000
+-- Covering, so each page is an index-only scan
+CREATE INDEX IF NOT EXISTS idx_progress_logs_user_id_stats
+    ON progress_logs(user_id, id) INCLUDE (task_id, log_date, is_completed, metric_value);
+
+-- Step 2: Drop the per-task statistics indexes no query uses any more
+DROP INDEX IF EXISTS idx_progress_logs_task_completed_date;
+DROP INDEX IF EXISTS idx_progress_logs_task_values;
+
+-- Step 3: Refresh planner statistics
+ANALYZE progress_logs;
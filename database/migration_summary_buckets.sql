@@ -0,0 +1,43 @@
+-- Progresso Database Migration: Monthly / quarterly summary buckets
+-- Run this in Supabase SQL Editor if you already have tables
+-- ProgressService.get_summary picks week, month or quarter buckets from the
+-- requested range and lets the database sum the weekly rollups per bucket,
+-- so a year-long report returns at most 12 rows per task.
+
+-- Step 1: Rollups summed per task and bucket
+-- A week belongs to the month / quarter its week_start_date falls in.
+-- SECURITY INVOKER: the rollups' RLS policy still applies.
+CREATE OR REPLACE FUNCTION summarize_weekly_rollups(
+    p_since DATE,
+    p_until DATE,
+    p_resolution TEXT,
+    p_user_id UUID DEFAULT NULL
+)
+RETURNS TABLE (
+    task_id INTEGER,
+    bucket_start DATE,
+    week_count INTEGER,
+    completed_count INTEGER,
+    scheduled_count INTEGER,
+    value_sum DOUBLE PRECISION,
+    value_count INTEGER,
+    value_min REAL,
+    value_max REAL
+) AS $$
+    SELECT r.task_id,
+           CASE p_resolution
+               WHEN 'week' THEN r.week_start_date
+               ELSE date_trunc(p_resolution, r.week_start_date::timestamp)::date
+           END,
+           count(*)::int,
+           sum(r.completed_count)::int,
+           sum(r.scheduled_count)::int,
+           sum(r.value_sum),
+           sum(r.value_count)::int,
+           min(r.value_min),
+           max(r.value_max)
+    FROM weekly_task_rollups r
+    WHERE r.week_start_date BETWEEN p_since AND p_until
+      AND (p_user_id IS NULL OR r.user_id = p_user_id)
+    GROUP BY 1, 2;
+$$ LANGUAGE sql STABLE;
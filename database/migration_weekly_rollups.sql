@@ -0,0 +1,136 @@
+-- Progresso Database Migration: Weekly per-task rollups
+-- Run this in Supabase SQL Editor if you already have tables
+-- ProgressService.get_summary (the trend charts and the PDF report) used to
+-- recompute every week from raw progress_logs on each call, including past
+-- weeks that can no longer change. It now reads one small row per task-week.
+
+-- Step 1: Rollup table
+CREATE TABLE IF NOT EXISTS weekly_task_rollups (
+    task_id INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL,
+    week_start_date DATE NOT NULL,
+    completed_count INTEGER NOT NULL DEFAULT 0,
+    value_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    value_count INTEGER NOT NULL DEFAULT 0,
+    value_min REAL,
+    value_max REAL,
+    scheduled_count INTEGER NOT NULL DEFAULT 0,  -- days the task is scheduled that week
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (task_id, week_start_date)
+);
+
+-- get_summary: user_id = ? AND week_start_date >= ?
+CREATE INDEX IF NOT EXISTS idx_weekly_rollups_user_week ON weekly_task_rollups(user_id, week_start_date);
+
+-- Step 2: Maintenance functions
+-- Mirrors TaskService.is_scheduled_for_day over a whole week
+CREATE OR REPLACE FUNCTION scheduled_days_per_week(p_frequency TEXT, p_custom_days TEXT)
+RETURNS INTEGER AS $$
+    SELECT CASE p_frequency
+        WHEN 'DAILY' THEN 7
+        WHEN 'WEEKDAYS' THEN 5
+        WHEN 'WEEKENDS' THEN 2
+        WHEN 'CUSTOM' THEN (
+            SELECT count(DISTINCT day)::int
+            FROM unnest(string_to_array(NULLIF(p_custom_days, ''), ',')) AS day
+        )
+        ELSE 0
+    END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Recompute one task-week from its (at most seven) logs
+-- SECURITY DEFINER so clients only need read access to the rollups
+CREATE OR REPLACE FUNCTION refresh_weekly_task_rollup(p_task_id INTEGER, p_week_start DATE)
+RETURNS VOID AS $$
+    INSERT INTO weekly_task_rollups (task_id, user_id, week_start_date, completed_count, value_sum,
+                                     value_count, value_min, value_max, scheduled_count, updated_at)
+    SELECT t.id, t.user_id, p_week_start,
+           count(l.id) FILTER (WHERE l.is_completed),
+           COALESCE(sum(l.metric_value), 0),
+           count(l.metric_value),
+           min(l.metric_value),
+           max(l.metric_value),
+           scheduled_days_per_week(t.frequency, t.custom_days),
+           NOW()
+    FROM tasks t
+    LEFT JOIN progress_logs l ON l.task_id = t.id AND l.week_start_date = p_week_start
+    WHERE t.id = p_task_id
+    GROUP BY t.id
+    ON CONFLICT (task_id, week_start_date) DO UPDATE SET
+        completed_count = EXCLUDED.completed_count,
+        value_sum = EXCLUDED.value_sum,
+        value_count = EXCLUDED.value_count,
+        value_min = EXCLUDED.value_min,
+        value_max = EXCLUDED.value_max,
+        -- Past weeks keep their schedule (see tasks_refresh_rollup_schedule)
+        scheduled_count = CASE
+            WHEN weekly_task_rollups.week_start_date < (CURRENT_DATE - 1) - extract(dow FROM CURRENT_DATE - 1)::int
+            THEN weekly_task_rollups.scheduled_count
+            ELSE EXCLUDED.scheduled_count
+        END,
+        updated_at = EXCLUDED.updated_at;
+$$ LANGUAGE sql SECURITY DEFINER SET search_path FROM CURRENT;
+
+CREATE OR REPLACE FUNCTION progress_logs_refresh_rollup()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM refresh_weekly_task_rollup(OLD.task_id, OLD.week_start_date);
+    END IF;
+    IF TG_OP = 'INSERT'
+       OR (TG_OP = 'UPDATE' AND (NEW.task_id, NEW.week_start_date) IS DISTINCT FROM (OLD.task_id, OLD.week_start_date)) THEN
+        PERFORM refresh_weekly_task_rollup(NEW.task_id, NEW.week_start_date);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path FROM CURRENT;
+
+-- A new schedule applies from the current week on; past weeks keep the one they had.
+-- The day of slack covers users whose week hasn't turned over yet in their timezone.
+CREATE OR REPLACE FUNCTION tasks_refresh_rollup_schedule()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE weekly_task_rollups
+    SET scheduled_count = scheduled_days_per_week(NEW.frequency, NEW.custom_days), updated_at = NOW()
+    WHERE task_id = NEW.id
+      AND week_start_date >= (CURRENT_DATE - 1) - extract(dow FROM CURRENT_DATE - 1)::int;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path FROM CURRENT;
+
+-- Step 3: Keep rollups current on every write
+DROP TRIGGER IF EXISTS progress_logs_refresh_rollup ON progress_logs;
+CREATE TRIGGER progress_logs_refresh_rollup
+    AFTER INSERT OR UPDATE OR DELETE ON progress_logs
+    FOR EACH ROW EXECUTE FUNCTION progress_logs_refresh_rollup();
+
+DROP TRIGGER IF EXISTS tasks_refresh_rollup_schedule ON tasks;
+CREATE TRIGGER tasks_refresh_rollup_schedule
+    AFTER UPDATE OF frequency, custom_days ON tasks
+    FOR EACH ROW EXECUTE FUNCTION tasks_refresh_rollup_schedule();
+
+-- Step 4: Backfill from existing logs
+INSERT INTO weekly_task_rollups (task_id, user_id, week_start_date, completed_count, value_sum,
+                                 value_count, value_min, value_max, scheduled_count)
+SELECT t.id, t.user_id, l.week_start_date,
+       count(*) FILTER (WHERE l.is_completed),
+       COALESCE(sum(l.metric_value), 0),
+       count(l.metric_value),
+       min(l.metric_value),
+       max(l.metric_value),
+       scheduled_days_per_week(t.frequency, t.custom_days)
+FROM progress_logs l
+JOIN tasks t ON t.id = l.task_id
+GROUP BY t.id, l.week_start_date
+ON CONFLICT (task_id, week_start_date) DO NOTHING;
+
+-- Step 5: Read-only for clients; writes only happen through the triggers above
+ALTER TABLE weekly_task_rollups ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Users can view own rollups" ON weekly_task_rollups;
+CREATE POLICY "Users can view own rollups" ON weekly_task_rollups FOR SELECT
+USING ((select auth.uid()) = user_id);
+
+-- Only the triggers may call it: through the API it would write any task's rollup
+REVOKE EXECUTE ON FUNCTION refresh_weekly_task_rollup(INTEGER, DATE) FROM PUBLIC, anon, authenticated;
+
+ANALYZE weekly_task_rollups;
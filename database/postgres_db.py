@@ -0,0 +1,99 @@
+"""
+Optional direct Postgres backend for server-side aggregation
+
+PostgREST returns rows as JSON over HTTP, so aggregates like focus totals
+were summed in Python after pulling every row. With DATABASE_URL set (the
+Supabase "Session pooler" or direct connection string) and psycopg installed,
+the hot stats queries instead run as SQL on a process-wide connection pool:
+GROUP BY / FILTER aggregates and window functions on the server, prepared
+once per connection. Without either, the services keep using PostgREST.
+
+Scoping: every query is tied to one user. It must filter on %(user_id)s
+itself (which also lets it use the (user_id, ...) indexes), and it runs in a
+transaction as PG_RLS_ROLE with the user's id in request.jwt.claims, so the
+same RLS policies as PostgREST apply on top. Set PG_RLS_ROLE to "" for a local
+Postgres without Supabase's roles; the explicit filters still scope it.
+
+Rows come back shaped like PostgREST's JSON (dates as ISO strings, numerics
+as floats), so the services treat both paths alike.
+
+Requires: pip install "psycopg[binary,pool]"
+"""
+
+import json
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from flask import current_app, has_app_context
+
+try:
+    from psycopg import sql
+    from psycopg.rows import dict_row
+    from psycopg_pool import ConnectionPool
+except ImportError:
+    ConnectionPool = None
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _setting(name, default=None):
+    return current_app.config.get(name, default) if has_app_context() else default
+
+
+def is_enabled():
+    """Whether a DATABASE_URL is configured and psycopg is installed"""
+    return ConnectionPool is not None and bool(_setting("DATABASE_URL"))
+
+
+def get_pool():
+    """Process-wide pool, sized by PG_POOL_MIN / PG_POOL_MAX"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                timeout_ms = int(_setting("SUPABASE_TIMEOUT", 5) * 1000)
+                _pool = ConnectionPool(
+                    _setting("DATABASE_URL"),
+                    min_size=_setting("PG_POOL_MIN", 1),
+                    max_size=_setting("PG_POOL_MAX", 4),
+                    # Same per-query budget as an HTTP attempt against PostgREST
+                    kwargs={"options": f"-c statement_timeout={timeout_ms}"},
+                    timeout=timeout_ms / 1000,
+                    open=True,
+                )
+    return _pool
+
+
+def _json_shaped(row):
+    """A row as PostgREST would have returned it"""
+    for key, value in row.items():
+        if isinstance(value, (date, datetime)):
+            row[key] = value.isoformat()
+        elif isinstance(value, Decimal):
+            row[key] = float(value)
+    return row
+
+
+def fetch_all(query, user_id, **params):
+    """Rows of a query scoped to user_id (referenced in it as %(user_id)s)"""
+    if not user_id:
+        raise ValueError("A user is required for direct database queries")
+    params["user_id"] = user_id
+
+    role = _setting("PG_RLS_ROLE", "authenticated")
+    claims = json.dumps({"sub": str(user_id), "role": role or "authenticated"})
+
+    with get_pool().connection() as conn:
+        with conn.transaction(), conn.cursor(row_factory=dict_row) as cur:
+            if role:
+                cur.execute(sql.SQL("SET LOCAL ROLE {}").format(sql.Identifier(role)))
+                cur.execute("SELECT set_config('request.jwt.claims', %s, true)", (claims,))
+            # The transaction pooler can't keep prepared statements; PG_PREPARE=false there
+            cur.execute(query, params, prepare=_setting("PG_PREPARE", True))
+            return [_json_shaped(row) for row in cur.fetchall()]
+
+
+def fetch_one(query, user_id, **params):
+    rows = fetch_all(query, user_id, **params)
+    return rows[0] if rows else None
@@ -0,0 +1,255 @@
+"""
+Deadlines, retries and circuit breakers around Supabase queries
+
+get_supabase() hands out a ResilientClient: table() and rpc() return the
+usual PostgREST builders, wrapped so that execute()
+
+- gives up at the query's deadline (SUPABASE_DEADLINE, retries included;
+  each HTTP attempt is cut off after SUPABASE_TIMEOUT or whatever is left
+  of the deadline, if less), instead of holding a worker thread for as long
+  as a slow region takes;
+- retries reads that failed for a transient reason (network errors, timeouts,
+  PostgREST unable to reach the database) a bounded number of times, after a
+  random ("full jitter") backoff so retrying workers don't arrive together;
+- fails fast while the table's circuit is open: after BREAKER_FAILURES
+  transient failures in a row, calls to that table raise SupabaseUnavailable
+  at once for BREAKER_COOLDOWN seconds, then one trial call decides whether
+  it closes again.
+
+Writes are never retried (an insert that timed out may have happened). Read
+endpoints that go through coalesced() serve their last good payload, flagged
+"stale", while the database is unavailable; the others (see error_response)
+answer 503 with a Retry-After of when the circuit may close.
+"""
+
+import math
+import random
+import threading
+import time
+import httpx
+from flask import current_app, has_app_context, jsonify
+from postgrest.exceptions import APIError
+
+DEFAULT_TIMEOUT = 5
+DEFAULT_DEADLINE = 10
+DEFAULT_READ_RETRIES = 2
+DEFAULT_BREAKER_FAILURES = 5
+DEFAULT_BREAKER_COOLDOWN = 30
+
+# Backoff before retry n is uniform in [0, min(cap, base * 2**n)] seconds
+BACKOFF_BASE = 0.1
+BACKOFF_CAP = 1.0
+
+# Database functions that only read, so they may be retried like a select
+READ_FUNCTIONS = {"search_user_content", "summarize_weekly_rollups"}
+
+# PostgREST could not reach the database, or a gateway in front of it failed
+TRANSIENT_CODES = {"PGRST000", "PGRST001", "PGRST002", "PGRST003", 502, 503, 504}
+
+
+class SupabaseUnavailable(Exception):
+    """A table's circuit is open, or a query ran out of retries or time"""
+
+    def __init__(self, message, retry_after=1):
+        super().__init__(message)
+        # Seconds until a call is worth trying again
+        self.retry_after = retry_after
+
+
+def error_response(error):
+    """A route's response to an unexpected error: 503 while Supabase is unavailable, else 500"""
+    if isinstance(error, SupabaseUnavailable):
+        response = jsonify({"error": "The database is temporarily unavailable"})
+        response.status_code = 503
+        response.headers["Retry-After"] = str(error.retry_after)
+        return response
+    return jsonify({"error": str(error)}), 500
+
+
+def _setting(name, default):
+    return current_app.config.get(name, default) if has_app_context() else default
+
+
+def is_transient(error):
+    """Whether a failed call may succeed if tried again"""
+    if isinstance(error, httpx.TransportError):
+        return True
+    return isinstance(error, APIError) and error.code in TRANSIENT_CODES
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker for one table (or database function)"""
+
+    def __init__(self, failures, cooldown):
+        self.failures = failures
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failed = 0
+        self._opened_at = None
+        self._trial = False
+
+    def allow(self):
+        """Whether a call may go through now (one trial call once the cooldown is over)"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial or time.monotonic() - self._opened_at < self.cooldown:
+                return False
+            self._trial = True
+            return True
+
+    def succeeded(self):
+        with self._lock:
+            self._failed = 0
+            self._opened_at = None
+            self._trial = False
+
+    def failed(self):
+        with self._lock:
+            self._failed += 1
+            if self._trial or self._failed >= self.failures:
+                self._opened_at = time.monotonic()
+            self._trial = False
+
+    def retry_after(self):
+        """Whole seconds until the circuit lets a trial call through (at least 1)"""
+        with self._lock:
+            if self._opened_at is None:
+                return 1
+            remaining = self.cooldown - (time.monotonic() - self._opened_at)
+            return max(1, math.ceil(remaining))
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half-open" if self._trial else "open"
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name):
+    """This process's breaker for a table"""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(name)
+            if breaker is None:
+                breaker = _breakers[name] = CircuitBreaker(
+                    _setting("BREAKER_FAILURES", DEFAULT_BREAKER_FAILURES),
+                    _setting("BREAKER_COOLDOWN", DEFAULT_BREAKER_COOLDOWN),
+                )
+    return breaker
+
+
+def run_query(name, execute, read, deadline=None):
+    """execute(timeout) under the table's breaker, retried within deadline if it is a read.
+
+    timeout is the seconds the attempt may take: SUPABASE_TIMEOUT, or what is
+    left of the deadline if that is less.
+    """
+    breaker = get_breaker(name)
+    deadline = _setting("SUPABASE_DEADLINE", DEFAULT_DEADLINE) if deadline is None else deadline
+    retries = _setting("SUPABASE_READ_RETRIES", DEFAULT_READ_RETRIES) if read else 0
+    attempt_timeout = _setting("SUPABASE_TIMEOUT", DEFAULT_TIMEOUT)
+    give_up_at = time.monotonic() + deadline
+
+    attempt = 0
+    while True:
+        if not breaker.allow():
+            raise SupabaseUnavailable(f"{name} is unavailable (circuit open)", breaker.retry_after())
+        try:
+            result = execute(min(attempt_timeout, give_up_at - time.monotonic()))
+        except Exception as e:
+            if not is_transient(e):
+                # The database answered (a bad request, a constraint): it is up
+                breaker.succeeded()
+                raise
+            breaker.failed()
+            backoff = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt))
+            if attempt >= retries or time.monotonic() + backoff >= give_up_at:
+                raise SupabaseUnavailable(f"{name} is unavailable: {e}", breaker.retry_after()) from e
+            attempt += 1
+            time.sleep(backoff)
+            continue
+        breaker.succeeded()
+        return result
+
+
+class _AttemptSession:
+    """A builder's httpx client, with one attempt's timeout on its requests"""
+
+    __slots__ = ("_session", "_timeout")
+
+    def __init__(self, session, timeout):
+        self._session = session
+        self._timeout = timeout
+
+    def request(self, *args, **kwargs):
+        return self._session.request(*args, timeout=self._timeout, **kwargs)
+
+    def __getattr__(self, attr):
+        return getattr(self._session, attr)
+
+
+class ResilientQuery:
+    """A PostgREST builder whose execute() goes through run_query"""
+
+    __slots__ = ("_builder", "_name", "_read")
+
+    def __init__(self, builder, name, read=None):
+        self._builder = builder
+        self._name = name
+        self._read = read
+
+    def __getattr__(self, attr):
+        value = getattr(self._builder, attr)
+        if callable(value):
+            def call(*args, **kwargs):
+                return self._wrap(value(*args, **kwargs))
+            return call
+        return self._wrap(value)  # e.g. .not_
+
+    def _wrap(self, value):
+        if hasattr(value, "execute") and not isinstance(value, ResilientQuery):
+            return ResilientQuery(value, self._name, self._read)
+        return value
+
+    def execute(self):
+        read = self._read
+        if read is None:
+            read = getattr(self._builder, "http_method", None) in ("GET", "HEAD")
+        return run_query(self._name, self._execute_within, read)
+
+    def _execute_within(self, timeout):
+        builder = self._builder
+        session = getattr(builder, "session", None)
+        if session is None:
+            return builder.execute()
+        builder.session = _AttemptSession(session, timeout)
+        try:
+            return builder.execute()
+        finally:
+            builder.session = session
+
+
+class ResilientClient:
+    """A Supabase client whose table() and rpc() queries are guarded"""
+
+    def __init__(self, client):
+        self._client = client
+
+    def __getattr__(self, attr):
+        return getattr(self._client, attr)
+
+    def table(self, name):
+        return ResilientQuery(self._client.table(name), name)
+
+    from_ = table
+
+    def rpc(self, fn, params=None, **kwargs):
+        builder = self._client.rpc(fn, {} if params is None else params, **kwargs)
+        return ResilientQuery(builder, fn, read=fn in READ_FUNCTIONS)
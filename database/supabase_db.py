@@ -4,8 +4,9 @@ Replaces SQLite with PostgreSQL via Supabase
 """
 
 import os
-from supabase import create_client, Client
+from supabase import create_client, Client, ClientOptions
 from flask import g, current_app
+from database.resilience import DEFAULT_TIMEOUT, ResilientClient
 
 
 def get_supabase(use_auth: bool = True) -> Client:
@@ -21,9 +22,12 @@ def get_supabase(use_auth: bool = True) -> Client:
     if not url or not key:
         raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set")
 
-    # Create a new client or get the existing one
+    # Create a new client or get the existing one; every HTTP attempt gets
+    # SUPABASE_TIMEOUT, and queries go through deadlines/retries/breakers
     if "supabase" not in g:
-        g.supabase = create_client(url, key)
+        timeout = current_app.config.get("SUPABASE_TIMEOUT", DEFAULT_TIMEOUT)
+        options = ClientOptions(postgrest_client_timeout=timeout)
+        g.supabase = ResilientClient(create_client(url, key, options=options))
 
     # Set the user's access token on the postgrest client headers
     # This is critical for RLS policies to work correctly with auth.uid()
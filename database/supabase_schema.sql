@@ -1,6 +1,9 @@
 -- Progresso PostgreSQL Schema for Supabase (with user isolation)
 -- Run this in the Supabase SQL Editor to create your tables
 
+-- GIN indexes that also hold user_id (the search indexes below)
+CREATE EXTENSION IF NOT EXISTS btree_gin;
+
 -- Tasks table: Stores habit/task definitions
 CREATE TABLE IF NOT EXISTS tasks (
     id SERIAL PRIMARY KEY,
@@ -14,13 +17,18 @@ CREATE TABLE IF NOT EXISTS tasks (
     custom_days VARCHAR(20),
     is_archived BOOLEAN DEFAULT FALSE,
     created_at TIMESTAMPTZ DEFAULT NOW(),
-    updated_at TIMESTAMPTZ DEFAULT NOW()
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
 );
 
 -- Progress logs table: Stores daily completion records
 CREATE TABLE IF NOT EXISTS progress_logs (
     id SERIAL PRIMARY KEY,
     task_id INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL DEFAULT auth.uid(),
     log_date DATE NOT NULL,
     week_start_date DATE NOT NULL,
     metric_value REAL,
@@ -28,6 +36,7 @@ CREATE TABLE IF NOT EXISTS progress_logs (
     notes VARCHAR(200),
     created_at TIMESTAMPTZ DEFAULT NOW(),
     updated_at TIMESTAMPTZ DEFAULT NOW(),
+    search_vector TSVECTOR GENERATED ALWAYS AS (to_tsvector('english', coalesce(notes, ''))) STORED,
     UNIQUE(task_id, log_date)
 );
 
@@ -38,10 +47,15 @@ CREATE TABLE IF NOT EXISTS kanban_items (
     title VARCHAR(200) NOT NULL,
     description TEXT,
     due_date DATE NOT NULL,
-    status VARCHAR(20) DEFAULT 'TODO' CHECK (status IN ('TODO', 'IN_PROGRESS', 'DONE')),
-    position INTEGER DEFAULT 0,
+    status VARCHAR(20) DEFAULT 'TODO' CHECK (status IN ('TODO', 'IN_PROGRESS', 'DONE', 'ARCHIVED')),
+    rank_key TEXT COLLATE "C" NOT NULL,  -- lexicographic order within a column, see services/ranking.py
+    done_at TIMESTAMPTZ,  -- set when the card entered DONE; archived 30 days later
     created_at TIMESTAMPTZ DEFAULT NOW(),
-    updated_at TIMESTAMPTZ DEFAULT NOW()
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
 );
 
 -- Focus sessions table: Stores Pomodoro timer sessions
@@ -51,30 +65,379 @@ CREATE TABLE IF NOT EXISTS focus_sessions (
     kanban_item_id INTEGER REFERENCES kanban_items(id) ON DELETE SET NULL,
     duration_minutes INTEGER NOT NULL,
     started_at TIMESTAMPTZ NOT NULL,
+    local_day DATE NOT NULL,  -- started_at's date in the user's timezone
     ended_at TIMESTAMPTZ,
     is_completed BOOLEAN DEFAULT FALSE,
     notes TEXT,
-    created_at TIMESTAMPTZ DEFAULT NOW()
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    search_vector TSVECTOR GENERATED ALWAYS AS (to_tsvector('english', coalesce(notes, ''))) STORED
+);
+
+-- Weekly per-task rollups: maintained by triggers on progress_logs, read by ProgressService.get_summary
+CREATE TABLE IF NOT EXISTS weekly_task_rollups (
+    task_id INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL,
+    week_start_date DATE NOT NULL,
+    completed_count INTEGER NOT NULL DEFAULT 0,
+    value_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    value_count INTEGER NOT NULL DEFAULT 0,
+    value_min REAL,
+    value_max REAL,
+    scheduled_count INTEGER NOT NULL DEFAULT 0,  -- days the task is scheduled that week
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (task_id, week_start_date)
 );
 
--- Indexes for performance
-CREATE INDEX IF NOT EXISTS idx_tasks_user ON tasks(user_id);
-CREATE INDEX IF NOT EXISTS idx_progress_logs_task_id ON progress_logs(task_id);
+-- Per-user, per-domain change counters: bumped by triggers on the four tables above
+CREATE TABLE IF NOT EXISTS user_data_versions (
+    user_id UUID NOT NULL,
+    domain TEXT NOT NULL CHECK (domain IN ('tasks', 'progress', 'kanban', 'focus')),
+    version BIGINT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (user_id, domain)
+);
+
+-- Indexes for performance (shaped after the service queries, see migration_compound_indexes.sql)
+CREATE INDEX IF NOT EXISTS idx_tasks_user_archived_created ON tasks(user_id, is_archived, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_progress_logs_log_date ON progress_logs(log_date);
-CREATE INDEX IF NOT EXISTS idx_progress_logs_week_start ON progress_logs(week_start_date);
-CREATE INDEX IF NOT EXISTS idx_tasks_archived ON tasks(is_archived);
-CREATE INDEX IF NOT EXISTS idx_kanban_user ON kanban_items(user_id);
-CREATE INDEX IF NOT EXISTS idx_kanban_status ON kanban_items(status);
-CREATE INDEX IF NOT EXISTS idx_kanban_due_date ON kanban_items(due_date);
-CREATE INDEX IF NOT EXISTS idx_focus_sessions_user ON focus_sessions(user_id);
-CREATE INDEX IF NOT EXISTS idx_focus_sessions_date ON focus_sessions(started_at);
+CREATE INDEX IF NOT EXISTS idx_progress_logs_user_week ON progress_logs(user_id, week_start_date);
+CREATE INDEX IF NOT EXISTS idx_progress_logs_task_week ON progress_logs(task_id, week_start_date);
+CREATE INDEX IF NOT EXISTS idx_progress_logs_user_id_stats ON progress_logs(user_id, id) INCLUDE (task_id, log_date, is_completed, metric_value);
+CREATE INDEX IF NOT EXISTS idx_kanban_user_status_rank ON kanban_items(user_id, status, rank_key);
+CREATE INDEX IF NOT EXISTS idx_kanban_user_due_date ON kanban_items(user_id, due_date DESC);
+CREATE INDEX IF NOT EXISTS idx_kanban_done_at ON kanban_items(done_at) WHERE status = 'DONE';
+CREATE INDEX IF NOT EXISTS idx_focus_sessions_user_day ON focus_sessions(user_id, local_day, started_at DESC);
+CREATE INDEX IF NOT EXISTS idx_focus_sessions_user_completed_day ON focus_sessions(user_id, local_day) INCLUDE (duration_minutes) WHERE is_completed = TRUE;
 CREATE INDEX IF NOT EXISTS idx_focus_sessions_task ON focus_sessions(kanban_item_id);
+CREATE INDEX IF NOT EXISTS idx_weekly_rollups_user_week ON weekly_task_rollups(user_id, week_start_date);
+CREATE INDEX IF NOT EXISTS idx_kanban_search ON kanban_items USING GIN (user_id, search_vector);
+CREATE INDEX IF NOT EXISTS idx_tasks_search ON tasks USING GIN (user_id, search_vector);
+CREATE INDEX IF NOT EXISTS idx_progress_logs_search ON progress_logs USING GIN (user_id, search_vector);
+CREATE INDEX IF NOT EXISTS idx_focus_sessions_search ON focus_sessions USING GIN (user_id, search_vector);
+
+-- Kanban: fill a missing due_date with the day after the user's latest card
+CREATE OR REPLACE FUNCTION kanban_items_default_due_date()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.due_date IS NULL THEN
+        SELECT COALESCE(max(due_date) + 1, CURRENT_DATE) INTO NEW.due_date
+        FROM kanban_items
+        WHERE user_id = NEW.user_id;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS kanban_items_default_due_date ON kanban_items;
+CREATE TRIGGER kanban_items_default_due_date
+    BEFORE INSERT ON kanban_items
+    FOR EACH ROW EXECUTE FUNCTION kanban_items_default_due_date();
+
+-- Kanban: apply a whole column's order in one statement (RLS still applies)
+CREATE OR REPLACE FUNCTION reorder_kanban_items(p_status TEXT, p_ids INTEGER[], p_ranks TEXT[], p_user_id UUID DEFAULT NULL)
+RETURNS SETOF kanban_items AS $$
+    UPDATE kanban_items k
+    SET status = p_status, rank_key = r.rank_key, updated_at = NOW()
+    FROM unnest(p_ids, p_ranks) AS r(id, rank_key)
+    WHERE k.id = r.id
+      AND (p_user_id IS NULL OR k.user_id = p_user_id)
+    RETURNING k.*;
+$$ LANGUAGE sql SECURITY INVOKER;
+
+-- Kanban: stamp done_at when a card enters DONE, clear it when it goes back to the board
+CREATE OR REPLACE FUNCTION kanban_items_set_done_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.status = 'DONE' AND (TG_OP = 'INSERT' OR OLD.status <> 'DONE') THEN
+        NEW.done_at = NOW();
+    ELSIF NEW.status IN ('TODO', 'IN_PROGRESS') THEN
+        NEW.done_at = NULL;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS kanban_items_set_done_at ON kanban_items;
+CREATE TRIGGER kanban_items_set_done_at
+    BEFORE INSERT OR UPDATE OF status ON kanban_items
+    FOR EACH ROW EXECUTE FUNCTION kanban_items_set_done_at();
+
+-- Kanban: archive cards that have been DONE for longer than p_after (nightly, see pg_cron below)
+-- Runs as the caller, so a client can only archive its own cards under RLS
+CREATE OR REPLACE FUNCTION archive_done_kanban_items(p_after INTERVAL DEFAULT INTERVAL '30 days')
+RETURNS INTEGER AS $$
+    WITH archived AS (
+        UPDATE kanban_items
+        SET status = 'ARCHIVED'
+        WHERE status = 'DONE' AND done_at < NOW() - p_after
+        RETURNING 1
+    )
+    SELECT count(*)::int FROM archived;
+$$ LANGUAGE sql SECURITY INVOKER;
+
+-- Weekly rollups: recomputed for the affected task-week on every progress_logs write
+-- Mirrors TaskService.is_scheduled_for_day over a whole week
+CREATE OR REPLACE FUNCTION scheduled_days_per_week(p_frequency TEXT, p_custom_days TEXT)
+RETURNS INTEGER AS $$
+    SELECT CASE p_frequency
+        WHEN 'DAILY' THEN 7
+        WHEN 'WEEKDAYS' THEN 5
+        WHEN 'WEEKENDS' THEN 2
+        WHEN 'CUSTOM' THEN (
+            SELECT count(DISTINCT day)::int
+            FROM unnest(string_to_array(NULLIF(p_custom_days, ''), ',')) AS day
+        )
+        ELSE 0
+    END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Recompute one task-week from its (at most seven) logs
+-- SECURITY DEFINER so clients only need read access to the rollups
+CREATE OR REPLACE FUNCTION refresh_weekly_task_rollup(p_task_id INTEGER, p_week_start DATE)
+RETURNS VOID AS $$
+    INSERT INTO weekly_task_rollups (task_id, user_id, week_start_date, completed_count, value_sum,
+                                     value_count, value_min, value_max, scheduled_count, updated_at)
+    SELECT t.id, t.user_id, p_week_start,
+           count(l.id) FILTER (WHERE l.is_completed),
+           COALESCE(sum(l.metric_value), 0),
+           count(l.metric_value),
+           min(l.metric_value),
+           max(l.metric_value),
+           scheduled_days_per_week(t.frequency, t.custom_days),
+           NOW()
+    FROM tasks t
+    LEFT JOIN progress_logs l ON l.task_id = t.id AND l.week_start_date = p_week_start
+    WHERE t.id = p_task_id
+    GROUP BY t.id
+    ON CONFLICT (task_id, week_start_date) DO UPDATE SET
+        completed_count = EXCLUDED.completed_count,
+        value_sum = EXCLUDED.value_sum,
+        value_count = EXCLUDED.value_count,
+        value_min = EXCLUDED.value_min,
+        value_max = EXCLUDED.value_max,
+        -- Past weeks keep their schedule (see tasks_refresh_rollup_schedule)
+        scheduled_count = CASE
+            WHEN weekly_task_rollups.week_start_date < (CURRENT_DATE - 1) - extract(dow FROM CURRENT_DATE - 1)::int
+            THEN weekly_task_rollups.scheduled_count
+            ELSE EXCLUDED.scheduled_count
+        END,
+        updated_at = EXCLUDED.updated_at;
+$$ LANGUAGE sql SECURITY DEFINER SET search_path FROM CURRENT;
+
+CREATE OR REPLACE FUNCTION progress_logs_refresh_rollup()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM refresh_weekly_task_rollup(OLD.task_id, OLD.week_start_date);
+    END IF;
+    IF TG_OP = 'INSERT'
+       OR (TG_OP = 'UPDATE' AND (NEW.task_id, NEW.week_start_date) IS DISTINCT FROM (OLD.task_id, OLD.week_start_date)) THEN
+        PERFORM refresh_weekly_task_rollup(NEW.task_id, NEW.week_start_date);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path FROM CURRENT;
+
+-- A new schedule applies from the current week on; past weeks keep the one they had.
+-- The day of slack covers users whose week hasn't turned over yet in their timezone.
+CREATE OR REPLACE FUNCTION tasks_refresh_rollup_schedule()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE weekly_task_rollups
+    SET scheduled_count = scheduled_days_per_week(NEW.frequency, NEW.custom_days), updated_at = NOW()
+    WHERE task_id = NEW.id
+      AND week_start_date >= (CURRENT_DATE - 1) - extract(dow FROM CURRENT_DATE - 1)::int;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path FROM CURRENT;
+
+DROP TRIGGER IF EXISTS progress_logs_refresh_rollup ON progress_logs;
+CREATE TRIGGER progress_logs_refresh_rollup
+    AFTER INSERT OR UPDATE OR DELETE ON progress_logs
+    FOR EACH ROW EXECUTE FUNCTION progress_logs_refresh_rollup();
+
+DROP TRIGGER IF EXISTS tasks_refresh_rollup_schedule ON tasks;
+CREATE TRIGGER tasks_refresh_rollup_schedule
+    AFTER UPDATE OF frequency, custom_days ON tasks
+    FOR EACH ROW EXECUTE FUNCTION tasks_refresh_rollup_schedule();
+
+-- Summary buckets: rollups summed per task and week / month / quarter
+CREATE OR REPLACE FUNCTION summarize_weekly_rollups(
+    p_since DATE,
+    p_until DATE,
+    p_resolution TEXT,
+    p_user_id UUID DEFAULT NULL
+)
+RETURNS TABLE (
+    task_id INTEGER,
+    bucket_start DATE,
+    week_count INTEGER,
+    completed_count INTEGER,
+    scheduled_count INTEGER,
+    value_sum DOUBLE PRECISION,
+    value_count INTEGER,
+    value_min REAL,
+    value_max REAL
+) AS $$
+    SELECT r.task_id,
+           CASE p_resolution
+               WHEN 'week' THEN r.week_start_date
+               ELSE date_trunc(p_resolution, r.week_start_date::timestamp)::date
+           END,
+           count(*)::int,
+           sum(r.completed_count)::int,
+           sum(r.scheduled_count)::int,
+           sum(r.value_sum),
+           sum(r.value_count)::int,
+           min(r.value_min),
+           max(r.value_max)
+    FROM weekly_task_rollups r
+    WHERE r.week_start_date BETWEEN p_since AND p_until
+      AND (p_user_id IS NULL OR r.user_id = p_user_id)
+    GROUP BY 1, 2;
+$$ LANGUAGE sql STABLE;
+
+-- Data versions: bump once per statement and user (a column reorder is one bump, not one per card)
+-- SECURITY DEFINER so clients only need read access to the counters
+CREATE OR REPLACE FUNCTION bump_user_data_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO user_data_versions (user_id, domain)
+    SELECT DISTINCT user_id, TG_ARGV[0] FROM changed_rows
+    ON CONFLICT (user_id, domain) DO UPDATE SET
+        version = user_data_versions.version + 1,
+        updated_at = NOW();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path FROM CURRENT;
+
+-- Transition tables need one trigger per event
+DROP TRIGGER IF EXISTS tasks_version_insert ON tasks;
+CREATE TRIGGER tasks_version_insert AFTER INSERT ON tasks
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_user_data_version('tasks');
+DROP TRIGGER IF EXISTS tasks_version_update ON tasks;
+CREATE TRIGGER tasks_version_update AFTER UPDATE ON tasks
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_user_data_version('tasks');
+DROP TRIGGER IF EXISTS tasks_version_delete ON tasks;
+CREATE TRIGGER tasks_version_delete AFTER DELETE ON tasks
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_user_data_version('tasks');
+
+DROP TRIGGER IF EXISTS progress_logs_version_insert ON progress_logs;
+CREATE TRIGGER progress_logs_version_insert AFTER INSERT ON progress_logs
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_user_data_version('progress');
+DROP TRIGGER IF EXISTS progress_logs_version_update ON progress_logs;
+CREATE TRIGGER progress_logs_version_update AFTER UPDATE ON progress_logs
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_user_data_version('progress');
+DROP TRIGGER IF EXISTS progress_logs_version_delete ON progress_logs;
+CREATE TRIGGER progress_logs_version_delete AFTER DELETE ON progress_logs
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_user_data_version('progress');
+
+DROP TRIGGER IF EXISTS kanban_items_version_insert ON kanban_items;
+CREATE TRIGGER kanban_items_version_insert AFTER INSERT ON kanban_items
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_user_data_version('kanban');
+DROP TRIGGER IF EXISTS kanban_items_version_update ON kanban_items;
+CREATE TRIGGER kanban_items_version_update AFTER UPDATE ON kanban_items
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_user_data_version('kanban');
+DROP TRIGGER IF EXISTS kanban_items_version_delete ON kanban_items;
+CREATE TRIGGER kanban_items_version_delete AFTER DELETE ON kanban_items
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_user_data_version('kanban');
+
+DROP TRIGGER IF EXISTS focus_sessions_version_insert ON focus_sessions;
+CREATE TRIGGER focus_sessions_version_insert AFTER INSERT ON focus_sessions
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_user_data_version('focus');
+DROP TRIGGER IF EXISTS focus_sessions_version_update ON focus_sessions;
+CREATE TRIGGER focus_sessions_version_update AFTER UPDATE ON focus_sessions
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_user_data_version('focus');
+DROP TRIGGER IF EXISTS focus_sessions_version_delete ON focus_sessions;
+CREATE TRIGGER focus_sessions_version_delete AFTER DELETE ON focus_sessions
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_user_data_version('focus');
+
+-- Keep updated_at current (focus_sessions has no updated_at)
+CREATE OR REPLACE FUNCTION set_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tasks_set_updated_at ON tasks;
+CREATE TRIGGER tasks_set_updated_at BEFORE UPDATE ON tasks
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+DROP TRIGGER IF EXISTS progress_logs_set_updated_at ON progress_logs;
+CREATE TRIGGER progress_logs_set_updated_at BEFORE UPDATE ON progress_logs
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+DROP TRIGGER IF EXISTS kanban_items_set_updated_at ON kanban_items;
+CREATE TRIGGER kanban_items_set_updated_at BEFORE UPDATE ON kanban_items
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+-- Search: one ranked page of matches across the four tables
+-- websearch_to_tsquery accepts what people type: words, "quoted phrases", or, -excluded
+CREATE OR REPLACE FUNCTION search_user_content(
+    p_query TEXT,
+    p_limit INTEGER DEFAULT 20,
+    p_offset INTEGER DEFAULT 0,
+    p_user_id UUID DEFAULT NULL
+)
+RETURNS TABLE (
+    kind TEXT,
+    id INTEGER,
+    title TEXT,
+    body TEXT,
+    day DATE,
+    task_id INTEGER,
+    kanban_item_id INTEGER,
+    rank REAL
+) AS $$
+    WITH q AS (SELECT websearch_to_tsquery('english', p_query) AS query)
+    SELECT * FROM (
+        SELECT 'kanban', k.id, k.title::text, k.description, k.due_date, NULL::int, k.id,
+               ts_rank(k.search_vector, q.query)
+        FROM kanban_items k, q
+        WHERE k.search_vector @@ q.query
+          AND (p_user_id IS NULL OR k.user_id = p_user_id)
+        UNION ALL
+        SELECT 'task', t.id, t.name::text, t.description::text, NULL::date, t.id, NULL::int,
+               ts_rank(t.search_vector, q.query)
+        FROM tasks t, q
+        WHERE t.search_vector @@ q.query
+          AND (p_user_id IS NULL OR t.user_id = p_user_id)
+        UNION ALL
+        SELECT 'progress', l.id, t.name::text, l.notes::text, l.log_date, l.task_id, NULL::int,
+               ts_rank(l.search_vector, q.query)
+        FROM progress_logs l JOIN tasks t ON t.id = l.task_id, q
+        WHERE l.search_vector @@ q.query
+          AND (p_user_id IS NULL OR l.user_id = p_user_id)
+        UNION ALL
+        SELECT 'focus', f.id, k.title::text, f.notes, f.local_day, NULL::int, f.kanban_item_id,
+               ts_rank(f.search_vector, q.query)
+        FROM focus_sessions f LEFT JOIN kanban_items k ON k.id = f.kanban_item_id, q
+        WHERE f.search_vector @@ q.query
+          AND (p_user_id IS NULL OR f.user_id = p_user_id)
+    ) AS hits (kind, id, title, body, day, task_id, kanban_item_id, rank)
+    ORDER BY rank DESC, kind, id
+    LIMIT p_limit OFFSET p_offset;
+$$ LANGUAGE sql STABLE;
 
 -- Enable Row Level Security (RLS) for user data isolation
 ALTER TABLE tasks ENABLE ROW LEVEL SECURITY;
 ALTER TABLE progress_logs ENABLE ROW LEVEL SECURITY;
 ALTER TABLE kanban_items ENABLE ROW LEVEL SECURITY;
 ALTER TABLE focus_sessions ENABLE ROW LEVEL SECURITY;
+ALTER TABLE weekly_task_rollups ENABLE ROW LEVEL SECURITY;
+ALTER TABLE user_data_versions ENABLE ROW LEVEL SECURITY;
 
 -- RLS Policies: Users can only access their own data
 CREATE POLICY "Users can view own tasks" ON tasks FOR SELECT USING (auth.uid() = user_id);
@@ -92,6 +455,29 @@ CREATE POLICY "Users can insert own focus" ON focus_sessions FOR INSERT WITH CHE
 CREATE POLICY "Users can update own focus" ON focus_sessions FOR UPDATE USING (auth.uid() = user_id);
 CREATE POLICY "Users can delete own focus" ON focus_sessions FOR DELETE USING (auth.uid() = user_id);
 
--- Progress logs inherit access from their parent task
-CREATE POLICY "Users can access own progress" ON progress_logs FOR ALL 
-USING (EXISTS (SELECT 1 FROM tasks WHERE tasks.id = progress_logs.task_id AND tasks.user_id = auth.uid()));
+-- Progress logs carry user_id so reads are a direct equality check
+-- Writes also check the parent task so logs can't be attached to another user's task
+CREATE POLICY "Users can view own progress" ON progress_logs FOR SELECT
+USING ((select auth.uid()) = user_id);
+CREATE POLICY "Users can insert own progress" ON progress_logs FOR INSERT
+WITH CHECK ((select auth.uid()) = user_id AND EXISTS (SELECT 1 FROM tasks WHERE tasks.id = progress_logs.task_id AND tasks.user_id = (select auth.uid())));
+CREATE POLICY "Users can update own progress" ON progress_logs FOR UPDATE
+USING ((select auth.uid()) = user_id)
+WITH CHECK ((select auth.uid()) = user_id AND EXISTS (SELECT 1 FROM tasks WHERE tasks.id = progress_logs.task_id AND tasks.user_id = (select auth.uid())));
+CREATE POLICY "Users can delete own progress" ON progress_logs FOR DELETE
+USING ((select auth.uid()) = user_id);
+
+-- Rollups are written only by the SECURITY DEFINER trigger functions
+CREATE POLICY "Users can view own rollups" ON weekly_task_rollups FOR SELECT
+USING ((select auth.uid()) = user_id);
+-- ...which are the only callers of refresh_weekly_task_rollup: through the API it
+-- would write any task's rollup
+REVOKE EXECUTE ON FUNCTION refresh_weekly_task_rollup(INTEGER, DATE) FROM PUBLIC, anon, authenticated;
+
+-- Data versions are written only by bump_user_data_version
+CREATE POLICY "Users can view own data versions" ON user_data_versions FOR SELECT
+USING ((select auth.uid()) = user_id);
+
+-- Nightly archive sweep (pg_cron: Database > Extensions in the Supabase dashboard)
+CREATE EXTENSION IF NOT EXISTS pg_cron;
+SELECT cron.schedule('archive-done-kanban-items', '15 3 * * *', 'SELECT archive_done_kanban_items()');
@@ -0,0 +1,326 @@
+"""
+Run the service layer's hot queries through EXPLAIN ANALYZE on a seeded local Postgres.
+
+Builds the tables from database/supabase_schema.sql inside a scratch schema,
+seeds enough rows for the planner to prefer indexes over sequential scans, and
+reports which index (if any) each query shape used. Exits non-zero when a
+query misses the index it was written for.
+
+The SQL below mirrors what the PostgREST builders in services/ send; the
+direct Postgres backend's SQL (database/postgres_db.py) is run as is. RLS is
+not applied (auth.uid() is stubbed to NULL outside Supabase, for column
+defaults only), so this checks the explicit user_id / task_id filters the
+services already add.
+
+Usage: python explain_queries.py postgresql://localhost/progresso_explain [--users N]
+Requires: pip install "psycopg[binary]"
+"""
+
+import argparse
+import os
+import sys
+from datetime import date, timedelta
+
+import psycopg
+
+from services.focus_service import STATS_SQL
+from services.progress_service import STATS_LOGS_SQL
+
+SCHEMA = "explain_check"
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "database", "supabase_schema.sql")
+
+SEED_SQL = [
+    # Tasks: every fifth one archived
+    """
+    INSERT INTO tasks (user_id, name, metric_type, frequency, is_archived, created_at)
+    SELECT u.id, 'task ' || t, 'COUNT', 'DAILY', t %% 5 = 0, now() - make_interval(days => t)
+    FROM (SELECT gen_random_uuid() AS id FROM generate_series(1, %(users)s::int)) u,
+         generate_series(1, %(tasks)s::int) t
+    """,
+    # Rollups are backfilled in one pass below instead of per inserted row
+    "ALTER TABLE progress_logs DISABLE TRIGGER progress_logs_refresh_rollup",
+    # Progress logs: ~70% of days logged, 80% of those completed
+    """
+    INSERT INTO progress_logs (task_id, user_id, log_date, week_start_date, metric_value, is_completed)
+    SELECT t.id, t.user_id, d::date, d::date - extract(dow FROM d)::int,
+           CASE WHEN random() < 0.5 THEN round((random() * 100)::numeric, 1) END,
+           random() < 0.8
+    FROM tasks t,
+         generate_series(current_date - %(days)s::int, current_date, interval '1 day') d
+    WHERE random() < 0.7
+    """,
+    """
+    INSERT INTO weekly_task_rollups (task_id, user_id, week_start_date, completed_count, value_sum,
+                                     value_count, value_min, value_max, scheduled_count)
+    SELECT t.id, t.user_id, l.week_start_date, count(*) FILTER (WHERE l.is_completed),
+           COALESCE(sum(l.metric_value), 0), count(l.metric_value), min(l.metric_value),
+           max(l.metric_value), scheduled_days_per_week(t.frequency, t.custom_days)
+    FROM progress_logs l JOIN tasks t ON t.id = l.task_id
+    GROUP BY t.id, l.week_start_date
+    """,
+    "ALTER TABLE progress_logs ENABLE TRIGGER progress_logs_refresh_rollup",
+    # Kanban: most cards end up DONE
+    """
+    INSERT INTO kanban_items (user_id, title, due_date, status, rank_key)
+    SELECT u.user_id, 'card ' || i, current_date - (i %% 400),
+           CASE i %% 10 WHEN 0 THEN 'TODO' WHEN 1 THEN 'IN_PROGRESS' ELSE 'DONE' END,
+           lpad(i::text, 9, '0') || 'V'
+    FROM (SELECT DISTINCT user_id FROM tasks) u, generate_series(1, %(cards)s::int) i
+    """,
+    # Focus sessions: three a day
+    """
+    INSERT INTO focus_sessions (user_id, duration_minutes, started_at, local_day, ended_at, is_completed)
+    SELECT u.user_id, 25, s, (s AT TIME ZONE 'UTC')::date, s + interval '25 minutes', random() < 0.9
+    FROM (SELECT DISTINCT user_id FROM tasks) u,
+         generate_series(now() - make_interval(days => %(days)s::int), now(), interval '8 hours') s
+    """,
+]
+
+# (name, service method, sql, expected index)
+QUERIES = [
+    (
+        "tasks_active",
+        "TaskService.get_all_tasks",
+        "SELECT * FROM tasks WHERE user_id = %(user_id)s AND is_archived = false "
+        "ORDER BY created_at DESC",
+        "idx_tasks_user_archived_created",
+    ),
+    (
+        "tasks_page",
+        "TaskService.get_tasks_page",
+        "SELECT * FROM tasks WHERE user_id = %(user_id)s AND is_archived = false "
+        "AND (created_at < now() OR (created_at = now() AND id < 0)) "
+        "ORDER BY created_at DESC, id DESC LIMIT 51",
+        "idx_tasks_user_archived_created",
+    ),
+    (
+        "week_logs",
+        "ProgressService.get_week_progress",
+        "SELECT * FROM progress_logs WHERE user_id = %(user_id)s "
+        "AND week_start_date = current_date - extract(dow FROM current_date)::int",
+        "idx_progress_logs_user_week",
+    ),
+    (
+        "week_range_logs",
+        "ProgressService.get_weeks_progress",
+        "SELECT * FROM progress_logs WHERE user_id = %(user_id)s "
+        "AND week_start_date BETWEEN current_date - 14 AND current_date + 7 "
+        "AND id > 0 ORDER BY id LIMIT 1000",
+        "idx_progress_logs_user_week",
+    ),
+    (
+        "stats_logs",
+        "ProgressService.load_stats_logs",
+        "SELECT id, task_id, log_date, is_completed, metric_value FROM progress_logs "
+        "WHERE user_id = %(user_id)s AND task_id IN (SELECT id FROM tasks WHERE user_id = %(user_id)s) "
+        "AND id > 0 ORDER BY id LIMIT 1000",
+        "idx_progress_logs_user_id_stats",
+    ),
+    (
+        "stats_logs_window",
+        "ProgressService.calculate_health_scores",
+        "SELECT id, task_id, log_date, is_completed, metric_value FROM progress_logs "
+        "WHERE user_id = %(user_id)s AND task_id IN (SELECT id FROM tasks WHERE user_id = %(user_id)s) "
+        "AND week_start_date >= current_date - 21 AND log_date >= current_date - 14 "
+        "ORDER BY id LIMIT 1000",
+        "idx_progress_logs_user_week",
+    ),
+    (
+        "summary_rollups",
+        "ProgressService.get_summary",
+        "SELECT * FROM summarize_weekly_rollups(current_date - 364, current_date, 'month', %(user_id)s)",
+        "idx_weekly_rollups_user_week",
+    ),
+    (
+        "rollup_refresh",
+        "progress_logs_refresh_rollup trigger",
+        "SELECT count(id) FILTER (WHERE is_completed), sum(metric_value) FROM progress_logs "
+        "WHERE task_id = %(task_id)s "
+        "AND week_start_date = current_date - extract(dow FROM current_date)::int",
+        "idx_progress_logs_task_week",
+    ),
+    (
+        "data_version",
+        "DataVersionService.get_versions",
+        "SELECT domain, version FROM user_data_versions WHERE user_id = %(user_id)s AND domain = 'tasks'",
+        "user_data_versions_pkey",
+    ),
+    (
+        "search_kanban",
+        "SearchService.search",
+        "SELECT id, ts_rank(search_vector, websearch_to_tsquery('english', 'card 7')) FROM kanban_items "
+        "WHERE user_id = %(user_id)s AND search_vector @@ websearch_to_tsquery('english', 'card 7')",
+        "idx_kanban_search",
+    ),
+    (
+        "kanban_column",
+        "KanbanService.get_all_items",
+        "SELECT * FROM kanban_items WHERE user_id = %(user_id)s AND status = 'TODO' "
+        "ORDER BY rank_key, id LIMIT 51",
+        "idx_kanban_user_status_rank",
+    ),
+    (
+        "kanban_column_page",
+        "KanbanService.get_column_page",
+        "SELECT * FROM kanban_items WHERE user_id = %(user_id)s AND status = 'DONE' "
+        "AND (rank_key > '0' OR (rank_key = '0' AND id > 0)) ORDER BY rank_key, id LIMIT 21",
+        "idx_kanban_user_status_rank",
+    ),
+    (
+        "kanban_archive_sweep",
+        "archive_done_kanban_items (pg_cron)",
+        "SELECT id FROM kanban_items WHERE status = 'DONE' AND done_at < now() - interval '30 days'",
+        "idx_kanban_done_at",
+    ),
+    (
+        "kanban_next_date",
+        "kanban_items_default_due_date trigger",
+        "SELECT max(due_date) FROM kanban_items WHERE user_id = %(user_id)s",
+        "idx_kanban_user_due_date",
+    ),
+    (
+        "focus_today",
+        "FocusService.get_today_sessions",
+        "SELECT * FROM focus_sessions WHERE user_id = %(user_id)s "
+        "AND local_day = current_date ORDER BY started_at DESC, id DESC LIMIT 51",
+        "idx_focus_sessions_user_day",
+    ),
+    (
+        "focus_total_today",
+        "FocusService.get_total_today",
+        "SELECT duration_minutes FROM focus_sessions WHERE user_id = %(user_id)s "
+        "AND local_day = current_date AND is_completed = true",
+        "idx_focus_sessions_user_completed_day",
+    ),
+    (
+        "focus_streak",
+        "FocusService._calculate_streak",
+        "SELECT local_day FROM focus_sessions WHERE user_id = %(user_id)s "
+        "AND is_completed = true AND local_day >= current_date - 364 ORDER BY local_day DESC",
+        "idx_focus_sessions_user_completed_day",
+    ),
+    (
+        "focus_all_time",
+        "FocusService.get_stats",
+        "SELECT duration_minutes FROM focus_sessions WHERE user_id = %(user_id)s "
+        "AND is_completed = true",
+        "idx_focus_sessions_user_completed_day",
+    ),
+    (
+        "focus_stats_sql",
+        "FocusService.get_stats (Postgres backend)",
+        STATS_SQL,
+        "idx_focus_sessions_user_completed_day",
+    ),
+    (
+        "stats_logs_sql",
+        "ProgressService.load_stats_logs (Postgres backend)",
+        STATS_LOGS_SQL + "ORDER BY id",
+        "idx_progress_logs_user_id_stats",
+    ),
+]
+
+
+def load_schema_sql():
+    """Table and index DDL from the Supabase schema, without the RLS section"""
+    with open(SCHEMA_PATH, "r") as f:
+        sql = f.read()
+    return sql.split("-- Enable Row Level Security")[0]
+
+
+def indexes_used(plan):
+    """Collect every index name referenced anywhere in a JSON plan tree"""
+    found = []
+    if "Index Name" in plan:
+        found.append(plan["Index Name"])
+    for child in plan.get("Plans", []):
+        found.extend(indexes_used(child))
+    return found
+
+
+def build(conn, args):
+    print(f"Building {SCHEMA} schema...")
+    conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    conn.execute(f"CREATE SCHEMA {SCHEMA}")
+    conn.execute(f"SET search_path TO {SCHEMA}")
+    has_auth_uid = conn.execute(
+        "SELECT EXISTS (SELECT 1 FROM pg_proc p JOIN pg_namespace n ON n.oid = p.pronamespace "
+        "WHERE n.nspname = 'auth' AND p.proname = 'uid')"
+    ).fetchone()[0]
+    if not has_auth_uid:
+        conn.execute("CREATE SCHEMA IF NOT EXISTS auth")
+        conn.execute("CREATE FUNCTION auth.uid() RETURNS uuid LANGUAGE sql STABLE AS 'SELECT NULL::uuid'")
+    conn.execute(load_schema_sql())
+
+    params = {"users": args.users, "tasks": args.tasks, "days": args.days, "cards": args.cards}
+    for sql in SEED_SQL:
+        conn.execute(sql, params)
+    conn.execute("ANALYZE")
+
+    counts = conn.execute(
+        "SELECT (SELECT count(*) FROM tasks), (SELECT count(*) FROM progress_logs), "
+        "(SELECT count(*) FROM kanban_items), (SELECT count(*) FROM focus_sessions), "
+        "(SELECT count(*) FROM weekly_task_rollups)"
+    ).fetchone()
+    print(
+        f"Seeded {counts[0]} tasks, {counts[1]} progress logs, "
+        f"{counts[2]} kanban items, {counts[3]} focus sessions, {counts[4]} weekly rollups\n"
+    )
+
+
+def explain(conn):
+    user_id, task_id = conn.execute(
+        "SELECT user_id, id FROM tasks WHERE is_archived = false LIMIT 1"
+    ).fetchone()
+    today = date.today()
+    params = {
+        "user_id": user_id,
+        "task_id": task_id,
+        "task_ids": [task_id],
+        "today": today,
+        "week_start": today - timedelta(days=today.weekday()),
+    }
+
+    misses = []
+    for name, method, sql, expected in QUERIES:
+        row = conn.execute(
+            f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}", params
+        ).fetchone()
+        result = row[0][0]
+        used = indexes_used(result["Plan"])
+        ok = expected in used
+        if not ok:
+            misses.append(name)
+
+        print(
+            f"{'OK  ' if ok else 'MISS'} {name:<20} {result['Execution Time']:>8.2f} ms  "
+            f"{method}  -> {', '.join(used) or 'Seq Scan'}"
+        )
+
+    return misses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("dsn", help="libpq connection string for a local Postgres")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--tasks", type=int, default=8, help="tasks per user")
+    parser.add_argument("--days", type=int, default=730, help="days of history")
+    parser.add_argument("--cards", type=int, default=300, help="kanban items per user")
+    parser.add_argument("--keep", action="store_true", help=f"keep the {SCHEMA} schema")
+    args = parser.parse_args()
+
+    with psycopg.connect(args.dsn, autocommit=True) as conn:
+        build(conn, args)
+        misses = explain(conn)
+        if not args.keep:
+            conn.execute(f"DROP SCHEMA {SCHEMA} CASCADE")
+
+    if misses:
+        print(f"\n{len(misses)} query shape(s) did not use their index: {', '.join(misses)}")
+        sys.exit(1)
+    print("\nAll query shapes use their intended index.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Batch API endpoint - several GET resources in one round trip
+"""
+
+from flask import Blueprint, current_app, jsonify, request, session
+from werkzeug.test import EnvironBuilder
+from database.resilience import error_response
+from services.auth_service import AuthService
+from services.concurrency import gather
+from services.task_service import TaskService
+
+batch_bp = Blueprint("batch", __name__, url_prefix="/api/batch")
+
+MAX_SUBREQUESTS = 10
+
+# Not JSON, or never finish
+EXCLUDED_PREFIXES = ("/api/batch", "/api/events", "/api/reports/pdf")
+
+# Sub-resources that read TaskService.get_all_tasks()
+TASK_PREFIXES = ("/api/tasks", "/api/progress", "/api/reports")
+
+
+def _dispatch(path, parent_session, cookie):
+    """Run one GET sub-request through the app's own routing and views.
+
+    Only the view runs: the batch request itself already went through the
+    before_request hooks (token verification and refresh), and its response
+    saves the shared session once, so sub-requests skip both. Errors go
+    through the app's registered handlers (SupabaseUnavailable -> 503), so
+    each item gets the status it would get on its own; anything unhandled
+    becomes that item's 500.
+    """
+    environ = EnvironBuilder(path=path, method="GET", headers={"Cookie": cookie}).get_environ()
+    ctx = current_app.request_context(environ)
+    # Reuse the already-loaded session instead of decoding the cookie again
+    ctx.session = parent_session
+
+    with ctx:
+        try:
+            rv = current_app.dispatch_request()
+        except Exception as e:
+            try:
+                rv = current_app.handle_user_exception(e)
+            except Exception as unhandled:
+                rv = error_response(unhandled)
+        response = current_app.make_response(rv)
+
+    return {
+        "path": path,
+        "status": response.status_code,
+        "body": response.get_json(silent=True),
+    }
+
+
+@batch_bp.route("", methods=["POST"])
+def batch():
+    """Run GET sub-requests in parallel, e.g. {"requests": ["/api/focus/stats", "/api/kanban"]}"""
+    if not AuthService.is_authenticated():
+        return jsonify({"error": "Unauthorized"}), 401
+
+    try:
+        data = request.get_json()
+        paths = data.get("requests") if data else None
+        if not isinstance(paths, list) or not paths:
+            return jsonify({"error": "requests must be a non-empty list of paths"}), 400
+        if len(paths) > MAX_SUBREQUESTS:
+            return jsonify({"error": f"At most {MAX_SUBREQUESTS} requests per batch"}), 400
+        for path in paths:
+            if (
+                not isinstance(path, str)
+                or not path.startswith("/api/")
+                or path.startswith(EXCLUDED_PREFIXES)
+            ):
+                return jsonify({"error": f"Invalid batch path: {path!r}"}), 400
+
+        # Progress and report resources all start from the task list; read it once
+        if any(path.startswith(TASK_PREFIXES) for path in paths):
+            TaskService.get_all_tasks()
+
+        parent_session = session._get_current_object()
+        cookie = request.headers.get("Cookie", "")
+        responses = gather(
+            *(
+                lambda path=path: _dispatch(path, parent_session, cookie)
+                for path in paths
+            )
+        )
+        return jsonify({"responses": responses})
+    except Exception as e:
+        return error_response(e)
@@ -0,0 +1,32 @@
+"""
+Server-Sent Events endpoint for live updates
+"""
+
+from flask import Blueprint, Response, current_app, jsonify, request, session
+from services.auth_service import AuthService
+from services import events
+
+events_bp = Blueprint("events", __name__, url_prefix="/api/events")
+
+
+@events_bp.route("", methods=["GET"])
+def stream_events():
+    """Stream the user's progress, focus and kanban change events"""
+    if not current_app.config.get("EVENTS_ENABLED"):
+        # Not 200, so an EventSource stops instead of reconnecting
+        return jsonify({"error": "Live updates are disabled"}), 404
+    if not AuthService.is_authenticated():
+        return jsonify({"error": "Unauthorized"}), 401
+
+    user_id = session.get("user_id")
+    last_event_id = request.headers.get("Last-Event-ID")
+
+    return Response(
+        events.stream(user_id, last_event_id),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Don't let nginx-style proxies buffer the stream
+            "X-Accel-Buffering": "no",
+        },
+    )
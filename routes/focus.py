@@ -3,7 +3,9 @@ Focus/Pomodoro timer API endpoints
 """
 
 from flask import Blueprint, request, jsonify
+from database.resilience import error_response
 from services.focus_service import FocusService
+from services.pagination import parse_limit
 from services.auth_service import AuthService
 
 focus_bp = Blueprint("focus", __name__, url_prefix="/api/focus")
@@ -20,7 +22,7 @@ def start_session():
         session = FocusService.start_session(data)
         return jsonify({"session": session, "message": "Session started"}), 201
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 
 @focus_bp.route("/complete/<int:session_id>", methods=["POST"])
@@ -36,20 +38,24 @@ def complete_session(session_id):
             return jsonify({"error": "Session not found"}), 404
         return jsonify({"session": session, "message": "Session completed"})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 
 @focus_bp.route("/today", methods=["GET"])
 def get_today_sessions():
-    """Get all sessions from today"""
+    """A page of today's sessions, newest first: ?limit=&cursor="""
     if not AuthService.is_authenticated():
         return jsonify({"error": "Unauthorized"}), 401
 
     try:
-        sessions = FocusService.get_today_sessions()
-        return jsonify({"sessions": sessions})
+        sessions, next_cursor = FocusService.get_today_sessions(
+            parse_limit(request.args.get("limit")), request.args.get("cursor")
+        )
+        return jsonify({"sessions": sessions, "next_cursor": next_cursor})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 
 @focus_bp.route("/stats", methods=["GET"])
@@ -62,7 +68,7 @@ def get_stats():
         stats = FocusService.get_stats()
         return jsonify({"stats": stats})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 
 @focus_bp.route("/<int:session_id>", methods=["DELETE"])
@@ -75,7 +81,7 @@ def delete_session(session_id):
         FocusService.delete_session(session_id)
         return jsonify({"message": "Session deleted"})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 
 @focus_bp.route("/clear-today", methods=["DELETE"])
@@ -88,4 +94,4 @@ def clear_today_sessions():
         FocusService.clear_today_sessions()
         return jsonify({"message": "Today's sessions cleared"})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
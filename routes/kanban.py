@@ -3,7 +3,10 @@ Kanban board API endpoints
 """
 
 from flask import Blueprint, request, jsonify
+from database.resilience import error_response
 from services.kanban_service import KanbanService
+from services.data_versions import DataVersionService, not_modified, versioned
+from services.pagination import parse_limit
 from services.auth_service import AuthService
 
 kanban_bp = Blueprint("kanban", __name__, url_prefix="/api/kanban")
@@ -11,15 +14,40 @@ kanban_bp = Blueprint("kanban", __name__, url_prefix="/api/kanban")
 
 @kanban_bp.route("", methods=["GET"])
 def get_all_items():
-    """Get all Kanban items grouped by status"""
+    """The board: each column's first page (?limit= per column) and next_cursor per column"""
     if not AuthService.is_authenticated():
         return jsonify({"error": "Unauthorized"}), 401
 
     try:
-        items = KanbanService.get_all_items()
-        return jsonify(items)
+        limit = parse_limit(request.args.get("limit"))
+
+        etag = DataVersionService.etag("kanban")
+        if etag in request.if_none_match:
+            return not_modified(etag)
+
+        items = KanbanService.get_all_items(limit)
+        return versioned(jsonify(items), etag)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return error_response(e)
+
+
+@kanban_bp.route("/column/<status>", methods=["GET"])
+def get_column_page(status):
+    """A page of one column (or ARCHIVED), e.g. ?cursor=<next_cursor.DONE>&limit=20"""
+    if not AuthService.is_authenticated():
+        return jsonify({"error": "Unauthorized"}), 401
+
+    try:
+        items, next_cursor = KanbanService.get_column_page(
+            status.upper(), request.args.get("cursor"), parse_limit(request.args.get("limit"))
+        )
+        return jsonify({"items": items, "next_cursor": next_cursor})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 
 @kanban_bp.route("", methods=["POST"])
@@ -38,7 +66,7 @@ def create_item():
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 
 @kanban_bp.route("/<int:item_id>", methods=["GET"])
@@ -53,7 +81,7 @@ def get_item(item_id):
             return jsonify({"error": "Item not found"}), 404
         return jsonify({"item": item})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 
 @kanban_bp.route("/<int:item_id>", methods=["PUT"])
@@ -75,7 +103,7 @@ def update_item(item_id):
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 
 @kanban_bp.route("/<int:item_id>/status", methods=["PUT"])
@@ -89,7 +117,9 @@ def update_item_status(item_id):
         if not data or "status" not in data:
             return jsonify({"error": "Status is required"}), 400
 
-        item = KanbanService.update_status(item_id, data["status"])
+        item = KanbanService.update_status(
+            item_id, data["status"], data.get("prev_rank"), data.get("next_rank")
+        )
         if not item:
             return jsonify({"error": "Item not found"}), 404
 
@@ -97,7 +127,26 @@ def update_item_status(item_id):
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
+
+
+@kanban_bp.route("/reorder", methods=["PUT"])
+def reorder_column():
+    """Apply a column's full order, e.g. {"status": "TODO", "item_ids": [3, 1, 2]}"""
+    if not AuthService.is_authenticated():
+        return jsonify({"error": "Unauthorized"}), 401
+
+    try:
+        data = request.get_json()
+        if not data or "status" not in data or "item_ids" not in data:
+            return jsonify({"error": "Status and item_ids are required"}), 400
+
+        items = KanbanService.reorder_column(data["status"], data["item_ids"])
+        return jsonify({"items": items, "message": "Column reordered"})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return error_response(e)
 
 
 @kanban_bp.route("/<int:item_id>", methods=["DELETE"])
@@ -113,4 +162,4 @@ def delete_item(item_id):
 
         return jsonify({"message": "Item deleted"})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
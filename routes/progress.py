@@ -2,14 +2,23 @@
 Progress logging API endpoints
 """
 
+from datetime import date
 from flask import Blueprint, request, jsonify
 from database.db import get_db
+from database.resilience import error_response
 from services.progress_service import ProgressService
+from services.stats_engine import HEALTH_DAYS
 from services.task_service import TaskService
 from services.auth_service import AuthService
+from services.coalescing import coalesced
 
 progress_bp = Blueprint("progress", __name__, url_prefix="/api/progress")
 
+MIN_HEATMAP_YEAR = 2000
+MAX_HISTORY_DAYS = 366
+MAX_HEALTH_WINDOW = 90
+MAX_RANGE_WEEKS = 8
+
 
 @progress_bp.route("/week", methods=["GET"])
 def get_week_progress():
@@ -24,10 +33,75 @@ def get_week_progress():
             f"[DEBUG ROUTE] /api/progress/week - session user_id: {session.get('user_id')}"
         )
         date_str = request.args.get("date")  # YYYY-MM-DD format
-        progress = ProgressService.get_week_progress(date_str)
+        progress = coalesced(
+            lambda: ProgressService.get_week_progress(date_str), "tasks", "progress"
+        )
         return jsonify(progress)
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
+
+
+@progress_bp.route("/weeks", methods=["GET"])
+def get_weeks_progress():
+    """Get progress for consecutive weeks, e.g. ?date=2026-10-11&count=3"""
+    if not AuthService.is_authenticated():
+        return jsonify({"error": "Unauthorized"}), 401
+
+    try:
+        count = request.args.get("count", 3, type=int)
+        if not 1 <= count <= MAX_RANGE_WEEKS:
+            return jsonify({"error": f"count must be between 1 and {MAX_RANGE_WEEKS}"}), 400
+
+        date_str = request.args.get("date")
+        payload = coalesced(
+            lambda: {"weeks": ProgressService.get_weeks_progress(date_str, count)},
+            "tasks",
+            "progress",
+        )
+        return jsonify(payload)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return error_response(e)
+
+
+@progress_bp.route("/health-history", methods=["GET"])
+def get_health_history():
+    """Get each task's daily health score over a range of days"""
+    if not AuthService.is_authenticated():
+        return jsonify({"error": "Unauthorized"}), 401
+
+    try:
+        days = request.args.get("days", 90, type=int)
+        window = request.args.get("window", HEALTH_DAYS, type=int)
+        if not 1 <= days <= MAX_HISTORY_DAYS:
+            return jsonify({"error": f"days must be between 1 and {MAX_HISTORY_DAYS}"}), 400
+        if not 2 <= window <= MAX_HEALTH_WINDOW:
+            return jsonify({"error": f"window must be between 2 and {MAX_HEALTH_WINDOW}"}), 400
+
+        history = coalesced(
+            lambda: ProgressService.get_health_history(days, window), "tasks", "progress"
+        )
+        return jsonify(history)
+    except Exception as e:
+        return error_response(e)
+
+
+@progress_bp.route("/heatmap", methods=["GET"])
+def get_heatmap():
+    """Get per-day completion ratios for a calendar year"""
+    if not AuthService.is_authenticated():
+        return jsonify({"error": "Unauthorized"}), 401
+
+    try:
+        year = request.args.get("year", date.today().year, type=int)
+        if not MIN_HEATMAP_YEAR <= year <= date.today().year:
+            return jsonify({"error": "Invalid year"}), 400
+
+        heatmap = coalesced(lambda: ProgressService.get_heatmap(year), "tasks", "progress")
+        return jsonify(heatmap)
+    except Exception as e:
+        return error_response(e)
 
 
 @progress_bp.route("", methods=["POST"])
@@ -67,7 +141,7 @@ def log_progress():
         log = ProgressService.log_progress(data)
         return jsonify({"log": log, "message": "Progress logged successfully"}), 201
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 
 @progress_bp.route("/<int:log_id>", methods=["PUT"])
@@ -83,7 +157,7 @@ def update_progress(log_id):
             return jsonify({"error": "Progress log not found"}), 404
         return jsonify({"log": log, "message": "Progress updated successfully"})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 
 @progress_bp.route("/<int:log_id>", methods=["DELETE"])
@@ -96,7 +170,7 @@ def delete_progress(log_id):
         ProgressService.delete_progress(log_id)
         return jsonify({"message": "Progress deleted successfully"}), 200
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 
 @progress_bp.route("/stats/<int:task_id>", methods=["GET"])
@@ -114,4 +188,4 @@ def get_task_stats(task_id):
         stats = ProgressService.get_task_stats(task_id)
         return jsonify({"stats": stats})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
@@ -3,8 +3,10 @@ Report generation API endpoints
 """
 
 from flask import Blueprint, request, jsonify, send_file
+from database.resilience import error_response
 from services.pdf_service import PDFService
 from services.progress_service import ProgressService
+from services.coalescing import coalesced
 import io
 
 reports_bp = Blueprint("reports", __name__, url_prefix="/api/reports")
@@ -26,8 +28,10 @@ def generate_pdf():
             as_attachment=True,
             download_name="progresso_report.pdf",
         )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 
 @reports_bp.route("/summary", methods=["GET"])
@@ -35,7 +39,11 @@ def get_summary():
     """Get summary data for reports"""
     try:
         weeks = int(request.args.get("weeks", 4))
-        summary = ProgressService.get_summary(weeks)
-        return jsonify({"summary": summary})
+        payload = coalesced(
+            lambda: {"summary": ProgressService.get_summary(weeks)}, "tasks", "progress"
+        )
+        return jsonify(payload)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
@@ -0,0 +1,29 @@
+"""
+Search API endpoint
+"""
+
+from flask import Blueprint, request, jsonify
+from database.resilience import error_response
+from services.search_service import SearchService
+from services.auth_service import AuthService
+
+search_bp = Blueprint("search", __name__, url_prefix="/api/search")
+
+
+@search_bp.route("", methods=["GET"])
+def search():
+    """Ranked matches across cards, habits and notes, e.g. ?q=report&limit=20&offset=20"""
+    if not AuthService.is_authenticated():
+        return jsonify({"error": "Unauthorized"}), 401
+
+    try:
+        results = SearchService.search(
+            request.args.get("q"),
+            request.args.get("limit", SearchService.PAGE_SIZE, type=int),
+            request.args.get("offset", 0, type=int),
+        )
+        return jsonify(results)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return error_response(e)
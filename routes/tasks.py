@@ -3,9 +3,12 @@ Task CRUD API endpoints
 """
 
 from flask import Blueprint, request, jsonify
+from database.resilience import error_response
 # from database.db import get_db
 
 from services.task_service import TaskService
+from services.data_versions import DataVersionService, not_modified, versioned
+from services.pagination import parse_limit
 from services.auth_service import AuthService
 
 tasks_bp = Blueprint("tasks", __name__, url_prefix="/api/tasks")
@@ -13,15 +16,27 @@ tasks_bp = Blueprint("tasks", __name__, url_prefix="/api/tasks")
 
 @tasks_bp.route("", methods=["GET"])
 def get_tasks():
-    """List all active tasks"""
+    """A page of tasks, newest first: ?limit=&cursor=&include_archived=true"""
     if not AuthService.is_authenticated():
         return jsonify({"error": "Unauthorized"}), 401
 
     try:
-        tasks = TaskService.get_all_tasks()
-        return jsonify({"tasks": tasks})
+        limit = parse_limit(request.args.get("limit"))
+        include_archived = request.args.get("include_archived") == "true"
+
+        # Read before the rows, so a write in between only costs a refetch
+        etag = DataVersionService.etag("tasks")
+        if etag in request.if_none_match:
+            return not_modified(etag)
+
+        tasks, next_cursor = TaskService.get_tasks_page(
+            limit, request.args.get("cursor"), include_archived
+        )
+        return versioned(jsonify({"tasks": tasks, "next_cursor": next_cursor}), etag)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 
 @tasks_bp.route("/<int:task_id>", methods=["GET"])
@@ -36,7 +51,7 @@ def get_task(task_id):
             return jsonify({"error": "Task not found"}), 404
         return jsonify({"task": task})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 
 @tasks_bp.route("", methods=["POST"])
@@ -85,7 +100,7 @@ def create_task():
         task = TaskService.create_task(data)
         return jsonify({"task": task, "message": "Task created successfully"}), 201
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 
 @tasks_bp.route("/<int:task_id>", methods=["PUT"])
@@ -109,7 +124,7 @@ def update_task(task_id):
         task = TaskService.update_task(task_id, data)
         return jsonify({"task": task, "message": "Task updated successfully"})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
 
 
 @tasks_bp.route("/<int:task_id>", methods=["DELETE"])
@@ -136,4 +151,4 @@ def delete_task(task_id):
 
         return jsonify({"message": message})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return error_response(e)
@@ -0,0 +1,46 @@
+"""
+Page shell and lazily loaded view fragments
+"""
+
+import hashlib
+from flask import Blueprint, current_app, jsonify, make_response, render_template, request
+from services.auth_service import AuthService
+
+views_bp = Blueprint("views", __name__, url_prefix="/views")
+
+# Fragments the shell may request from ensureView() in static/js/app.js
+VIEW_FRAGMENTS = ("kanban", "focus")
+
+# template name -> (body, etag)
+_rendered = {}
+
+
+def render_cached(template_name):
+    """Render a context-free template once per process and serve it with an ETag.
+
+    The shell and view fragments are static markup, so there is nothing for
+    Jinja to do after the first render. Browsers revalidate and get a 304.
+    """
+    page = _rendered.get(template_name)
+    if page is None or current_app.debug:
+        body = render_template(template_name)
+        page = (body, hashlib.md5(body.encode("utf-8")).hexdigest())
+        _rendered[template_name] = page
+
+    body, etag = page
+    response = make_response(body)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response.make_conditional(request)
+
+
+@views_bp.route("/<name>", methods=["GET"])
+def get_view(name):
+    """Markup (and modals) for a view that is not part of the initial shell"""
+    if not AuthService.is_authenticated():
+        return jsonify({"error": "Unauthorized"}), 401
+
+    if name not in VIEW_FRAGMENTS:
+        return jsonify({"error": "View not found"}), 404
+
+    return render_cached(f"views/{name}.html")
@@ -1,9 +1,81 @@
 """
 Authentication service for Progspresso - Supabase Auth wrapper
+
+Access tokens are checked locally on every request: the JWT's signature
+against SUPABASE_JWT_SECRET (HS256 projects) or the project's JWKS (asymmetric
+keys, fetched once and cached for JWKS_CACHE_SECONDS), its expiry, audience
+and subject. A token close to expiry is refreshed before the request runs,
+once per user in each worker, so requests don't reach PostgREST with a token
+it will reject. (Workers racing on the same refresh token are covered by
+Supabase's refresh token reuse interval.)
 """
 
+import hashlib
+import threading
+import time
+import jwt
 from database.supabase_db import get_supabase
-from flask import session
+from flask import current_app, g, has_app_context, session
+
+# Refresh the Supabase access token when it has less than this left
+REFRESH_MARGIN_SECONDS = 60
+# New tokens from a refresh are reused by the user's concurrent requests for this long
+REFRESH_REUSE_SECONDS = 30
+# Locks that make one request per user refresh at a time; users hash onto them
+REFRESH_STRIPES = 64
+# Signing algorithms accepted from the JWKS (never HS256 there: alg confusion)
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256")
+
+_jwks_client = None
+_jwks_lock = threading.Lock()
+
+_refresh_locks = [threading.Lock() for _ in range(REFRESH_STRIPES)]
+# sha256 of a spent refresh token -> (monotonic time, the tokens it was exchanged for).
+# Kept in this process only: tokens never go to the shared cache
+_refreshed = {}
+
+
+def _get_jwks_client():
+    """Process-wide JWKS client; it caches the keys, so there is no fetch per request"""
+    global _jwks_client
+    if _jwks_client is None:
+        with _jwks_lock:
+            if _jwks_client is None:
+                url = (current_app.config.get("SUPABASE_URL") or "").rstrip("/")
+                _jwks_client = jwt.PyJWKClient(
+                    f"{url}/auth/v1/.well-known/jwks.json",
+                    lifespan=current_app.config.get("JWKS_CACHE_SECONDS", 3600),
+                )
+    return _jwks_client
+
+
+def _signing_key(token):
+    """(key, algorithms) to verify token with, or None if it can't be verified here"""
+    alg = jwt.get_unverified_header(token).get("alg")
+    if alg == "HS256":
+        secret = current_app.config.get("SUPABASE_JWT_SECRET")
+        return (secret, ["HS256"]) if secret else None
+    if alg in ASYMMETRIC_ALGORITHMS and jwt.algorithms.has_crypto:
+        try:
+            return _get_jwks_client().get_signing_key_from_jwt(token).key, [alg]
+        except jwt.PyJWKClientError:
+            # JWKS unreachable: PostgREST still verifies, so don't sign anyone out
+            return None
+    return None
+
+
+def decode_access_token(token):
+    """Claims of a Supabase access token, signature-checked when a key is available.
+
+    Expiry is left to the caller (an expiring token is refreshed, not
+    rejected). Raises jwt.InvalidTokenError for a malformed or forged token.
+    """
+    key = _signing_key(token)
+    options = {"verify_exp": False, "require": ["exp", "sub"]}
+    if key is None:
+        options["verify_signature"] = False
+        return jwt.decode(token, options=options)
+    return jwt.decode(token, key[0], algorithms=key[1], audience="authenticated", options=options)
 
 
 class AuthService:
@@ -94,25 +166,82 @@ class AuthService:
             return {"id": session.get("user_id"), "email": session.get("user_email")}
         return None
 
+    @staticmethod
+    def get_claims():
+        """Verified claims of the session's access token (None if there is no valid one).
+
+        Decoded once per request and token; the claims must belong to the
+        session's user.
+        """
+        token = session.get("access_token")
+        if "user_id" not in session or not token:
+            return None
+        cached = g.get("auth_claims") if has_app_context() else None
+        if cached and cached[0] == token:
+            return cached[1]
+
+        try:
+            claims = decode_access_token(token)
+            if claims["sub"] != session.get("user_id"):
+                claims = None
+        except jwt.InvalidTokenError:
+            claims = None
+        if has_app_context():
+            g.auth_claims = (token, claims)
+        return claims
+
     @staticmethod
     def is_authenticated():
-        """Check if user is authenticated"""
-        return "user_id" in session and session.get("access_token")
+        """Check if user is authenticated (with an unexpired, valid access token)"""
+        claims = AuthService.get_claims()
+        return claims is not None and claims["exp"] > time.time()
 
     @staticmethod
     def refresh_session():
-        """Refresh the session token if needed"""
+        """Exchange the refresh token for new tokens.
+
+        Concurrent requests of the user in this worker holding the same
+        refresh token share one call to Supabase and its new tokens.
+        """
         refresh_token = session.get("refresh_token")
         if not refresh_token:
             return False
 
-        try:
-            supabase = get_supabase()
-            response = supabase.auth.refresh_session(refresh_token)
-            if response.session:
-                session["access_token"] = response.session.access_token
-                session["refresh_token"] = response.session.refresh_token
-                return True
-        except Exception:
-            pass
-        return False
+        digest = hashlib.sha256(refresh_token.encode("utf-8")).digest()
+        with _refresh_locks[hash(session.get("user_id")) % REFRESH_STRIPES]:
+            now = time.monotonic()
+            for spent, (refreshed_at, _) in list(_refreshed.items()):
+                if now - refreshed_at > REFRESH_REUSE_SECONDS:
+                    _refreshed.pop(spent, None)
+
+            # Whoever held the lock before us may have refreshed this token
+            tokens = _refreshed.get(digest, (None, None))[1]
+            if tokens is None:
+                try:
+                    response = get_supabase().auth.refresh_session(refresh_token)
+                except Exception:
+                    return False
+                if not response.session:
+                    return False
+                tokens = (response.session.access_token, response.session.refresh_token)
+                _refreshed[digest] = (now, tokens)
+
+        session["access_token"], session["refresh_token"] = tokens
+        return True
+
+    @staticmethod
+    def refresh_if_expiring():
+        """Refresh the access token on the server before it lapses.
+
+        Runs before each request. A token that fails verification ends the
+        session; one that expires within REFRESH_MARGIN_SECONDS is refreshed.
+        """
+        if "user_id" not in session or not session.get("access_token"):
+            return False
+        claims = AuthService.get_claims()
+        if claims is None:
+            session.clear()
+            return False
+        if claims["exp"] - time.time() > REFRESH_MARGIN_SECONDS:
+            return False
+        return AuthService.refresh_session()
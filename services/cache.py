@@ -0,0 +1,564 @@
+"""
+Computed-result cache shared by the workers on a host
+
+Caches kept in a worker's own memory are duplicated in every gunicorn worker
+and go stale in all but the one that saw a write. The backends here share one
+store between the processes on a host instead, without an external service:
+
+- "memory": an LRU dict in this process (one worker, or tests)
+- "sqlite": a table in a SQLite file in WAL mode, so readers never block
+- "shm": a fixed table of slots in a named shared-memory segment
+
+All of them expire entries after a TTL, evict the least recently used entry
+when full, count hits and misses, and offer get_or_compute(): on a miss only
+one caller on the host computes a key while the others wait for its result
+(single-flight). CACHE_BACKEND picks the backend; see config.py.
+
+The shared backends pickle values, so whoever can write their file or segment
+could run code in the app. Their files are created 0600 in a 0700 directory
+of this user (private_path), files and segments owned by anyone else are
+refused, and every pickle carries an HMAC keyed from SECRET_KEY: a value is
+only unpickled if this app wrote it.
+"""
+
+import hashlib
+import hmac
+import logging
+import os
+import pickle
+import sqlite3
+import stat
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+from flask import current_app, has_app_context
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-flight stays per process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 300
+DEFAULT_MAX_ENTRIES = 1024
+# Smallest "shm" slot; below this even small payloads would never be cached
+MIN_SLOT_BYTES = 1024
+# Locks that make one caller per key compute it; keys hash onto them
+FLIGHT_STRIPES = 256
+
+_MISSING = object()
+_MAC_SIZE = hashlib.sha256().digest_size
+
+
+def _digest(key):
+    """Stable 16-byte hash of a key, the same in every process"""
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+
+
+def _check_private(path, st):
+    """Raise PermissionError unless path (stat st) belongs to this user alone"""
+    if not hasattr(os, "getuid"):
+        return  # Windows: the temp directory is already per user
+    if st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise PermissionError(f"{path} must be owned by this user and not accessible to others")
+
+
+def private_path(filename):
+    """Path of filename in this user's 0700 directory under the temp directory"""
+    uid = os.getuid() if hasattr(os, "getuid") else ""
+    directory = os.path.join(tempfile.gettempdir(), f"progresso-{uid}")
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    # lstat: a symlink planted in a shared /tmp must not be followed
+    st = os.lstat(directory)
+    if not stat.S_ISDIR(st.st_mode):
+        raise PermissionError(f"{directory} is not a directory")
+    _check_private(directory, st)
+    return os.path.join(directory, filename)
+
+
+def _open_private(path):
+    """fd of path, created 0600; tightened if it is ours, refused if it isn't"""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0), 0o600)
+    try:
+        st = os.fstat(fd)
+        if hasattr(os, "getuid") and st.st_uid == os.getuid() and st.st_mode & 0o077:
+            os.fchmod(fd, 0o600)
+            st = os.fstat(fd)
+        _check_private(path, st)
+    except BaseException:
+        os.close(fd)
+        raise
+    return fd
+
+
+class CacheBackend:
+    """A key -> value store with TTLs, bounded size and single-flight fills.
+
+    Subclasses implement _load, _store, _delete and _clear; values they keep
+    outside this process go through _dumps/_loads (a pickle behind an HMAC of
+    secret), so row models and plain containers work.
+    """
+
+    name = None
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, default_ttl=DEFAULT_TTL, secret=None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        # Without a secret, values written by other processes read as misses
+        secret = os.urandom(32) if secret is None else secret
+        if isinstance(secret, str):
+            secret = secret.encode("utf-8")
+        self._mac_key = hashlib.sha256(b"progresso-cache:" + secret).digest()
+        self._stats_lock = threading.Lock()
+        self._stats = dict.fromkeys(
+            ("hits", "misses", "sets", "evictions", "expirations", "computes", "coalesced", "oversize"), 0
+        )
+        self._flights = [threading.Lock() for _ in range(FLIGHT_STRIPES)]
+
+    def _count(self, counter, n=1):
+        with self._stats_lock:
+            self._stats[counter] += n
+
+    def _dumps(self, value):
+        blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        return hmac.new(self._mac_key, blob, hashlib.sha256).digest() + blob
+
+    def _loads(self, data):
+        """The value in a _dumps blob, or _MISSING if this app didn't sign it"""
+        mac, blob = bytes(data[:_MAC_SIZE]), bytes(data[_MAC_SIZE:])
+        if not hmac.compare_digest(mac, hmac.new(self._mac_key, blob, hashlib.sha256).digest()):
+            return _MISSING
+        return pickle.loads(blob)
+
+    def get(self, key, default=None):
+        value = self._load(key, time.time())
+        if value is _MISSING:
+            self._count("misses")
+            return default
+        self._count("hits")
+        return value
+
+    def set(self, key, value, ttl=None):
+        """Store value for ttl seconds (the backend's default_ttl if None)"""
+        ttl = self.default_ttl if ttl is None else ttl
+        now = time.time()
+        self._store(key, value, now + ttl, now)
+        self._count("sets")
+
+    def delete(self, key):
+        self._delete(key)
+
+    def clear(self):
+        self._clear()
+
+    def get_or_compute(self, key, compute, ttl=None):
+        """The cached value of key, or compute() stored for ttl seconds.
+
+        Concurrent misses on the same key (across threads, and across the
+        processes of a shared backend) run compute() once: the rest wait on
+        the key's lock and then read what the first one stored. An exception
+        from compute() is raised to its caller and nothing is stored.
+        """
+        value = self._load(key, time.time())
+        if value is not _MISSING:
+            self._count("hits")
+            return value
+        self._count("misses")
+
+        with self._flight(key):
+            # Whoever held the lock before us may have filled the key
+            value = self._load(key, time.time())
+            if value is not _MISSING:
+                self._count("coalesced")
+                return value
+            self._count("computes")
+            value = compute()
+            self.set(key, value, ttl)
+            return value
+
+    @contextmanager
+    def _flight(self, key):
+        """Held while one caller computes key (this process only)"""
+        with self._flights[_digest(key)[0] % FLIGHT_STRIPES]:
+            yield
+
+    def stats(self):
+        """This process's counters, plus the entries currently stored"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["entries"] = self._size()
+        stats["backend"] = self.name
+        return stats
+
+    def _load(self, key, now):
+        raise NotImplementedError
+
+    def _store(self, key, value, expires_at, now):
+        raise NotImplementedError
+
+    def _delete(self, key):
+        raise NotImplementedError
+
+    def _clear(self):
+        raise NotImplementedError
+
+    def _size(self):
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """LRU dict in this process; values are kept as is, not copied"""
+
+    name = "memory"
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, default_ttl=DEFAULT_TTL):
+        super().__init__(max_entries, default_ttl)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, value), oldest use first
+
+    def _load(self, key, now):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            if entry[0] <= now:
+                del self._entries[key]
+                self._count("expirations")
+                return _MISSING
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def _store(self, key, value, expires_at, now):
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        if evicted:
+            self._count("evictions", evicted)
+
+    def _delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def _clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _size(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class _FileFlights:
+    """Single-flight across processes: an fcntl byte-range lock per stripe of a lock file.
+
+    Record locks belong to the process, not the thread, so each stripe is
+    also guarded by a thread lock; a thread holds both while it computes.
+    """
+
+    def __init__(self, path):
+        self._fd = _open_private(path) if fcntl else None
+
+    @contextmanager
+    def hold(self, stripe):
+        if self._fd is None:
+            yield
+            return
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, stripe)
+        try:
+            yield
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, stripe)
+
+
+class SQLiteCache(CacheBackend):
+    """Entries in a SQLite file every worker on the host opens.
+
+    WAL mode lets readers run while one worker writes; each thread has its
+    own connection. Eviction drops the least recently read entries once the
+    table outgrows max_entries. With max_entries None nothing is evicted;
+    expired entries are deleted at most once a minute, by whoever writes.
+    """
+
+    PURGE_SECONDS = 60
+
+    name = "sqlite"
+
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES, default_ttl=DEFAULT_TTL, secret=None):
+        super().__init__(max_entries, default_ttl, secret)
+        self.path = path
+        self._local = threading.local()
+        self._purge_at = 0.0
+        # SQLite gives the -wal and -shm files the database file's mode
+        os.close(_open_private(path))
+        for suffix in ("-wal", "-shm"):
+            if os.path.lexists(path + suffix):
+                _check_private(path + suffix, os.lstat(path + suffix))
+        self._file_flights = _FileFlights(path + ".flight")
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache(accessed_at)")
+
+    def _connect(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            # Autocommit: every statement is its own short transaction
+            db = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def _load(self, key, now):
+        db = self._connect()
+        row = db.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return _MISSING
+        if row[1] <= now:
+            db.execute("DELETE FROM cache WHERE key = ? AND expires_at <= ?", (key, now))
+            self._count("expirations")
+            return _MISSING
+        db.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return self._loads(row[0])
+
+    def _store(self, key, value, expires_at, now):
+        db = self._connect()
+        blob = self._dumps(value)
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, blob, expires_at, now),
+            )
+            excess = 0
+            if self.max_entries is None:
+                if now >= self._purge_at:
+                    self._purge_at = now + self.PURGE_SECONDS
+                    purged = db.execute("DELETE FROM cache WHERE expires_at <= ?", (now,)).rowcount
+                    self._count("expirations", purged)
+            else:
+                excess = db.execute("SELECT count(*) FROM cache").fetchone()[0] - self.max_entries
+            if excess > 0:
+                # Expired entries go first, then the least recently read
+                db.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache "
+                    "ORDER BY expires_at > ?, accessed_at LIMIT ?)",
+                    (now, excess),
+                )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        if excess > 0:
+            self._count("evictions", excess)
+
+    def _delete(self, key):
+        self._connect().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def _clear(self):
+        self._connect().execute("DELETE FROM cache")
+
+    def _size(self):
+        return self._connect().execute("SELECT count(*) FROM cache").fetchone()[0]
+
+    @contextmanager
+    def _flight(self, key):
+        stripe = _digest(key)[0] % FLIGHT_STRIPES
+        with self._flights[stripe], self._file_flights.hold(stripe):
+            yield
+
+
+class SharedMemoryCache(CacheBackend):
+    """A fixed table of slots in a named shared-memory segment.
+
+    Every worker maps the same segment, so a read is a copy out of memory
+    with no file or socket in between. A key lives in one of PROBE slots
+    after its hash; storing into a full neighbourhood replaces the least
+    recently read slot there. Values that pickle to more than slot_bytes are
+    not cached: they count as "oversize" in stats() and log a warning, so the
+    next call computes them again. One flock on a lock file serializes access to the slots.
+    A segment of the same name created by another user is refused.
+    """
+
+    name = "shm"
+
+    # digest, expires_at, accessed_at, value length
+    _HEADER = struct.Struct("<16sddI")
+    PROBE = 8
+
+    def __init__(
+        self, name, max_entries=DEFAULT_MAX_ENTRIES, default_ttl=DEFAULT_TTL, slot_bytes=32 * 1024, secret=None
+    ):
+        if slot_bytes < MIN_SLOT_BYTES:
+            raise ValueError(f"slot_bytes must be at least {MIN_SLOT_BYTES}, got {slot_bytes}")
+        super().__init__(max_entries, default_ttl, secret)
+        self.slot_bytes = slot_bytes
+        self._slot_size = self._HEADER.size + slot_bytes
+        try:
+            # Created 0600
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=max_entries * self._slot_size)
+        except FileExistsError:
+            self._shm = shared_memory.SharedMemory(name=name)
+        # The segment outlives any one worker: keep the resource tracker from
+        # unlinking it when this process exits
+        resource_tracker.unregister(self._shm._name, "shared_memory")
+        if os.name == "posix":
+            try:
+                _check_private(f"Shared memory segment {name}", os.fstat(self._shm._fd))
+            except PermissionError:
+                self._shm.close()
+                raise
+        # Another worker may have created it with other settings
+        self._slots = self._shm.size // self._slot_size
+        self._lock = threading.Lock()
+        self._lock_fd = _open_private(private_path(f"{name}.lock")) if fcntl else None
+        self._file_flights = _FileFlights(private_path(f"{name}.flight"))
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            if self._lock_fd is not None:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if self._lock_fd is not None:
+                    fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _header(self, slot):
+        return self._HEADER.unpack_from(self._shm.buf, slot * self._slot_size)
+
+    def _neighbourhood(self, digest):
+        start = int.from_bytes(digest[:8], "little") % self._slots
+        return [(start + i) % self._slots for i in range(min(self.PROBE, self._slots))]
+
+    def _find(self, digest):
+        for slot in self._neighbourhood(digest):
+            header = self._header(slot)
+            if header[0] == digest and header[3]:
+                return slot, header
+        return None, None
+
+    def _load(self, key, now):
+        digest = _digest(key)
+        with self._locked():
+            slot, header = self._find(digest)
+            if slot is None:
+                return _MISSING
+            offset = slot * self._slot_size
+            if header[1] <= now:
+                self._HEADER.pack_into(self._shm.buf, offset, bytes(16), 0.0, 0.0, 0)
+                self._count("expirations")
+                return _MISSING
+            self._HEADER.pack_into(self._shm.buf, offset, digest, header[1], now, header[3])
+            start = offset + self._HEADER.size
+            blob = bytes(self._shm.buf[start:start + header[3]])
+        return self._loads(blob)
+
+    def _store(self, key, value, expires_at, now):
+        blob = self._dumps(value)
+        if len(blob) > self.slot_bytes:
+            self._count("oversize")
+            logger.warning(
+                "Not caching %s: %d bytes pickled exceeds CACHE_SHM_SLOT_BYTES=%d",
+                key, len(blob), self.slot_bytes,
+            )
+            return
+        digest = _digest(key)
+        evicted = False
+        with self._locked():
+            slot, _ = self._find(digest)
+            if slot is None:
+                # An empty or expired slot, else the least recently read one
+                candidates = [(s, self._header(s)) for s in self._neighbourhood(digest)]
+                free = [s for s, h in candidates if not h[3] or h[1] <= now]
+                if free:
+                    slot = free[0]
+                else:
+                    slot = min(candidates, key=lambda c: c[1][2])[0]
+                    evicted = True
+            offset = slot * self._slot_size
+            start = offset + self._HEADER.size
+            self._shm.buf[start:start + len(blob)] = blob
+            self._HEADER.pack_into(self._shm.buf, offset, digest, expires_at, now, len(blob))
+        if evicted:
+            self._count("evictions")
+
+    def _delete(self, key):
+        with self._locked():
+            slot, _ = self._find(_digest(key))
+            if slot is not None:
+                self._HEADER.pack_into(self._shm.buf, slot * self._slot_size, bytes(16), 0.0, 0.0, 0)
+
+    def _clear(self):
+        with self._locked():
+            self._shm.buf[:self._slots * self._slot_size] = bytes(self._slots * self._slot_size)
+
+    def _size(self):
+        now = time.time()
+        with self._locked():
+            return sum(
+                1 for slot in range(self._slots)
+                if self._header(slot)[3] and self._header(slot)[1] > now
+            )
+
+    @contextmanager
+    def _flight(self, key):
+        stripe = _digest(key)[0] % FLIGHT_STRIPES
+        with self._flights[stripe], self._file_flights.hold(stripe):
+            yield
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def create_cache(
+    backend, max_entries=DEFAULT_MAX_ENTRIES, default_ttl=DEFAULT_TTL, path=None, slot_bytes=32 * 1024, secret=None
+):
+    """A backend by name ("memory", "sqlite" or "shm")"""
+    if backend == "memory":
+        return MemoryCache(max_entries, default_ttl)
+    if backend == "sqlite":
+        path = path or private_path("cache.sqlite3")
+        return SQLiteCache(path, max_entries, default_ttl, secret)
+    if backend == "shm":
+        # Named per user, so another user's segment is never even opened
+        uid = os.getuid() if hasattr(os, "getuid") else ""
+        return SharedMemoryCache(path or f"progresso-cache-{uid}", max_entries, default_ttl, slot_bytes, secret)
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+
+def get_cache():
+    """Process-wide cache, built from the CACHE_* settings on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                config = current_app.config if has_app_context() else {}
+                _cache = create_cache(
+                    config.get("CACHE_BACKEND", "memory"),
+                    max_entries=config.get("CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+                    default_ttl=config.get("CACHE_TTL", DEFAULT_TTL),
+                    path=config.get("CACHE_PATH"),
+                    slot_bytes=config.get("CACHE_SHM_SLOT_BYTES", 32 * 1024),
+                    secret=config.get("SECRET_KEY"),
+                )
+    return _cache
@@ -0,0 +1,65 @@
+"""
+Single-flight for identical concurrent reads
+
+Several tabs, or a double click, send the same GET at once, and each copy
+used to run the whole query fan-out. coalesced() keys the response data by
+(user, endpoint, query string, user's today, data versions) and computes it
+through the shared cache's get_or_compute(), so duplicates on any worker of
+the host wait for the first computation and reuse its result.
+
+The data versions are bumped by every write to the domains' tables (see
+services/data_versions.py), so a write changes the key: no request is ever
+served data from before a write it could see. The user's today is in the key
+(and the server's) because health scores and default weeks are relative to it.
+
+Each computed payload is also kept as the request's last good one for
+STALE_TTL. While Supabase is unavailable (database/resilience.py) the
+request gets that copy instead of an error, with "stale": true added.
+"""
+
+import json
+from datetime import date
+from flask import request, session
+from database.resilience import SupabaseUnavailable
+from services.cache import get_cache
+from services.data_versions import DataVersionService
+from services.task_service import get_user_today
+
+# How long a request's last good payload can stand in during an outage
+STALE_TTL = 24 * 60 * 60
+
+
+def _key(*parts):
+    request_id = [session.get("user_id"), request.path, sorted(request.args.items(multi=True))]
+    return json.dumps(list(parts) + request_id, separators=(",", ":"))
+
+
+def coalesced(compute, *domains, ttl=None):
+    """compute() for this request, shared with identical requests.
+
+    domains are the data domains ("tasks", "progress", ...) whose tables the
+    payload is built from. The payload is a dict (it may get a "stale" flag)
+    and must pickle for the shared backends.
+    """
+    cache = get_cache()
+    stale_key = _key("stale")
+
+    def compute_and_keep():
+        payload = compute()
+        cache.set(stale_key, payload, STALE_TTL)
+        return payload
+
+    try:
+        versions = DataVersionService.get_versions(*domains)
+        key = _key(
+            "coalesced",
+            get_user_today().isoformat(),
+            date.today().isoformat(),
+            [versions[d] for d in domains],
+        )
+        return cache.get_or_compute(key, compute_and_keep, ttl)
+    except SupabaseUnavailable:
+        payload = cache.get(stale_key)
+        if payload is None:
+            raise
+        return {**payload, "stale": True}
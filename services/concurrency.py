@@ -0,0 +1,65 @@
+"""
+Run a request's independent Supabase queries concurrently
+
+Each call is a blocking HTTP round trip to PostgREST, so running independent
+ones on a small shared thread pool makes an endpoint cost about as much as its
+slowest query instead of the sum. Workers run inside a copy of the calling
+request's context (session, user id, timezone cookie) and share its client
+and task cache.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import copy_current_request_context, current_app, g, has_request_context
+from database.supabase_db import get_supabase
+from services.task_service import get_task_cache
+
+_pool = None
+_pool_lock = threading.Lock()
+_worker = threading.local()
+
+
+def _get_pool():
+    """Process-wide pool, sized by the QUERY_WORKERS setting"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=current_app.config.get("QUERY_WORKERS", 8),
+                    thread_name_prefix="query",
+                )
+    return _pool
+
+
+def gather(*calls):
+    """Run zero-argument callables concurrently and return their results in order.
+
+    Falls back to running them one after another outside a request, and when
+    called from a worker (a nested gather would wait on a pool it is occupying).
+    The first exception raised by a call is re-raised here.
+    """
+    if len(calls) < 2 or not has_request_context() or getattr(_worker, "active", False):
+        return [call() for call in calls]
+
+    # Create the authenticated client and task cache once, before the workers need them
+    client = get_supabase()
+    task_cache = get_task_cache()
+
+    def bind(call):
+        @copy_current_request_context
+        def run():
+            # The copied context gets a fresh app context (and g), so hand them over
+            g.supabase = client
+            g.task_cache = task_cache
+            _worker.active = True
+            try:
+                return call()
+            finally:
+                _worker.active = False
+
+        return run
+
+    pool = _get_pool()
+    futures = [pool.submit(bind(call)) for call in calls]
+    return [future.result() for future in futures]
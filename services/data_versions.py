@@ -0,0 +1,73 @@
+"""
+Per-user data version counters (user_data_versions)
+
+Triggers bump a user's counter for a domain on every write to its table (see
+database/migration_data_versions.sql), so whether a cached response is still
+current is one primary-key lookup rather than a re-read of the rows.
+"""
+
+import hashlib
+from flask import make_response, session
+from database.supabase_db import get_supabase
+
+# Domain -> the table whose writes bump it
+DOMAINS = {
+    "tasks": "tasks",
+    "progress": "progress_logs",
+    "kanban": "kanban_items",
+    "focus": "focus_sessions",
+}
+
+
+def get_current_user_id():
+    """Get the current user's ID from session"""
+    return session.get("user_id")
+
+
+class DataVersionService:
+    @staticmethod
+    def get_versions(*domains):
+        """Current counter per domain (0 until the user's first write to it)"""
+        for domain in domains:
+            if domain not in DOMAINS:
+                raise ValueError(f"Unknown data domain: {domain}")
+
+        supabase = get_supabase()
+        user_id = get_current_user_id()
+
+        query = (
+            supabase.table("user_data_versions")
+            .select("domain, version")
+            .eq("user_id", user_id)
+        )
+        if len(domains) == 1:
+            query = query.eq("domain", domains[0])
+        else:
+            query = query.in_("domain", list(domains))
+
+        result = query.execute()
+
+        versions = dict.fromkeys(domains, 0)
+        for row in result.data:
+            versions[row["domain"]] = row["version"]
+        return versions
+
+    @staticmethod
+    def etag(*domains):
+        """Validator for a response built only from these domains' tables"""
+        versions = DataVersionService.get_versions(*domains)
+        # The user is part of the tag: another account on the same browser
+        # can have the same counters
+        key = ":".join([get_current_user_id() or ""] + [f"{d}={versions[d]}" for d in domains])
+        return hashlib.md5(key.encode("utf-8")).hexdigest()
+
+
+def versioned(response, etag):
+    """Tag a response so the browser revalidates it (If-None-Match) on every use"""
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def not_modified(etag):
+    return versioned(make_response("", 304), etag)
@@ -0,0 +1,183 @@
+"""
+In-process pub/sub of per-user change events, streamed as Server-Sent Events
+
+Service write methods publish small events ({"id", "type", "action", ...data});
+every open /api/events stream of that user receives them, so other tabs and
+devices patch their state instead of polling.
+
+Events only reach streams served by the same process, so they are a hint, not
+the source of truth: the writing tab re-fetches after its own change, and a
+stream that reconnects to another process (or after a restart) is told to
+resync. A stream also ends after MAX_STREAM_SECONDS, so it doesn't hold a
+worker thread for good; the EventSource reconnects and catches up.
+
+Every open stream holds a request, so /api/events is off unless
+EVENTS_ENABLED is set. It works on a single long-running server process with
+threads or greenlets (the Flask dev server, gunicorn with gthread or gevent
+workers, waitress), where tabs share the process's pub/sub. It does not on
+serverless hosts such as Vercel (each stream hits the function time limit,
+and instances share nothing) or on sync gunicorn workers (a tab per worker).
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from services.models import json_default
+
+# Events kept per user so a reconnecting EventSource can catch up (Last-Event-ID)
+REPLAY_SIZE = 100
+# A user's history is dropped once they have no stream and no event for this long
+HISTORY_IDLE_SECONDS = 600
+# Events buffered for one slow stream before it is told to resync
+SUBSCRIBER_BUFFER = 100
+HEARTBEAT_SECONDS = 20
+RETRY_MS = 5000
+# How long one stream stays open before the client is made to reconnect
+MAX_STREAM_SECONDS = 300
+
+# Prefix of SSE ids, so a Last-Event-ID from another process is recognised
+_BOOT = None
+
+
+def _new_boot():
+    global _BOOT
+    _BOOT = f"{time.time_ns() // 1000:x}-{os.getpid():x}"
+
+
+_new_boot()
+# Preforking servers import the app once: each worker has its own history
+os.register_at_fork(after_in_child=_new_boot)
+
+_lock = threading.Lock()
+_next_id = 0
+_subscribers = {}  # user_id -> set of _Subscriber
+_history = {}  # user_id -> deque of recent events
+_last_event_at = {}  # user_id -> monotonic time of their last event
+_swept_at = time.monotonic()
+_dropped_through = 0  # newest event id of any dropped history
+
+
+class _Subscriber:
+    """One open stream's pending events"""
+
+    def __init__(self):
+        self.events = deque()
+        self.overflowed = False
+        self.ready = threading.Condition()
+
+    def put(self, event):
+        with self.ready:
+            if len(self.events) >= SUBSCRIBER_BUFFER:
+                self.events.clear()
+                self.overflowed = True
+            else:
+                self.events.append(event)
+            self.ready.notify()
+
+    def take(self, timeout):
+        """Pending events (empty after timeout); None if the stream fell behind"""
+        with self.ready:
+            if not self.events and not self.overflowed:
+                self.ready.wait(timeout)
+            if self.overflowed:
+                return None
+            events = list(self.events)
+            self.events.clear()
+            return events
+
+
+def publish(user_id, event_type, action, **data):
+    """Send a change event to every stream the user has open"""
+    global _next_id
+    if not user_id:
+        return None
+
+    now = time.monotonic()
+    with _lock:
+        _next_id += 1
+        event = {"id": _next_id, "type": event_type, "action": action, **data}
+        _sweep_history(now)
+        _history.setdefault(user_id, deque(maxlen=REPLAY_SIZE)).append(event)
+        _last_event_at[user_id] = now
+        subscribers = list(_subscribers.get(user_id, ()))
+
+    for subscriber in subscribers:
+        subscriber.put(event)
+    return event
+
+
+def _sweep_history(now):
+    """Drop idle users' histories, at most once a minute (caller holds _lock)"""
+    global _swept_at, _dropped_through
+    if now - _swept_at < 60:
+        return
+    _swept_at = now
+    for user_id, last in list(_last_event_at.items()):
+        if now - last > HISTORY_IDLE_SECONDS and user_id not in _subscribers:
+            del _last_event_at[user_id]
+            history = _history.pop(user_id)
+            _dropped_through = max(_dropped_through, history[-1]["id"])
+
+
+def _format(event):
+    payload = json.dumps(event, default=json_default, separators=(",", ":"))
+    return f"id: {_BOOT}:{event['id']}\nevent: {event['type']}\ndata: {payload}\n\n"
+
+
+def _missed_since(user_id, last_event_id):
+    """Events after an SSE id, or None if the client can't be caught up"""
+    boot, _, number = last_event_id.partition(":")
+    if boot != _BOOT or not number.isdigit():
+        return None
+    number = int(number)
+
+    history = _history.get(user_id)
+    if history is None:
+        # The history may have been dropped while the client was away
+        return None if number < _dropped_through else []
+    if len(history) == REPLAY_SIZE and history[0]["id"] > number + 1:
+        return None
+    return [e for e in history if e["id"] > number]
+
+
+def stream(user_id, last_event_id=None):
+    """Yield SSE text for one client until it disconnects.
+
+    A "resync" event tells the client it missed events and should re-fetch.
+    """
+    subscriber = _Subscriber()
+    with _lock:
+        _subscribers.setdefault(user_id, set()).add(subscriber)
+        missed = _missed_since(user_id, last_event_id) if last_event_id else []
+
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        if missed is None:
+            yield _format({"id": _next_id, "type": "resync", "action": "resync"})
+            missed = []
+        for event in missed:
+            yield _format(event)
+
+        ends_at = time.monotonic() + MAX_STREAM_SECONDS
+        while True:
+            remaining = ends_at - time.monotonic()
+            if remaining <= 0:
+                return
+            events = subscriber.take(min(HEARTBEAT_SECONDS, remaining))
+            if events is None:
+                yield _format({"id": _next_id, "type": "resync", "action": "resync"})
+                return
+            if not events:
+                # Comment line: keeps proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+            for event in events:
+                yield _format(event)
+    finally:
+        with _lock:
+            subscribers = _subscribers.get(user_id)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del _subscribers[user_id]
@@ -2,9 +2,15 @@
 Focus/Pomodoro session service - Supabase version with optional user isolation
 """
 
-from datetime import datetime, date, timedelta
+from datetime import datetime, timedelta, timezone
 from flask import session
+from database import postgres_db
 from database.supabase_db import get_supabase
+from services.concurrency import gather
+from services.events import publish
+from services.models import FocusSession
+from services.pagination import paginate
+from services.task_service import get_user_timezone, get_user_today
 
 
 def get_current_user_id():
@@ -12,9 +18,38 @@ def get_current_user_id():
     return session.get("user_id")
 
 
+# get_stats in one round trip on the direct Postgres backend: the totals are
+# FILTERed sums, and the streak is the run of consecutive days (day minus its
+# row_number is constant within a run) that ends today or yesterday
+STATS_SQL = """
+WITH done AS (
+    SELECT duration_minutes, local_day FROM focus_sessions
+    WHERE user_id = %(user_id)s AND is_completed = true
+), days AS (
+    SELECT DISTINCT local_day FROM done
+    WHERE local_day BETWEEN %(today)s::date - 364 AND %(today)s::date
+), runs AS (
+    SELECT local_day, local_day - (row_number() OVER (ORDER BY local_day))::int AS run
+    FROM days
+), latest AS (
+    SELECT run FROM runs WHERE local_day >= %(today)s::date - 1
+    ORDER BY local_day DESC LIMIT 1
+)
+SELECT
+    COALESCE(sum(duration_minutes) FILTER (WHERE local_day = %(today)s::date), 0)::int AS today_minutes,
+    COALESCE(sum(duration_minutes) FILTER (WHERE local_day >= %(week_start)s::date), 0)::int AS week_minutes,
+    COALESCE(sum(duration_minutes), 0)::int AS all_time_minutes,
+    count(*)::int AS total_sessions,
+    (SELECT count(*) FROM runs WHERE run = (SELECT run FROM latest))::int AS streak_days
+FROM done
+"""
+
+
 class FocusService:
     # Set to True after running migration_add_user_id.sql
     USER_ISOLATION_ENABLED = True
+    # Rows per page of the streak read; paginate asks for one extra, which keeps it at the row cap
+    STREAK_PAGE_SIZE = 999
 
     @staticmethod
     def start_session(data):
@@ -24,11 +59,15 @@ class FocusService:
 
         duration = data.get("duration_minutes", 25)
         kanban_item_id = data.get("kanban_item_id")
+        started_at = datetime.now(timezone.utc)
 
         insert_data = {
             "kanban_item_id": kanban_item_id,
             "duration_minutes": duration,
-            "started_at": datetime.now().isoformat(),
+            "started_at": started_at.isoformat(),
+            # Day bucket on the user's wall clock, so today/week/streak are
+            # index lookups on (user_id, local_day) instead of timestamp ranges
+            "local_day": started_at.astimezone(get_user_timezone()).date().isoformat(),
         }
 
         if FocusService.USER_ISOLATION_ENABLED and user_id:
@@ -36,7 +75,10 @@ class FocusService:
 
         result = supabase.table("focus_sessions").insert(insert_data).execute()
 
-        return result.data[0] if result.data else None
+        session_data = FocusSession.first(result.data)
+        if session_data:
+            publish(user_id, "focus", "saved", session=session_data)
+        return session_data
 
     @staticmethod
     def complete_session(session_id, notes=None):
@@ -49,7 +91,7 @@ class FocusService:
             .update(
                 {
                     "is_completed": True,
-                    "ended_at": datetime.now().isoformat(),
+                    "ended_at": datetime.now(timezone.utc).isoformat(),
                     "notes": notes,
                 }
             )
@@ -61,7 +103,11 @@ class FocusService:
 
         query.execute()
 
-        return FocusService.get_session_by_id(session_id)
+        session_data = FocusService.get_session_by_id(session_id)
+        if session_data:
+            # Tabs re-fetch the totals themselves; computing them here cost 4 queries
+            publish(user_id, "focus", "saved", session=session_data)
+        return session_data
 
     @staticmethod
     def get_session_by_id(session_id):
@@ -69,7 +115,12 @@ class FocusService:
         supabase = get_supabase()
         user_id = get_current_user_id()
 
-        query = supabase.table("focus_sessions").select("*").eq("id", session_id)
+        # The linked card's title comes back in the same request
+        query = (
+            supabase.table("focus_sessions")
+            .select(f"{FocusSession.COLUMNS}, kanban_items(title)")
+            .eq("id", session_id)
+        )
 
         if FocusService.USER_ISOLATION_ENABLED and user_id:
             query = query.eq("user_id", user_id)
@@ -77,68 +128,49 @@ class FocusService:
         result = query.execute()
 
         if result.data:
-            session_data = result.data[0]
-            # Get task info if linked
-            if session_data.get("kanban_item_id"):
-                task_result = (
-                    supabase.table("kanban_items")
-                    .select("title")
-                    .eq("id", session_data["kanban_item_id"])
-                    .execute()
-                )
-                session_data["task_title"] = (
-                    task_result.data[0]["title"] if task_result.data else None
-                )
-            return session_data
+            return FocusService._with_task_title(result.data[0])
         return None
 
     @staticmethod
-    def get_today_sessions():
-        """Get all sessions from today"""
+    def get_today_sessions(limit, cursor=None):
+        """A page of today's sessions, newest first, and the cursor of the next page"""
         supabase = get_supabase()
         user_id = get_current_user_id()
-        today = date.today().isoformat()
+        today = get_user_today().isoformat()
 
-        query = supabase.table("focus_sessions").select("*, kanban_items(title)")
+        query = supabase.table("focus_sessions").select(
+            f"{FocusSession.COLUMNS}, kanban_items(title)"
+        )
 
         if FocusService.USER_ISOLATION_ENABLED and user_id:
             query = query.eq("user_id", user_id)
 
-        result = (
-            query.gte("started_at", f"{today}T00:00:00")
-            .lte("started_at", f"{today}T23:59:59")
-            .order("started_at", desc=True)
-            .execute()
+        rows, next_cursor = paginate(
+            query.eq("local_day", today), "started_at", limit, cursor, desc=True
         )
+        return [FocusService._with_task_title(row) for row in rows], next_cursor
 
-        sessions = []
-        for row in result.data:
-            session_data = {k: v for k, v in row.items() if k != "kanban_items"}
-            session_data["task_title"] = (
-                row["kanban_items"]["title"] if row.get("kanban_items") else None
-            )
-            sessions.append(session_data)
-
-        return sessions
+    @staticmethod
+    def _with_task_title(row):
+        """A session row with the title of its embedded kanban_items(title)"""
+        session_data = FocusSession.from_data(row)
+        if row.get("kanban_items"):
+            session_data.task_title = row["kanban_items"]["title"]
+        return session_data
 
     @staticmethod
     def get_total_today():
         """Get total focus time for today in minutes"""
         supabase = get_supabase()
         user_id = get_current_user_id()
-        today = date.today().isoformat()
+        today = get_user_today().isoformat()
 
         query = supabase.table("focus_sessions").select("duration_minutes")
 
         if FocusService.USER_ISOLATION_ENABLED and user_id:
             query = query.eq("user_id", user_id)
 
-        result = (
-            query.gte("started_at", f"{today}T00:00:00")
-            .lte("started_at", f"{today}T23:59:59")
-            .eq("is_completed", True)
-            .execute()
-        )
+        result = query.eq("local_day", today).eq("is_completed", True).execute()
 
         total = sum(s["duration_minutes"] for s in result.data) if result.data else 0
         return total
@@ -148,11 +180,13 @@ class FocusService:
         """Get focus statistics"""
         supabase = get_supabase()
         user_id = get_current_user_id()
-        today = date.today()
+        today = get_user_today()
         week_start = today - timedelta(days=today.weekday())
 
-        # Today's total
-        today_total = FocusService.get_total_today()
+        if postgres_db.is_enabled() and user_id:
+            return FocusService._stats_response(
+                **postgres_db.fetch_one(STATS_SQL, user_id, today=today, week_start=week_start)
+            )
 
         # This week's total
         week_query = supabase.table("focus_sessions").select("duration_minutes")
@@ -160,16 +194,8 @@ class FocusService:
         if FocusService.USER_ISOLATION_ENABLED and user_id:
             week_query = week_query.eq("user_id", user_id)
 
-        week_result = (
-            week_query.gte("started_at", f"{week_start.isoformat()}T00:00:00")
-            .eq("is_completed", True)
-            .execute()
-        )
-
-        week_total = (
-            sum(s["duration_minutes"] for s in week_result.data)
-            if week_result.data
-            else 0
+        week_query = week_query.gte("local_day", week_start.isoformat()).eq(
+            "is_completed", True
         )
 
         # All time total and count
@@ -180,7 +206,21 @@ class FocusService:
         if FocusService.USER_ISOLATION_ENABLED and user_id:
             all_query = all_query.eq("user_id", user_id)
 
-        all_result = all_query.eq("is_completed", True).execute()
+        all_query = all_query.eq("is_completed", True)
+
+        # Today, week, all time and streak don't depend on each other
+        today_total, week_result, all_result, streak = gather(
+            FocusService.get_total_today,
+            week_query.execute,
+            all_query.execute,
+            FocusService._calculate_streak,
+        )
+
+        week_total = (
+            sum(s["duration_minutes"] for s in week_result.data)
+            if week_result.data
+            else 0
+        )
 
         all_total = (
             sum(s["duration_minutes"] for s in all_result.data)
@@ -189,19 +229,22 @@ class FocusService:
         )
         session_count = all_result.count or 0
 
-        # Streak
-        streak = FocusService._calculate_streak()
+        return FocusService._stats_response(
+            today_total, week_total, all_total, session_count, streak
+        )
 
+    @staticmethod
+    def _stats_response(today_minutes, week_minutes, all_time_minutes, total_sessions, streak_days):
         return {
-            "today_minutes": today_total,
-            "today_hours": round(today_total / 60, 1),
-            "week_minutes": week_total,
-            "week_hours": round(week_total / 60, 1),
-            "all_time_minutes": all_total,
-            "all_time_hours": round(all_total / 60, 1),
-            "total_sessions": session_count,
-            "streak_days": streak,
-            "motivation_level": FocusService._get_motivation_level(today_total),
+            "today_minutes": today_minutes,
+            "today_hours": round(today_minutes / 60, 1),
+            "week_minutes": week_minutes,
+            "week_hours": round(week_minutes / 60, 1),
+            "all_time_minutes": all_time_minutes,
+            "all_time_hours": round(all_time_minutes / 60, 1),
+            "total_sessions": total_sessions,
+            "streak_days": streak_days,
+            "motivation_level": FocusService._get_motivation_level(today_minutes),
         }
 
     @staticmethod
@@ -209,34 +252,46 @@ class FocusService:
         """Calculate consecutive days with completed sessions"""
         supabase = get_supabase()
         user_id = get_current_user_id()
-        streak = 0
-        check_date = date.today()
-
-        for _ in range(365):
-            day_str = check_date.isoformat()
-
-            query = supabase.table("focus_sessions").select("id", count="exact")
+        today = get_user_today()
 
+        def page(cursor):
+            query = supabase.table("focus_sessions").select("id, local_day")
             if FocusService.USER_ISOLATION_ENABLED and user_id:
                 query = query.eq("user_id", user_id)
-
-            result = (
-                query.gte("started_at", f"{day_str}T00:00:00")
-                .lte("started_at", f"{day_str}T23:59:59")
-                .eq("is_completed", True)
-                .execute()
+            query = query.eq("is_completed", True).gte(
+                "local_day", (today - timedelta(days=364)).isoformat()
             )
+            return paginate(query, "local_day", FocusService.STREAK_PAGE_SIZE, cursor, desc=True)
+
+        # Rows are per session, not per day, so a busy year runs past the row
+        # cap. Page newest first and stop once a page reaches past the day that
+        # broke the streak: older rows can't extend it.
+        active_days = set()
+        cursor = None
+        while True:
+            rows, cursor = page(cursor)
+            active_days.update(row["local_day"] for row in rows)
+            streak, break_day = FocusService._streak_from_days(active_days, today)
+            if cursor is None or rows[-1]["local_day"] < break_day.isoformat():
+                return streak
 
-            if result.count and result.count > 0:
+    @staticmethod
+    def _streak_from_days(active_days, today):
+        """The streak ending today (or yesterday) over ISO days, and the day that ends it"""
+        streak = 0
+        check_date = today
+
+        for _ in range(365):
+            if check_date.isoformat() in active_days:
                 streak += 1
                 check_date -= timedelta(days=1)
             else:
-                if check_date == date.today():
+                if check_date == today:
                     check_date -= timedelta(days=1)
                     continue
                 break
 
-        return streak
+        return streak, check_date
 
     @staticmethod
     def _get_motivation_level(total_minutes):
@@ -296,6 +351,7 @@ class FocusService:
             query = query.eq("user_id", user_id)
 
         query.execute()
+        publish(user_id, "focus", "deleted", session_id=session_id)
         return True
 
     @staticmethod
@@ -303,14 +359,13 @@ class FocusService:
         """Clear all of today's focus sessions"""
         supabase = get_supabase()
         user_id = get_current_user_id()
-        today = date.today().isoformat()
+        today = get_user_today().isoformat()
 
         query = supabase.table("focus_sessions").delete()
 
         if FocusService.USER_ISOLATION_ENABLED and user_id:
             query = query.eq("user_id", user_id)
 
-        query.gte("started_at", f"{today}T00:00:00").lte(
-            "started_at", f"{today}T23:59:59"
-        ).execute()
+        query.eq("local_day", today).execute()
+        publish(user_id, "focus", "cleared", local_day=today)
         return True
@@ -5,6 +5,16 @@ Kanban board service - Supabase version with optional user isolation
 from datetime import date, timedelta
 from flask import session
 from database.supabase_db import get_supabase
+from services.concurrency import gather
+from services.events import publish
+from services.models import KanbanItem
+from services.pagination import DEFAULT_LIMIT, paginate
+from services.ranking import append_key, column_keys, key_between
+
+STATUSES = ("TODO", "IN_PROGRESS", "DONE")
+# DONE cards become ARCHIVED 30 days after they were finished
+# (archive_done_kanban_items, run nightly by pg_cron); only paged, never on the board
+ARCHIVED = "ARCHIVED"
 
 
 def get_current_user_id():
@@ -16,26 +26,55 @@ class KanbanService:
     # Set to True after running migration_add_user_id.sql
     USER_ISOLATION_ENABLED = True
 
+    # The board's first page of DONE; the other columns get the full limit
+    DONE_PAGE_SIZE = 20
+
     @staticmethod
-    def get_all_items():
-        """Get all Kanban items grouped by status"""
+    def _column_query(status):
+        """One column's cards (idx_kanban_user_status_rank), not yet ordered"""
         supabase = get_supabase()
         user_id = get_current_user_id()
 
-        query = supabase.table("kanban_items").select("*")
+        query = supabase.table("kanban_items").select(KanbanItem.COLUMNS).eq("status", status)
 
         if KanbanService.USER_ISOLATION_ENABLED and user_id:
             query = query.eq("user_id", user_id)
 
-        result = query.order("status").order("position").order("due_date").execute()
-
-        items = result.data
+        return query
 
-        return {
-            "TODO": [i for i in items if i["status"] == "TODO"],
-            "IN_PROGRESS": [i for i in items if i["status"] == "IN_PROGRESS"],
-            "DONE": [i for i in items if i["status"] == "DONE"],
+    @staticmethod
+    def get_all_items(limit=DEFAULT_LIMIT):
+        """The board: the first page of each column, and each column's next cursor"""
+        limits = {
+            "TODO": limit,
+            "IN_PROGRESS": limit,
+            "DONE": min(limit, KanbanService.DONE_PAGE_SIZE),
         }
+        pages = gather(
+            *(
+                lambda status=status: KanbanService.get_column_page(status, limit=limits[status])
+                for status in STATUSES
+            )
+        )
+
+        board = {status: items for status, (items, _) in zip(STATUSES, pages)}
+        board["next_cursor"] = {status: cursor for status, (_, cursor) in zip(STATUSES, pages)}
+        return board
+
+    @staticmethod
+    def get_column_page(status, cursor=None, limit=DEFAULT_LIMIT):
+        """A page of one column in board order, and the cursor of the next page"""
+        if status not in STATUSES and status != ARCHIVED:
+            raise ValueError("Invalid status")
+
+        rows, next_cursor = paginate(KanbanService._column_query(status), "rank_key", limit, cursor)
+        return KanbanItem.many(rows), next_cursor
+
+    @staticmethod
+    def _top_of_done():
+        """Rank that puts a card above the rest of DONE, so the first page is the most recent"""
+        first = KanbanService._column_query("DONE").order("rank_key").order("id").limit(1).execute().data
+        return key_between(None, first[0]["rank_key"] if first else None)
 
     @staticmethod
     def get_next_date():
@@ -70,37 +109,23 @@ class KanbanService:
 
         description = data.get("description", "").strip() or None
 
-        # Use provided date or auto-assign next date
-        if data.get("due_date"):
-            due_date = data["due_date"]
-        else:
-            due_date = KanbanService.get_next_date().isoformat()
+        # Without a date, the kanban_items_default_due_date trigger assigns the
+        # day after the user's latest card (see get_next_date) in the same write
+        due_date = data.get("due_date") or None
 
         # Use provided status or default to TODO
         status = data.get("status", "TODO").upper()
         status_map = {"todo": "TODO", "doing": "IN_PROGRESS", "done": "DONE"}
         status = status_map.get(status.lower(), status)
-        if status not in ("TODO", "IN_PROGRESS", "DONE"):
+        if status not in STATUSES:
             status = "TODO"
 
-        # Get next position for target column
-        pos_query = (
-            supabase.table("kanban_items").select("position").eq("status", status)
-        )
-
-        if KanbanService.USER_ISOLATION_ENABLED and user_id:
-            pos_query = pos_query.eq("user_id", user_id)
-
-        pos_result = pos_query.order("position", desc=True).limit(1).execute()
-
-        position = (pos_result.data[0]["position"] + 1) if pos_result.data else 1
-
         insert_data = {
             "title": title,
             "description": description,
             "due_date": due_date,
             "status": status,
-            "position": position,
+            "rank_key": KanbanService._top_of_done() if status == "DONE" else append_key(),
         }
 
         if KanbanService.USER_ISOLATION_ENABLED and user_id:
@@ -108,7 +133,7 @@ class KanbanService:
 
         result = supabase.table("kanban_items").insert(insert_data).execute()
 
-        return result.data[0] if result.data else None
+        return KanbanService._published(user_id, result.data)
 
     @staticmethod
     def get_item_by_id(item_id):
@@ -116,13 +141,13 @@ class KanbanService:
         supabase = get_supabase()
         user_id = get_current_user_id()
 
-        query = supabase.table("kanban_items").select("*").eq("id", item_id)
+        query = supabase.table("kanban_items").select(KanbanItem.COLUMNS).eq("id", item_id)
 
         if KanbanService.USER_ISOLATION_ENABLED and user_id:
             query = query.eq("user_id", user_id)
 
         result = query.execute()
-        return result.data[0] if result.data else None
+        return KanbanItem.first(result.data)
 
     @staticmethod
     def update_item(item_id, data):
@@ -149,12 +174,11 @@ class KanbanService:
             update_data["due_date"] = data["due_date"]
 
         if "status" in data:
-            if data["status"] not in ("TODO", "IN_PROGRESS", "DONE"):
+            if data["status"] not in STATUSES:
                 raise ValueError("Invalid status")
             update_data["status"] = data["status"]
-
-        if "position" in data:
-            update_data["position"] = data["position"]
+            if data["status"] == "DONE" and item.status != "DONE":
+                update_data["rank_key"] = KanbanService._top_of_done()
 
         if update_data:
             query = supabase.table("kanban_items").update(update_data).eq("id", item_id)
@@ -163,39 +187,27 @@ class KanbanService:
                 query = query.eq("user_id", user_id)
 
             result = query.execute()
-            return result.data[0] if result.data else None
+            return KanbanService._published(user_id, result.data)
 
         return KanbanService.get_item_by_id(item_id)
 
     @staticmethod
-    def update_status(item_id, new_status):
-        """Quick status update for moving items between columns"""
-        if new_status not in ("TODO", "IN_PROGRESS", "DONE"):
+    def update_status(item_id, new_status, prev_rank=None, next_rank=None):
+        """Move an item to a column, between two neighbours or at the bottom"""
+        if new_status not in STATUSES:
             raise ValueError("Invalid status")
 
         supabase = get_supabase()
         user_id = get_current_user_id()
 
-        # Get next position in target column
-        pos_query = (
-            supabase.table("kanban_items").select("position").eq("status", new_status)
-        )
-
-        if KanbanService.USER_ISOLATION_ENABLED and user_id:
-            pos_query = pos_query.eq("user_id", user_id)
-
-        pos_result = pos_query.order("position", desc=True).limit(1).execute()
-
-        position = (pos_result.data[0]["position"] + 1) if pos_result.data else 1
+        if new_status == "DONE" and prev_rank is None and next_rank is None:
+            rank_key = KanbanService._top_of_done()
+        else:
+            rank_key = key_between(prev_rank, next_rank)
 
         query = (
             supabase.table("kanban_items")
-            .update(
-                {
-                    "status": new_status,
-                    "position": position,
-                }
-            )
+            .update({"status": new_status, "rank_key": rank_key})
             .eq("id", item_id)
         )
 
@@ -204,7 +216,40 @@ class KanbanService:
 
         result = query.execute()
 
-        return result.data[0] if result.data else None
+        return KanbanService._published(user_id, result.data)
+
+    @staticmethod
+    def reorder_column(status, item_ids):
+        """Apply a whole column's order (top to bottom) in one statement"""
+        if status not in STATUSES:
+            raise ValueError("Invalid status")
+        if not isinstance(item_ids, list) or not all(
+            isinstance(i, int) and not isinstance(i, bool) for i in item_ids
+        ):
+            raise ValueError("item_ids must be a list of integers")
+        if len(set(item_ids)) != len(item_ids):
+            raise ValueError("item_ids contains duplicates")
+        if not item_ids:
+            return []
+
+        supabase = get_supabase()
+        user_id = get_current_user_id()
+
+        # A partial upsert can't be used here: the INSERT half would trip the
+        # NOT NULL columns before ON CONFLICT is considered. reorder_kanban_items
+        # is a single UPDATE ... FROM unnest(ids, ranks), still under RLS.
+        params = {
+            "p_status": status,
+            "p_ids": item_ids,
+            "p_ranks": column_keys(len(item_ids)),
+            "p_user_id": user_id if KanbanService.USER_ISOLATION_ENABLED else None,
+        }
+
+        result = supabase.rpc("reorder_kanban_items", params).execute()
+
+        items = sorted(KanbanItem.many(result.data or []), key=lambda item: item.rank_key)
+        publish(user_id, "kanban", "reordered", status=status, items=items)
+        return items
 
     @staticmethod
     def delete_item(item_id):
@@ -222,4 +267,13 @@ class KanbanService:
             query = query.eq("user_id", user_id)
 
         query.execute()
+        publish(user_id, "kanban", "deleted", item_id=item_id)
         return True
+
+    @staticmethod
+    def _published(user_id, rows):
+        """First written row (or None), announced to the user's other clients"""
+        item = KanbanItem.first(rows)
+        if item:
+            publish(user_id, "kanban", "saved", item=item)
+        return item
@@ -0,0 +1,144 @@
+"""
+Slotted row models for the Supabase tables
+
+Each model lists the columns the API actually uses (FIELDS); services select
+exactly those (`.select(Task.COLUMNS)`) instead of "*", so user_id and
+updated_at never leave PostgREST. Rows are read-only mappings, so code that
+indexes them like the old dicts keeps working, and the Flask JSON provider
+(RowJSONProvider) serializes them directly.
+"""
+
+from collections.abc import Mapping
+from flask.json.provider import DefaultJSONProvider
+
+
+class Row(Mapping):
+    """One table row: a fixed set of slots, read as attributes or row["column"]"""
+
+    __slots__ = ()
+    FIELDS = ()
+
+    @classmethod
+    def from_data(cls, data):
+        """Build a row from a PostgREST dict (columns outside FIELDS are dropped)"""
+        row = object.__new__(cls)
+        for name in cls.__slots__:
+            setattr(row, name, data.get(name))
+        return row
+
+    @classmethod
+    def many(cls, rows):
+        return [cls.from_data(data) for data in rows]
+
+    @classmethod
+    def first(cls, rows):
+        """The first row of a result, or None"""
+        return cls.from_data(rows[0]) if rows else None
+
+    def annotate(self, **fields):
+        """This row plus computed fields, without copying the columns"""
+        return Annotated(self, fields)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class Annotated(Mapping):
+    """A row with extra response fields (e.g. a task's days and health score)"""
+
+    __slots__ = ("row", "fields")
+
+    def __init__(self, row, fields):
+        self.row = row
+        self.fields = fields
+
+    def to_dict(self):
+        return {**self.row.to_dict(), **self.fields}
+
+    def __getitem__(self, key):
+        if key in self.fields:
+            return self.fields[key]
+        return self.row[key]
+
+    def __iter__(self):
+        yield from self.row
+        yield from (key for key in self.fields if key not in self.row)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class Task(Row):
+    FIELDS = (
+        "id",
+        "name",
+        "description",
+        "metric_type",
+        "metric_unit",
+        "target_value",
+        "frequency",
+        "custom_days",
+        "is_archived",
+        "created_at",
+    )
+    __slots__ = FIELDS
+    COLUMNS = ", ".join(FIELDS)
+
+
+class ProgressLog(Row):
+    FIELDS = ("id", "task_id", "log_date", "metric_value", "is_completed", "notes")
+    __slots__ = FIELDS
+    COLUMNS = ", ".join(FIELDS)
+
+
+class KanbanItem(Row):
+    FIELDS = ("id", "title", "description", "due_date", "status", "rank_key")
+    __slots__ = FIELDS
+    COLUMNS = ", ".join(FIELDS)
+
+
+class FocusSession(Row):
+    FIELDS = (
+        "id",
+        "kanban_item_id",
+        "duration_minutes",
+        "started_at",
+        "local_day",
+        "ended_at",
+        "is_completed",
+        "notes",
+    )
+    # task_title is joined from kanban_items, not a focus_sessions column
+    __slots__ = FIELDS + ("task_title",)
+    COLUMNS = ", ".join(FIELDS)
+
+
+def json_default(value):
+    """json.dumps default= for payloads that contain rows"""
+    if isinstance(value, (Row, Annotated)):
+        return value.to_dict()
+    return str(value)
+
+
+class RowJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider, plus row models"""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, (Row, Annotated)):
+            return o.to_dict()
+        return DefaultJSONProvider.default(o)
@@ -0,0 +1,78 @@
+"""
+Keyset pagination for list queries
+
+A page is the rows after the last one the client has, in (column, id)
+order: the cursor carries that row's column value and id, and the next page
+is a filter on them rather than an OFFSET. Every page costs the same index
+range scan however deep the client has scrolled, and rows inserted or
+deleted meanwhile don't shift later pages.
+
+List routes take ?limit=&cursor= and answer with the page plus next_cursor
+(None on the last page). The ordering column must be NOT NULL.
+"""
+
+import base64
+import json
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+def parse_limit(value, default=DEFAULT_LIMIT):
+    """A limit from the query string (None for the default), as an int"""
+    if value is None or value == "":
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+    return limit
+
+
+def encode_cursor(value, row_id):
+    """Opaque cursor for the row (value, row_id)"""
+    raw = json.dumps([value, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """(value, row_id) of a cursor from encode_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, row_id = json.loads(raw)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(value, (str, int, float)) or isinstance(row_id, bool) or not isinstance(row_id, int):
+        raise ValueError("Invalid cursor")
+    return value, row_id
+
+
+def _quote(value):
+    """A filter value PostgREST reads literally inside or=(...), e.g. timestamps with ':'"""
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
+
+
+def paginate(query, column, limit, cursor=None, desc=False):
+    """Run query for the page after cursor; returns (rows, next_cursor).
+
+    query is a PostgREST select builder with its filters applied but no
+    ordering; it is ordered by (column, id), both ascending or both
+    descending, so one (user_id, ..., column) index serves every page.
+    """
+    if cursor:
+        value, row_id = decode_cursor(cursor)
+        op = "lt" if desc else "gt"
+        query = query.or_(
+            f"{column}.{op}.{_quote(value)},"
+            f"and({column}.eq.{_quote(value)},id.{op}.{row_id})"
+        )
+
+    # One extra row tells whether another page follows
+    rows = query.order(column, desc=desc).order("id", desc=desc).limit(limit + 1).execute().data
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1][column], rows[-1]["id"])
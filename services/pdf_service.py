@@ -64,12 +64,16 @@ class PDFService:
         )
         story.append(Spacer(1, 12))
 
-        # User Context
+        # User Context: the weeks the summary actually covers, which can be fewer
+        # than requested (get_summary caps the range and the bucket count)
+        covered_weeks = (
+            date.fromisoformat(summary["period_end"]) - date.fromisoformat(summary["period_start"])
+        ).days // 7 + 1
         story.append(Paragraph("User Context", heading_style))
         story.append(
             Paragraph(
                 f"I am tracking <b>{summary['total_tasks']}</b> habits/tasks using a weekly habit tracker. "
-                f"This report covers <b>{weeks}</b> week(s) of data.",
+                f"This report covers <b>{covered_weeks}</b> week(s) of data, summarized by {summary['resolution']}.",
                 body_style,
             )
         )
@@ -78,11 +82,12 @@ class PDFService:
         # Current Habit Overview Table
         story.append(Paragraph("Current Habit Overview", heading_style))
 
-        table_data = [["Habit", "Metric", "Target", "This Week", "Avg Value", "Health"]]
+        resolution = summary["resolution"]
+        table_data = [["Habit", "Metric", "Target", f"This {resolution.title()}", "Avg Value", "Health"]]
 
         for task in summary["tasks"]:
             this_week_completed = (
-                task["weekly_data"][0]["completed_days"] if task["weekly_data"] else 0
+                task["buckets"][0]["completed_days"] if task["buckets"] else 0
             )
             avg_value = task["average_value"]
             avg_str = f"{avg_value:.1f}" if avg_value else "N/A"
@@ -143,6 +148,64 @@ class PDFService:
 
         story.append(Spacer(1, 16))
 
+        # Health Trend: each habit's health score at the end of every week (at most 8 columns)
+        trend_weeks = max(0, min(weeks, 8))
+        history = ProgressService.get_health_history(trend_weeks * 7) if trend_weeks else None
+        if history and history["tasks"]:
+            story.append(Paragraph("Health Trend", heading_style))
+
+            # Week-end indexes into the daily series, oldest first
+            week_ends = list(range(6, trend_weeks * 7, 7))
+            history_start = date.fromisoformat(history["start"])
+            trend_data = [
+                ["Habit"]
+                + [(history_start + timedelta(days=i)).strftime("%b %d") for i in week_ends]
+                + ["Change"]
+            ]
+
+            for task in history["tasks"]:
+                scores = [task["scores"][i] for i in week_ends]
+                change = (scores[-1] - scores[0]) * 100
+                trend_data.append(
+                    [task["name"][:25]]
+                    + [f"{score * 100:.0f}%" for score in scores]
+                    + [f"{change:+.0f} pts"]
+                )
+
+            trend_table = Table(
+                trend_data,
+                colWidths=[1.5 * inch] + [4.2 * inch / (len(week_ends) + 1)] * (len(week_ends) + 1),
+            )
+            trend_table.setStyle(
+                TableStyle(
+                    [
+                        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#4f46e5")),
+                        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+                        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                        ("FONTSIZE", (0, 0), (-1, 0), 9),
+                        ("FONTSIZE", (0, 1), (-1, -1), 8),
+                        ("BOTTOMPADDING", (0, 0), (-1, 0), 8),
+                        (
+                            "ROWBACKGROUNDS",
+                            (0, 1),
+                            (-1, -1),
+                            [colors.white, colors.HexColor("#f3f4f6")],
+                        ),
+                        ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#e5e7eb")),
+                    ]
+                )
+            )
+            story.append(trend_table)
+            story.append(
+                Paragraph(
+                    f"Health = {history['window']}-day completion rate of scheduled days, "
+                    "adjusted by the trend between its two halves.",
+                    body_style,
+                )
+            )
+            story.append(Spacer(1, 16))
+
         # Performance Summary
         story.append(Paragraph("Performance Summary", heading_style))
 
@@ -2,79 +2,125 @@
 Progress tracking and statistics service - Supabase version
 """
 
+import base64
 from datetime import date, timedelta
+from functools import partial
+import numpy as np
+from database import postgres_db
 from database.supabase_db import get_supabase
-from services.task_service import TaskService
+from services.concurrency import gather
+from services.events import publish
+from services.models import ProgressLog
+from services.stats_engine import (
+    HEALTH_DAYS,
+    STREAK_DAYS,
+    StatsEngine,
+    completion_bitsets,
+    schedule_matrix,
+    window_start,
+)
+from services.task_service import TaskService, get_current_user_id
+
+# load_stats_logs on the direct Postgres backend: every row in one query, no row cap
+STATS_LOGS_SQL = """
+SELECT id, task_id, log_date, is_completed, metric_value FROM progress_logs
+WHERE user_id = %(user_id)s AND task_id = ANY(%(task_ids)s)
+"""
+
+# get_summary's rollups on the direct Postgres backend
+SUMMARY_ROLLUPS_SQL = """
+SELECT * FROM summarize_weekly_rollups(%(since)s::date, %(until)s::date, %(resolution)s, %(user_id)s)
+"""
 
 
 class ProgressService:
+    # PostgREST returns at most this many rows per request
+    LOG_PAGE_SIZE = 1000
+    # Summaries switch from weekly to monthly, then quarterly buckets past these ranges
+    MAX_WEEKLY_SUMMARY_WEEKS = 12
+    MAX_MONTHLY_SUMMARY_WEEKS = 53
+    MAX_SUMMARY_BUCKETS = 12
+    MAX_SUMMARY_WEEKS = 13 * 12
+
     @staticmethod
     def get_week_progress(date_str=None):
         """Get all progress data for a specific week"""
-        week_start = TaskService.get_week_start(date_str)
-        week_end = TaskService.get_week_end(date_str)
+        return ProgressService.get_weeks_progress(date_str, 1)[0]
+
+    @staticmethod
+    def get_weeks_progress(date_str=None, count=1):
+        """Progress data for `count` consecutive weeks, starting with the week of date_str.
+
+        One logs query covers the whole range, and the health scores (which
+        depend on today, not on the week shown) are computed once for all weeks.
+        """
+        first_start = TaskService.get_week_start(date_str)
+        last_start = first_start + timedelta(weeks=count - 1)
 
         supabase = get_supabase()
-        tasks = TaskService.get_all_tasks()
+        user_id = get_current_user_id()
 
-        # Get all progress logs for the week
-        result = (
-            supabase.table("progress_logs")
-            .select("*")
-            .eq("week_start_date", week_start.isoformat())
-            .execute()
+        def logs_query():
+            query = (
+                supabase.table("progress_logs")
+                .select(ProgressLog.COLUMNS)
+                .gte("week_start_date", first_start.isoformat())
+                .lte("week_start_date", last_start.isoformat())
+            )
+
+            # Filter explicitly so the (user_id, week_start_date) index is used
+            # instead of leaning on RLS to discard other users' rows
+            if TaskService.USER_ISOLATION_ENABLED and user_id:
+                query = query.eq("user_id", user_id)
+            return query
+
+        tasks, log_rows = gather(
+            TaskService.get_all_tasks, partial(ProgressService._load_by_id, logs_query)
         )
-        logs = result.data
-
-        logs_by_task = {}
-        for log in logs:
-            task_id = log["task_id"]
-            if task_id not in logs_by_task:
-                logs_by_task[task_id] = {}
-            log_date = log["log_date"]
-            logs_by_task[task_id][log_date] = log
-
-        # Build week data structure
-        week_data = {
-            "week_start": week_start.isoformat(),
-            "week_end": week_end.isoformat(),
-            "tasks": [],
-        }
+        logs = {(log.task_id, log.log_date): log for log in ProgressLog.many(log_rows)}
 
-        for task in tasks:
-            task_data = {
-                **task,
-                "days": [],
-                "health_score": ProgressService.calculate_health_score(task["id"]),
+        health_scores = ProgressService.calculate_health_scores(tasks)
+        scheduled = [[TaskService.is_scheduled_for_day(task, i) for i in range(7)] for task in tasks]
+        today = date.today()
+
+        weeks = []
+        for w in range(count):
+            week_start = first_start + timedelta(weeks=w)
+            week_data = {
+                "week_start": week_start.isoformat(),
+                "week_end": (week_start + timedelta(days=6)).isoformat(),
+                "tasks": [],
             }
 
-            for i in range(7):
-                day_date = week_start + timedelta(days=i)
-                day_str = day_date.isoformat()
-                is_scheduled = TaskService.is_scheduled_for_day(task, i)
-
-                day_data = {
-                    "date": day_str,
-                    "day_name": day_date.strftime("%a"),
-                    "is_scheduled": is_scheduled,
-                    "is_today": day_date == date.today(),
-                    "is_past": day_date < date.today(),
-                    "log": None,
-                }
+            for task, health_score, task_scheduled in zip(tasks, health_scores, scheduled):
+                task_data = task.annotate(days=[], health_score=health_score)
+
+                for i in range(7):
+                    day_date = week_start + timedelta(days=i)
+                    day_str = day_date.isoformat()
 
-                if task["id"] in logs_by_task and day_str in logs_by_task[task["id"]]:
-                    day_data["log"] = logs_by_task[task["id"]][day_str]
+                    task_data["days"].append(
+                        {
+                            "date": day_str,
+                            "day_name": day_date.strftime("%a"),
+                            "is_scheduled": task_scheduled[i],
+                            "is_today": day_date == today,
+                            "is_past": day_date < today,
+                            "log": logs.get((task["id"], day_str)),
+                        }
+                    )
 
-                task_data["days"].append(day_data)
+                week_data["tasks"].append(task_data)
 
-            week_data["tasks"].append(task_data)
+            weeks.append(week_data)
 
-        return week_data
+        return weeks
 
     @staticmethod
     def log_progress(data):
         """Create or update a progress log entry"""
         supabase = get_supabase()
+        user_id = get_current_user_id()
         log_date = date.fromisoformat(data["date"])
         week_start = TaskService.get_week_start(log_date)
 
@@ -99,35 +145,44 @@ class ProgressService:
             ).eq("id", log_id).execute()
         else:
             # Create new entry
-            result = (
-                supabase.table("progress_logs")
-                .insert(
-                    {
-                        "task_id": data["task_id"],
-                        "log_date": data["date"],
-                        "week_start_date": week_start.isoformat(),
-                        "metric_value": data.get("value"),
-                        "notes": data.get("notes"),
-                        "is_completed": True,
-                    }
-                )
-                .execute()
-            )
+            insert_data = {
+                "task_id": data["task_id"],
+                "log_date": data["date"],
+                "week_start_date": week_start.isoformat(),
+                "metric_value": data.get("value"),
+                "notes": data.get("notes"),
+                "is_completed": True,
+            }
+
+            if TaskService.USER_ISOLATION_ENABLED and user_id:
+                insert_data["user_id"] = user_id
+
+            result = supabase.table("progress_logs").insert(insert_data).execute()
             log_id = result.data[0]["id"] if result.data else None
 
-        return ProgressService.get_log_by_id(log_id)
+        log = ProgressService.get_log_by_id(log_id)
+        publish(user_id, "progress", "saved", log=log)
+        return log
 
     @staticmethod
     def get_log_by_id(log_id):
         """Get a progress log by ID"""
         supabase = get_supabase()
-        result = supabase.table("progress_logs").select("*").eq("id", log_id).execute()
-        return result.data[0] if result.data else None
+        user_id = get_current_user_id()
+
+        query = supabase.table("progress_logs").select(ProgressLog.COLUMNS).eq("id", log_id)
+
+        if TaskService.USER_ISOLATION_ENABLED and user_id:
+            query = query.eq("user_id", user_id)
+
+        result = query.execute()
+        return ProgressLog.first(result.data)
 
     @staticmethod
     def update_progress(log_id, data):
         """Update a progress log entry"""
         supabase = get_supabase()
+        user_id = get_current_user_id()
 
         update_data = {}
         if "value" in data:
@@ -138,215 +193,342 @@ class ProgressService:
             update_data["is_completed"] = data["is_completed"]
 
         if update_data:
-            supabase.table("progress_logs").update(update_data).eq(
-                "id", log_id
-            ).execute()
+            query = supabase.table("progress_logs").update(update_data).eq("id", log_id)
+
+            if TaskService.USER_ISOLATION_ENABLED and user_id:
+                query = query.eq("user_id", user_id)
 
-        return ProgressService.get_log_by_id(log_id)
+            query.execute()
+
+        log = ProgressService.get_log_by_id(log_id)
+        publish(user_id, "progress", "saved", log=log)
+        return log
 
     @staticmethod
     def delete_progress(log_id):
         """Delete a progress log entry"""
         supabase = get_supabase()
-        supabase.table("progress_logs").delete().eq("id", log_id).execute()
+        user_id = get_current_user_id()
+
+        query = supabase.table("progress_logs").delete().eq("id", log_id)
+
+        if TaskService.USER_ISOLATION_ENABLED and user_id:
+            query = query.eq("user_id", user_id)
+
+        # The deleted row tells other clients which grid cell to clear
+        result = query.execute()
+        for log in ProgressLog.many(result.data):
+            publish(user_id, "progress", "deleted", log=log)
         return True
 
     @staticmethod
-    def calculate_health_score(task_id):
-        """
-        Calculate health score based on 14-day completion rate and trend.
-        Returns: float between 0.0 (poor) and 1.0 (excellent)
-        """
+    def load_stats_logs(task_ids, since=None, until=None, completed_only=False):
+        """Load the log columns StatsEngine needs for many tasks, paging past the row cap"""
+        if not task_ids:
+            return []
+
+        user_id = get_current_user_id()
+
+        if postgres_db.is_enabled() and user_id:
+            return ProgressService._load_stats_logs_sql(user_id, task_ids, since, until, completed_only)
+
         supabase = get_supabase()
-        task = TaskService.get_task_by_id(task_id)
-        if not task:
-            return 0.5
 
-        today = date.today()
-        fourteen_days_ago = today - timedelta(days=14)
+        def logs_query():
+            query = (
+                supabase.table("progress_logs")
+                .select("id, task_id, log_date, is_completed, metric_value")
+                .in_("task_id", list(task_ids))
+            )
+            if since is not None:
+                # week_start_date lets the (user_id, week_start_date) index narrow the scan
+                query = query.gte("week_start_date", TaskService.get_week_start(since).isoformat())
+                query = query.gte("log_date", since.isoformat())
+            if until is not None:
+                query = query.lte("log_date", until.isoformat())
+            if completed_only:
+                query = query.eq("is_completed", True)
+            if TaskService.USER_ISOLATION_ENABLED and user_id:
+                query = query.eq("user_id", user_id)
+            return query
+
+        return ProgressService._load_by_id(logs_query)
 
-        # Get all logs for last 14 days
-        result = (
-            supabase.table("progress_logs")
-            .select("log_date, is_completed")
-            .eq("task_id", task_id)
-            .gte("log_date", fourteen_days_ago.isoformat())
-            .eq("is_completed", True)
-            .execute()
-        )
+    @staticmethod
+    def _load_stats_logs_sql(user_id, task_ids, since, until, completed_only):
+        """load_stats_logs as one SQL query (the same filters, so the same indexes)"""
+        query = STATS_LOGS_SQL
+        params = {"task_ids": list(task_ids)}
+        if since is not None:
+            query += "AND week_start_date >= %(since_week)s AND log_date >= %(since)s\n"
+            params.update(since_week=TaskService.get_week_start(since), since=since)
+        if until is not None:
+            query += "AND log_date <= %(until)s\n"
+            params["until"] = until
+        if completed_only:
+            query += "AND is_completed = true\n"
+        return postgres_db.fetch_all(query + "ORDER BY id", user_id, **params)
 
-        completed_dates = {log["log_date"] for log in result.data}
-
-        # Calculate scheduled vs completed
-        scheduled_count = 0
-        completed_count = 0
-        recent_scheduled = 0
-        recent_completed = 0
-        older_scheduled = 0
-        older_completed = 0
-
-        for i in range(14):
-            check_date = today - timedelta(days=i)
-            day_of_week = (check_date.weekday() + 1) % 7
-
-            if TaskService.is_scheduled_for_day(task, day_of_week):
-                scheduled_count += 1
-                is_recent = i < 7
-
-                if is_recent:
-                    recent_scheduled += 1
-                else:
-                    older_scheduled += 1
-
-                if check_date.isoformat() in completed_dates:
-                    completed_count += 1
-                    if is_recent:
-                        recent_completed += 1
-                    else:
-                        older_completed += 1
-
-        if scheduled_count == 0:
-            return 0.5
+    @staticmethod
+    def _load_by_id(build_query):
+        """Every row of a query, paging past the row cap.
+
+        build_query returns a fresh filtered builder per page (builders are
+        mutable). Keyset pages over id, so each page is an index range
+        rather than an OFFSET.
+        """
 
-        completion_rate = completed_count / scheduled_count
-        recent_rate = recent_completed / recent_scheduled if recent_scheduled > 0 else 0
-        older_rate = older_completed / older_scheduled if older_scheduled > 0 else 0
-        trend_bonus = (recent_rate - older_rate) * 0.2
+        def page_after(last_id):
+            query = build_query()
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            return query.order("id").limit(ProgressService.LOG_PAGE_SIZE).execute().data
 
-        return max(0.0, min(1.0, completion_rate + trend_bonus))
+        rows = page_after(None)
+        page = rows
+        while len(page) == ProgressService.LOG_PAGE_SIZE:
+            page = page_after(rows[-1]["id"])
+            rows.extend(page)
+        return rows
 
     @staticmethod
-    def get_task_stats(task_id):
-        """Get comprehensive statistics for a task"""
-        supabase = get_supabase()
-        task = TaskService.get_task_by_id(task_id)
-        if not task:
-            return None
+    def get_stats_for_tasks(tasks):
+        """get_task_stats for many tasks from a single scan of their logs"""
+        logs = ProgressService.load_stats_logs([task["id"] for task in tasks])
+        return StatsEngine(tasks, logs).task_stats()
 
-        health_score = ProgressService.calculate_health_score(task_id)
+    @staticmethod
+    def calculate_health_scores(tasks):
+        """Health scores for many tasks from one query over the last 14 days"""
+        since = date.today() - timedelta(days=HEALTH_DAYS)
+        logs = ProgressService.load_stats_logs([task["id"] for task in tasks], since)
+        return [float(score) for score in StatsEngine(tasks, logs).health_scores()]
 
-        # Get total completions
-        total_result = (
-            supabase.table("progress_logs")
-            .select("id", count="exact")
-            .eq("task_id", task_id)
-            .eq("is_completed", True)
-            .execute()
-        )
-        total_count = total_result.count or 0
+    @staticmethod
+    def get_health_history(days=90, window=HEALTH_DAYS):
+        """Daily health score of every task over the last `days` days, oldest first"""
+        today = date.today()
+        tasks = TaskService.get_all_tasks()
+        first_day = window_start(today, days, window)
 
-        # Get all values for average
-        values_result = (
-            supabase.table("progress_logs")
-            .select("metric_value")
-            .eq("task_id", task_id)
-            .not_.is_("metric_value", "null")
-            .execute()
+        logs = ProgressService.load_stats_logs([task["id"] for task in tasks], since=first_day)
+        scores = StatsEngine(tasks, logs, today, first_day).health_history(days, window)
+
+        return {
+            "start": (today - timedelta(days=days - 1)).isoformat(),
+            "end": today.isoformat(),
+            "window": window,
+            "tasks": [
+                {"id": task["id"], "name": task["name"], "scores": [round(float(s), 3) for s in scores[i]]}
+                for i, task in enumerate(tasks)
+            ],
+        }
+
+    @staticmethod
+    def get_heatmap(year):
+        """Per-day completion ratio of scheduled habits over one calendar year.
+
+        Returns compact arrays indexed by day of year: "ratios" (None where
+        nothing was scheduled) and each task's completed days as a base64
+        bitset (bit d set = completed on start + d).
+        """
+        today = date.today()
+        start = date(year, 1, 1)
+        num_days = (date(year + 1, 1, 1) - start).days
+
+        tasks = TaskService.get_all_tasks()
+        logs = ProgressService.load_stats_logs(
+            [task["id"] for task in tasks],
+            since=start,
+            until=date(year, 12, 31),
+            completed_only=True,
         )
 
-        values = [
-            v["metric_value"]
-            for v in values_result.data
-            if v["metric_value"] is not None
-        ]
-        avg_value = sum(values) / len(values) if values else None
+        completed = completion_bitsets(tasks, logs, start, num_days)
+
+        # A task counts from the day it was created until today
+        scheduled = schedule_matrix(tasks, start, num_days)
+        day_index = np.arange(num_days)
+        for i, task in enumerate(tasks):
+            if task.get("created_at"):
+                created = date.fromisoformat(task["created_at"][:10])
+                scheduled[i, day_index < (created - start).days] = False
+        scheduled[:, day_index > (today - start).days] = False
+        scheduled = np.packbits(scheduled, axis=1, bitorder="little")
 
-        streak = ProgressService.calculate_streak(task_id)
+        # Count set bits per day across tasks; the AND runs on 8 days per byte
+        def per_day(bits):
+            return np.unpackbits(bits, axis=1, count=num_days, bitorder="little").sum(axis=0)
+
+        done_counts = per_day(completed & scheduled)
+        scheduled_counts = per_day(scheduled)
 
         return {
-            "task_id": task_id,
-            "health_score": health_score,
-            "total_completions": total_count,
-            "average_value": avg_value,
-            "current_streak": streak,
+            "year": year,
+            "start": start.isoformat(),
+            "ratios": [
+                round(int(done) / int(total), 2) if total else None
+                for done, total in zip(done_counts, scheduled_counts)
+            ],
+            "tasks": [
+                {"id": task["id"], "completed": base64.b64encode(completed[i].tobytes()).decode("ascii")}
+                for i, task in enumerate(tasks)
+            ],
         }
 
     @staticmethod
-    def calculate_streak(task_id):
-        """Calculate current consecutive completion streak"""
-        supabase = get_supabase()
+    def calculate_health_score(task_id):
+        """
+        Calculate health score based on 14-day completion rate and trend.
+        Returns: float between 0.0 (poor) and 1.0 (excellent)
+        """
         task = TaskService.get_task_by_id(task_id)
         if not task:
-            return 0
+            return 0.5
 
-        # Get all completed logs ordered by date desc
-        result = (
-            supabase.table("progress_logs")
-            .select("log_date")
-            .eq("task_id", task_id)
-            .eq("is_completed", True)
-            .order("log_date", desc=True)
-            .execute()
-        )
+        return ProgressService.calculate_health_scores([task])[0]
 
-        completed_dates = {log["log_date"] for log in result.data}
+    @staticmethod
+    def get_task_stats(task_id):
+        """Get comprehensive statistics for a task"""
+        task = TaskService.get_task_by_id(task_id)
+        if not task:
+            return None
 
-        streak = 0
-        check_date = date.today()
+        return ProgressService.get_stats_for_tasks([task])[task["id"]]
 
-        for _ in range(365):
-            day_of_week = (check_date.weekday() + 1) % 7
+    @staticmethod
+    def calculate_streak(task_id):
+        """Calculate current consecutive completion streak"""
+        task = TaskService.get_task_by_id(task_id)
+        if not task:
+            return 0
 
-            if TaskService.is_scheduled_for_day(task, day_of_week):
-                if check_date.isoformat() in completed_dates:
-                    streak += 1
-                else:
-                    if check_date == date.today():
-                        check_date -= timedelta(days=1)
-                        continue
-                    break
+        since = date.today() - timedelta(days=STREAK_DAYS)
+        logs = ProgressService.load_stats_logs([task["id"]], since)
+        return int(StatsEngine([task], logs).streaks()[0])
 
-            check_date -= timedelta(days=1)
+    @staticmethod
+    def summary_resolution(weeks):
+        """Bucket size for a summary of `weeks` weeks: week, month or quarter"""
+        if weeks <= ProgressService.MAX_WEEKLY_SUMMARY_WEEKS:
+            return "week"
+        if weeks <= ProgressService.MAX_MONTHLY_SUMMARY_WEEKS:
+            return "month"
+        return "quarter"
 
-        return streak
+    @staticmethod
+    def bucket_start(week_start, resolution):
+        """The bucket a week belongs to, by the day it starts on (as date_trunc does in SQL)"""
+        if resolution == "month":
+            return week_start.replace(day=1)
+        if resolution == "quarter":
+            return date(week_start.year, (week_start.month - 1) // 3 * 3 + 1, 1)
+        return week_start
 
     @staticmethod
     def get_summary(weeks=4):
-        """Get summary data for the specified number of weeks"""
+        """Get summary data for the specified number of weeks, bucketed by week, month or quarter"""
+        if weeks < 1:
+            raise ValueError("weeks must be at least 1")
+
         supabase = get_supabase()
+        user_id = get_current_user_id()
         tasks = TaskService.get_all_tasks()
         today = date.today()
-        start_date = TaskService.get_week_start(today - timedelta(weeks=weeks * 7))
+        resolution = ProgressService.summary_resolution(weeks)
+
+        # Newest first; the oldest buckets are dropped beyond MAX_SUMMARY_BUCKETS
+        weeks_by_bucket = {}
+        for w in range(min(weeks, ProgressService.MAX_SUMMARY_WEEKS)):
+            week_start = TaskService.get_week_start(today - timedelta(weeks=w))
+            bucket = ProgressService.bucket_start(week_start, resolution)
+            if bucket not in weeks_by_bucket:
+                if len(weeks_by_bucket) == ProgressService.MAX_SUMMARY_BUCKETS:
+                    break
+                weeks_by_bucket[bucket] = []
+            weeks_by_bucket[bucket].append(week_start)
+
+        oldest_week = min(min(week_starts) for week_starts in weeks_by_bucket.values())
 
         summary = {
-            "period_start": start_date.isoformat(),
+            "period_start": oldest_week.isoformat(),
             "period_end": today.isoformat(),
+            "resolution": resolution,
             "total_tasks": len(tasks),
             "tasks": [],
         }
 
+        if not tasks:
+            return summary
+
+        # Rollups (one row per task-week, kept current by the progress_logs trigger,
+        # see migration_weekly_rollups.sql) summed per bucket by the database
+        since = oldest_week.isoformat()
+        until = TaskService.get_week_start(today).isoformat()
+        if postgres_db.is_enabled() and user_id:
+            load_rollups = partial(
+                postgres_db.fetch_all, SUMMARY_ROLLUPS_SQL, user_id,
+                since=since, until=until, resolution=resolution,
+            )
+        else:
+            rollup_query = supabase.rpc(
+                "summarize_weekly_rollups",
+                {
+                    "p_since": since,
+                    "p_until": until,
+                    "p_resolution": resolution,
+                    "p_user_id": user_id if TaskService.USER_ISOLATION_ENABLED else None,
+                },
+            )
+
+            def load_rollups():
+                return rollup_query.execute().data
+
+        rollup_rows, task_stats = gather(
+            load_rollups,
+            partial(ProgressService.get_stats_for_tasks, tasks),
+        )
+
+        rollups = {
+            (row["task_id"], row["bucket_start"]): row for row in rollup_rows
+        }
+
         for task in tasks:
-            stats = ProgressService.get_task_stats(task["id"])
-
-            weekly_data = []
-            for w in range(weeks):
-                week_start = TaskService.get_week_start(today - timedelta(weeks=w * 7))
-
-                result = (
-                    supabase.table("progress_logs")
-                    .select("metric_value, is_completed")
-                    .eq("task_id", task["id"])
-                    .eq("week_start_date", week_start.isoformat())
-                    .execute()
+            stats = task_stats[task["id"]]
+            buckets = [
+                ProgressService._bucket_from_rollup(
+                    task, bucket, week_starts, rollups.get((task["id"], bucket.isoformat()))
                 )
-                logs = result.data
-
-                completed = sum(1 for log in logs if log["is_completed"])
-                values = [
-                    log["metric_value"]
-                    for log in logs
-                    if log["metric_value"] is not None
-                ]
-
-                weekly_data.append(
-                    {
-                        "week_start": week_start.isoformat(),
-                        "completed_days": completed,
-                        "values": values,
-                        "avg_value": sum(values) / len(values) if values else None,
-                    }
-                )
-
-            summary["tasks"].append({**task, **stats, "weekly_data": weekly_data})
+                for bucket, week_starts in weeks_by_bucket.items()
+            ]
+            summary["tasks"].append(task.annotate(**stats, buckets=buckets))
 
         return summary
+
+    @staticmethod
+    def _bucket_from_rollup(task, bucket, week_starts, rollup):
+        """One summary bucket; weeks without logs have no rollup row"""
+        weekly_scheduled = len(TaskService.get_scheduled_days_for_week(task, bucket))
+        if rollup is None:
+            return {
+                "start": bucket.isoformat(),
+                "weeks": len(week_starts),
+                "completed_days": 0,
+                "scheduled_days": weekly_scheduled * len(week_starts),
+                "avg_value": None,
+                "min_value": None,
+                "max_value": None,
+            }
+
+        value_count = rollup["value_count"]
+        missing_weeks = max(len(week_starts) - rollup["week_count"], 0)
+        return {
+            "start": bucket.isoformat(),
+            "weeks": len(week_starts),
+            "completed_days": rollup["completed_count"],
+            "scheduled_days": rollup["scheduled_count"] + weekly_scheduled * missing_weeks,
+            "avg_value": rollup["value_sum"] / value_count if value_count else None,
+            "min_value": rollup["value_min"],
+            "max_value": rollup["value_max"],
+        }
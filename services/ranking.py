@@ -0,0 +1,120 @@
+"""
+Lexicographic rank keys for ordering Kanban cards within a column
+
+Keys are base-62 strings compared byte-wise (the column uses COLLATE "C").
+A key can always be generated between any two others, so placing a card
+is a single write: nothing else in the column has to be renumbered.
+
+- append_key(): after every key handed out so far. It is derived from the
+  clock, so appending to a column needs no "max position" read.
+- prepend_key(): before every key handed out so far: "0" and the clock
+  counted down. Cards put on top one after another (every card finished
+  goes to the top of DONE) get fixed-length keys instead of ever longer
+  ones squeezed in above the previous top.
+- key_between(prev, next): between the ranks of two neighbouring cards
+  (prev=None drops at the top, next=None at the bottom).
+- column_keys(n): n fresh ascending keys for reordering a whole column.
+"""
+
+import time
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+# 62^9 microseconds lasts until the 2390s
+_CLOCK_WIDTH = 9
+# Keys may not end in the smallest digit, or nothing could sort below them
+_SUFFIX = "V"
+
+_last_clock = 0
+
+
+def _encode(value, width):
+    chars = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        chars.append(DIGITS[digit])
+    return "".join(reversed(chars))
+
+
+def _clock():
+    """The current microsecond, strictly increasing per process"""
+    global _last_clock
+    now = max(time.time_ns() // 1000, _last_clock + 1)
+    _last_clock = now
+    return now
+
+
+def _clock_prefix():
+    """Fixed-width key for the current microsecond"""
+    return _encode(_clock(), _CLOCK_WIDTH)
+
+
+def validate_key(key):
+    """Raise ValueError unless key is a well-formed rank key"""
+    if not isinstance(key, str) or not key:
+        raise ValueError("Rank must be a non-empty string")
+    if any(c not in DIGITS for c in key):
+        raise ValueError("Rank contains invalid characters")
+    if key[-1] == DIGITS[0]:
+        raise ValueError("Rank cannot end with '0'")
+    return key
+
+
+def _midpoint(a, b):
+    """Key strictly between a and b ("" = start, None = end); neither ends in '0'"""
+    if b is not None:
+        # Copy the shared prefix, then split the remainder
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else DIGITS[0]) == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else BASE
+
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    if b is not None and len(b) > 1:
+        return b[:1]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def append_key():
+    """Key that sorts after every key generated before it"""
+    return _clock_prefix() + _SUFFIX
+
+
+def prepend_key():
+    """Key that sorts before every key generated before it (and every append key)"""
+    return DIGITS[0] + _encode(BASE**_CLOCK_WIDTH - 1 - _clock(), _CLOCK_WIDTH) + _SUFFIX
+
+
+def key_between(prev_key=None, next_key=None):
+    """Key for a card dropped between two neighbours (either may be None)"""
+    if prev_key is not None:
+        validate_key(prev_key)
+    if next_key is None:
+        # Dropping at the bottom: a clock key keeps later appends below this card
+        key = append_key()
+        return key if prev_key is None or key > prev_key else _midpoint(prev_key, None)
+    validate_key(next_key)
+    if prev_key is None:
+        # Dropping at the top: a countdown key keeps later prepends above this card.
+        # Below an older key scheme (or a skewed clock's key), go just under the
+        # top card: only its last digit changes, rather than halving from ""
+        key = prepend_key()
+        return key if key < next_key else _midpoint(next_key[:-1], next_key)
+    if prev_key >= next_key:
+        raise ValueError("Previous rank must sort before next rank")
+    return _midpoint(prev_key, next_key)
+
+
+def column_keys(count):
+    """Ascending keys for a whole column, all after any key generated before"""
+    prefix = _clock_prefix()
+    width = 1
+    while BASE**width <= count:
+        width += 1
+    return [prefix + _encode(i, width) + _SUFFIX for i in range(count)]
@@ -0,0 +1,58 @@
+"""
+Full-text search over Kanban cards, habits, progress notes and focus notes
+"""
+
+from flask import session
+from database.supabase_db import get_supabase
+
+
+def get_current_user_id():
+    """Get the current user's ID from session"""
+    return session.get("user_id")
+
+
+class SearchService:
+    # Set to True after running migration_add_user_id.sql
+    USER_ISOLATION_ENABLED = True
+
+    PAGE_SIZE = 20
+    MAX_PAGE_SIZE = 50
+    MAX_QUERY_LENGTH = 200
+
+    @staticmethod
+    def search(query, limit=None, offset=0):
+        """One page of matches, best first, and the offset of the next page (or None).
+
+        Each result has a kind ("kanban", "task", "progress" or "focus"), the
+        row id, a title (card or habit), the matched body text, its day and
+        the linked task_id / kanban_item_id where there is one.
+
+        search_user_content ranks every match of the user before cutting the
+        page, so pages are offsets into that order rather than keyset cursors.
+        The GIN indexes keep finding the matches cheap.
+        """
+        query = (query or "").strip()
+        if not query:
+            raise ValueError("Search query is required")
+        if len(query) > SearchService.MAX_QUERY_LENGTH:
+            raise ValueError(f"Search query is limited to {SearchService.MAX_QUERY_LENGTH} characters")
+        limit = SearchService.PAGE_SIZE if limit is None else limit
+        if not 1 <= limit <= SearchService.MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {SearchService.MAX_PAGE_SIZE}")
+        if offset < 0:
+            raise ValueError("offset cannot be negative")
+
+        supabase = get_supabase()
+        user_id = get_current_user_id()
+
+        # One extra row tells whether another page follows
+        params = {
+            "p_query": query,
+            "p_limit": limit + 1,
+            "p_offset": offset,
+            "p_user_id": user_id if SearchService.USER_ISOLATION_ENABLED else None,
+        }
+        results = supabase.rpc("search_user_content", params).execute().data or []
+
+        next_offset = offset + limit if len(results) > limit else None
+        return {"results": results[:limit], "next_offset": next_offset}
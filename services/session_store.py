@@ -0,0 +1,136 @@
+"""
+Server-side sessions: the cookie carries only an opaque session id
+
+Flask's default session is the whole dict (user id, email, the Supabase
+access and refresh tokens) signed into the cookie, so every request sent a
+multi-KB cookie that was HMAC-checked and deserialized. With SESSION_STORE set
+to "sqlite", the dict lives on the server, in a WAL-mode file shared by the
+host's workers, and the cookie is a random 43-character id.
+
+The file is a store of its own (services/cache.SQLiteCache, private to this
+user and HMAC-signed like the cache): sessions are never evicted to make room
+for cached payloads, only dropped once they expire.
+
+Session ids change when a different user signs in (no session fixation).
+Unchanged sessions are written back at most once per SESSION_TOUCH_SECONDS to
+extend their lifetime, not on every request. A still-valid signed cookie from
+before the switch is read once and moved into the store, so nobody is
+signed out.
+
+The store is per host: behind a load balancer, or on serverless instances
+that don't share a disk, keep SESSION_STORE="cookie" (the default).
+"""
+
+import secrets
+import time
+from flask.sessions import SecureCookieSession, SecureCookieSessionInterface
+from services.cache import SQLiteCache, private_path
+
+
+class ServerSession(SecureCookieSession):
+    """A session dict plus its id and when the store last saw it"""
+
+    def __init__(self, initial=None, sid=None, saved_at=0.0):
+        super().__init__(initial)
+        self.sid = sid
+        self.saved_at = saved_at
+        self.loaded_user = self.get("user_id") if initial else None
+        self.accessed = False
+
+
+class ServerSideSessionInterface(SecureCookieSessionInterface):
+    """Keeps sessions in a CacheBackend, keyed by the id in the session cookie"""
+
+    def __init__(self, store, touch_seconds=24 * 60 * 60):
+        self.store = store
+        self.touch_seconds = touch_seconds
+
+    @staticmethod
+    def _key(sid):
+        return f"session:{sid}"
+
+    def _lifetime(self, app):
+        return int(app.permanent_session_lifetime.total_seconds())
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if not sid:
+            return ServerSession()
+
+        entry = self.store.get(self._key(sid))
+        if entry is not None:
+            return ServerSession(entry["data"], sid, entry["saved_at"])
+
+        # A signed cookie session from before SESSION_STORE was set
+        legacy = super().open_session(app, request)
+        if legacy:
+            session = ServerSession()
+            session.update(legacy)
+            return session
+        return ServerSession()
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        secure = self.get_cookie_secure(app)
+        samesite = self.get_cookie_samesite(app)
+        httponly = self.get_cookie_httponly(app)
+
+        if session.accessed:
+            response.vary.add("Cookie")
+
+        if not session:
+            if session.modified:
+                if session.sid:
+                    self.store.delete(self._key(session.sid))
+                response.delete_cookie(
+                    name, domain=domain, path=path, secure=secure, samesite=samesite, httponly=httponly
+                )
+                response.vary.add("Cookie")
+            return
+
+        now = time.time()
+        if not session.modified and session.sid and now - session.saved_at < self.touch_seconds:
+            return
+
+        if session.sid and session.get("user_id") != session.loaded_user:
+            # Signed in as someone else: the old id must not carry over
+            self.store.delete(self._key(session.sid))
+            session.sid = None
+        if not session.sid:
+            session.sid = secrets.token_urlsafe(32)
+        session.loaded_user = session.get("user_id")
+        session.saved_at = now
+
+        self.store.set(
+            self._key(session.sid), {"data": dict(session), "saved_at": now}, ttl=self._lifetime(app)
+        )
+        response.set_cookie(
+            name,
+            session.sid,
+            expires=self.get_expiration_time(app, session),
+            httponly=httponly,
+            domain=domain,
+            path=path,
+            secure=secure,
+            samesite=samesite,
+        )
+        response.vary.add("Cookie")
+
+
+def init_app(app):
+    """Switch the app to server-side sessions if SESSION_STORE asks for them"""
+    backend = app.config.get("SESSION_STORE", "cookie")
+    if backend == "cookie":
+        return
+    if backend != "sqlite":
+        raise ValueError(f"Unknown session store: {backend} (use \"cookie\" or \"sqlite\")")
+
+    path = app.config.get("SESSION_PATH") or private_path("sessions.sqlite3")
+    # No max_entries: sessions are only dropped when they expire
+    store = SQLiteCache(path, None, int(app.permanent_session_lifetime.total_seconds()), app.secret_key)
+
+    app.session_interface = ServerSideSessionInterface(
+        store, app.config.get("SESSION_TOUCH_SECONDS", 24 * 60 * 60)
+    )
@@ -0,0 +1,188 @@
+"""
+Vectorized habit statistics over task x day matrices
+
+A user's tasks and logs are loaded once into dense arrays on a shared day axis:
+
+- completed[t, d]  the task has a completed log that day
+- values[t, d]     the logged metric_value (NaN when there is none)
+- scheduled[t, d]  the task's frequency includes that weekday
+
+Every metric ProgressService reports is then a slice and a reduction over
+those arrays for all tasks at once. What this saves is queries: the logs of
+all tasks arrive in a few pages instead of four queries per task. Building
+the arrays from the JSON rows costs about as much CPU as the per-task loops
+did, so this is not a compute speedup (see benchmark_stats.py).
+"""
+
+from datetime import date, timedelta
+from operator import itemgetter
+import numpy as np
+from services.task_service import TaskService
+
+HEALTH_DAYS = 14
+STREAK_DAYS = 365
+
+
+def window_start(today, days, window=HEALTH_DAYS):
+    """First day whose logs affect health_history(days, window)"""
+    return today - timedelta(days=days + window - 2)
+
+
+def schedule_matrix(tasks, start, num_days):
+    """scheduled[t, d]: task t is scheduled on day start + d"""
+    # Weekday of each column with 0 = Sunday, as in TaskService.is_scheduled_for_day
+    day_of_week = (start.weekday() + 1 + np.arange(num_days)) % 7
+    week_masks = np.array(
+        [[TaskService.is_scheduled_for_day(task, dow) for dow in range(7)] for task in tasks],
+        dtype=bool,
+    ).reshape(len(tasks), 7)
+    return week_masks[:, day_of_week]
+
+
+def completion_bitsets(tasks, logs, start, num_days):
+    """Completed days of each task packed 8 per byte (bit d of row t = day start + d)"""
+    row_of = {task["id"]: i for i, task in enumerate(tasks)}
+    completed = np.zeros((len(tasks), num_days), dtype=bool)
+    for log in logs:
+        day = (date.fromisoformat(log["log_date"]) - start).days
+        if log["is_completed"] and log["task_id"] in row_of and 0 <= day < num_days:
+            completed[row_of[log["task_id"]], day] = True
+    return np.packbits(completed, axis=1, bitorder="little")
+
+
+class StatsEngine:
+    def __init__(self, tasks, logs, today=None, first_day=None):
+        """Build the matrices from task rows and log rows (task_id, log_date, is_completed, metric_value)"""
+        self.today = today or date.today()
+        self.task_ids = [task["id"] for task in tasks]
+        # Columns of the log rows, pulled out in C; NumPy parses the ISO dates in one call
+        log_tasks = np.array(list(map(itemgetter("task_id"), logs)))
+        log_days = np.array(list(map(itemgetter("log_date"), logs)), dtype="datetime64[D]")
+        log_done = np.array(list(map(itemgetter("is_completed"), logs)), dtype=bool)
+        log_values = np.array(list(map(itemgetter("metric_value"), logs)), dtype=float)  # None -> NaN
+
+        # Row of each log's task; logs of tasks not passed in are dropped
+        ids = np.array(self.task_ids)
+        order = np.argsort(ids, kind="stable")
+        slots = np.searchsorted(ids[order], log_tasks).clip(max=max(len(ids) - 1, 0))
+        known = ids[order][slots] == log_tasks if len(ids) else np.zeros(len(logs), dtype=bool)
+        rows = order[slots][known]
+        log_days, log_done, log_values = log_days[known], log_done[known], log_values[known]
+
+        # Day axis: covers every log, first_day and at least the streak window; ends at today or later
+        today = np.datetime64(self.today, "D")
+        start = today - (STREAK_DAYS - 1)
+        if first_day is not None:
+            start = min(start, np.datetime64(first_day, "D"))
+        end = today
+        if len(log_days):
+            start = min(start, log_days.min())
+            end = max(end, log_days.max())
+        self.start = start.astype(date)
+        self.today_index = int((today - start).astype(int))
+        num_days = int((end - start).astype(int)) + 1
+
+        days = (log_days - start).astype(np.intp)
+        self.completed = np.zeros((len(tasks), num_days), dtype=bool)
+        self.completed[rows[log_done], days[log_done]] = True
+        self.values = np.full((len(tasks), num_days), np.nan)
+        self.values[rows, days] = log_values
+
+        self.scheduled = schedule_matrix(tasks, self.start, num_days)
+
+    def _window(self, matrix, days):
+        """The last `days` columns up to and including today, newest first"""
+        end = self.today_index + 1
+        return matrix[:, max(end - days, 0):end][:, ::-1]
+
+    def health_scores(self):
+        """14-day completion rate of scheduled days plus a recent-vs-older trend bonus"""
+        return self.health_history(1)[:, 0]
+
+    def health_history(self, days, window=HEALTH_DAYS):
+        """Health score of every task on each of the last `days` days, oldest first.
+
+        Each day's score uses the `window` days ending on it, the newer half
+        being "recent". Window sums come from prefix sums over the day axis, so
+        the whole history costs O(tasks x axis days) whatever the window.
+        Days before the axis start count as unscheduled; build the engine with
+        first_day far enough back (see window_start) for exact scores.
+        """
+        recent_days = window // 2
+
+        # Only the columns some window touches
+        first = max(self.today_index - days - window + 2, 0)
+        cols = slice(first, self.today_index + 1)
+        scheduled = self.scheduled[:, cols]
+        hits = scheduled & self.completed[:, cols]
+
+        # prefix[:, k] = count over the first k columns
+        def prefix(matrix):
+            sums = np.zeros((matrix.shape[0], matrix.shape[1] + 1), dtype=np.int32)
+            np.cumsum(matrix, axis=1, out=sums[:, 1:])
+            return sums
+
+        scheduled_prefix = prefix(scheduled)
+        hits_prefix = prefix(hits)
+        ends = np.maximum(np.arange(self.today_index - days + 2, self.today_index + 2) - first, 0)
+
+        def trailing(sums, length):
+            return sums[:, ends] - sums[:, np.maximum(ends - length, 0)]
+
+        scheduled_count = trailing(scheduled_prefix, window)
+        completed_count = trailing(hits_prefix, window)
+        recent_scheduled = trailing(scheduled_prefix, recent_days)
+        recent_completed = trailing(hits_prefix, recent_days)
+        older_scheduled = scheduled_count - recent_scheduled
+        older_completed = completed_count - recent_completed
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            completion_rate = completed_count / scheduled_count
+            recent_rate = np.where(recent_scheduled > 0, recent_completed / recent_scheduled, 0.0)
+            older_rate = np.where(older_scheduled > 0, older_completed / older_scheduled, 0.0)
+
+        scores = np.clip(completion_rate + (recent_rate - older_rate) * 0.2, 0.0, 1.0)
+        return np.where(scheduled_count > 0, scores, 0.5)
+
+    def streaks(self):
+        """Consecutive completed scheduled days back from today (a miss today doesn't break it)"""
+        scheduled = self._window(self.scheduled, STREAK_DAYS)
+        hits = scheduled & self._window(self.completed, STREAK_DAYS)
+
+        misses = scheduled & ~hits
+        misses[:, 0] = False
+        first_miss = np.where(misses.any(axis=1), misses.argmax(axis=1), misses.shape[1])
+
+        # Completed scheduled days before the first miss
+        hits_before = np.concatenate(
+            [np.zeros((len(hits), 1), dtype=np.intp), hits.cumsum(axis=1)], axis=1
+        )
+        return hits_before[np.arange(len(hits)), first_miss]
+
+    def total_completions(self):
+        """Completed logs per task"""
+        return self.completed.sum(axis=1)
+
+    def average_values(self):
+        """Mean metric_value per task over every logged day (NaN when none)"""
+        counts = (~np.isnan(self.values)).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.nansum(self.values, axis=1) / counts
+
+    def task_stats(self):
+        """The get_task_stats dict for every task, keyed by task id"""
+        health = self.health_scores()
+        totals = self.total_completions()
+        averages = self.average_values()
+        streaks = self.streaks()
+
+        return {
+            task_id: {
+                "task_id": task_id,
+                "health_score": float(health[i]),
+                "total_completions": int(totals[i]),
+                "average_value": None if np.isnan(averages[i]) else float(averages[i]),
+                "current_streak": int(streaks[i]),
+            }
+            for i, task_id in enumerate(self.task_ids)
+        }
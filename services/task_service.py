@@ -2,9 +2,12 @@
 Task business logic service - Supabase version with optional user isolation
 """
 
-from datetime import date, timedelta
-from flask import session
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from flask import g, has_app_context, has_request_context, request, session
 from database.supabase_db import get_supabase
+from services.models import Task
+from services.pagination import paginate
 
 
 def get_current_user_id():
@@ -12,6 +15,31 @@ def get_current_user_id():
     return session.get("user_id")
 
 
+def get_user_timezone():
+    """Get the user's timezone from the tz cookie set by static/js/app.js (UTC if unknown)"""
+    name = request.cookies.get("tz") if has_request_context() else None
+    if name:
+        try:
+            return ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError, OSError):
+            pass
+    return timezone.utc
+
+
+def get_user_today():
+    """Get today's date on the user's wall clock rather than the server's"""
+    return datetime.now(get_user_timezone()).date()
+
+
+def get_task_cache():
+    """Tasks already read during this request (shared with gather() workers)"""
+    if not has_app_context():
+        return {}
+    if "task_cache" not in g:
+        g.task_cache = {}
+    return g.task_cache
+
+
 class TaskService:
     # Set to True after running migration_add_user_id.sql
     USER_ISOLATION_ENABLED = True
@@ -33,7 +61,11 @@ class TaskService:
             )
             return []
 
-        query = supabase.table("tasks").select("*")
+        cache = get_task_cache()
+        if ("all", include_archived) in cache:
+            return cache[("all", include_archived)]
+
+        query = supabase.table("tasks").select(Task.COLUMNS)
 
         # Only filter by user_id if isolation is enabled and user is logged in
         if TaskService.USER_ISOLATION_ENABLED and user_id:
@@ -44,36 +76,66 @@ class TaskService:
             query = query.eq("is_archived", False)
 
         result = query.order("created_at", desc=True).execute()
+        tasks = Task.many(result.data)
 
-        # Debug: Show which tasks were returned and their user_ids
-        for task in result.data:
-            task_user_id = task.get("user_id")
-            task_name = task.get("name")
-            match = "MATCH" if str(task_user_id) == str(user_id) else "MISMATCH"
-            print(
-                f"[DEBUG get_all_tasks] Task '{task_name}' has user_id={task_user_id} ({match})"
-            )
+        # Debug: Show which tasks were returned
+        for task in tasks:
+            print(f"[DEBUG get_all_tasks] Task '{task.name}' (id={task.id})")
+
+        print(f"[DEBUG get_all_tasks] Returned {len(tasks)} tasks")
+        cache[("all", include_archived)] = tasks
+        return tasks
+
+    @staticmethod
+    def get_tasks_page(limit, cursor=None, include_archived=False):
+        """A page of tasks, newest first, and the cursor of the next page"""
+        supabase = get_supabase()
+        user_id = get_current_user_id()
+
+        if TaskService.USER_ISOLATION_ENABLED and not user_id:
+            return [], None
+
+        query = supabase.table("tasks").select(Task.COLUMNS)
+
+        if TaskService.USER_ISOLATION_ENABLED and user_id:
+            query = query.eq("user_id", user_id)
+
+        if not include_archived:
+            query = query.eq("is_archived", False)
 
-        print(f"[DEBUG get_all_tasks] Returned {len(result.data)} tasks")
-        return result.data
+        rows, next_cursor = paginate(query, "created_at", limit, cursor, desc=True)
+        return Task.many(rows), next_cursor
 
     @staticmethod
     def get_task_by_id(task_id):
         """Get a single task by ID"""
+        # Stats helpers look the same task up several times per request
+        cache = get_task_cache()
+        for key in (("all", True), ("all", False)):
+            for task in cache.get(key, ()):
+                if str(task["id"]) == str(task_id):
+                    return task
+        if ("id", str(task_id)) in cache:
+            return cache[("id", str(task_id))]
+
         supabase = get_supabase()
         user_id = get_current_user_id()
 
-        query = supabase.table("tasks").select("*").eq("id", task_id)
+        query = supabase.table("tasks").select(Task.COLUMNS).eq("id", task_id)
 
         if TaskService.USER_ISOLATION_ENABLED and user_id:
             query = query.eq("user_id", user_id)
 
         result = query.execute()
-        return result.data[0] if result.data else None
+        task = Task.first(result.data)
+        if task:
+            cache[("id", str(task_id))] = task
+        return task
 
     @staticmethod
     def create_task(data):
         """Create a new task"""
+        get_task_cache().clear()
         supabase = get_supabase()
         user_id = get_current_user_id()
 
@@ -96,11 +158,12 @@ class TaskService:
             insert_data["user_id"] = user_id
 
         result = supabase.table("tasks").insert(insert_data).execute()
-        return result.data[0] if result.data else None
+        return Task.first(result.data)
 
     @staticmethod
     def update_task(task_id, data):
         """Update an existing task"""
+        get_task_cache().clear()
         supabase = get_supabase()
         user_id = get_current_user_id()
 
@@ -121,13 +184,14 @@ class TaskService:
                 query = query.eq("user_id", user_id)
 
             result = query.execute()
-            return result.data[0] if result.data else None
+            return Task.first(result.data)
 
         return TaskService.get_task_by_id(task_id)
 
     @staticmethod
     def delete_task(task_id):
         """Permanently delete a task and its progress logs"""
+        get_task_cache().clear()
         supabase = get_supabase()
         user_id = get_current_user_id()
 
@@ -141,6 +205,7 @@ class TaskService:
     @staticmethod
     def archive_task(task_id):
         """Archive a task (soft delete)"""
+        get_task_cache().clear()
         supabase = get_supabase()
         user_id = get_current_user_id()
 
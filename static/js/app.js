@@ -1,419 +1,1144 @@
 /**
- * HabitPulse - Main Application JavaScript
+ * Progspresso - App shell JavaScript
+ *
+ * Shared state, utilities and the Habits view. The Tasks and Focus views and
+ * the charts are loaded on demand (see LAZY LOADING below).
  */
 
-// Global state
-let currentWeekStart = null;
+// ===== STATE =====
+let currentView = "habits";
+let weekStart = getCurrentWeekStart();
 let weekData = null;
-let isNavigating = false;
-let navigationController = null;
+let currentTask = null;
+let kanbanData = null;
+let kanbanFetched = false;
+let chart1 = null,
+  chart2 = null,
+  detailChart = null,
+  detailHealthChart = null;
+
+// Prefetch cache for habit details (populated after calendar loads)
+let statsCache = {};
+let cachedSummaryData = null;
+// Daily health scores of every habit (/api/progress/health-history), fetched on first detail open
+let healthHistory = null;
+// Recently shown weeks (week_start -> /api/progress/week payload), least recently used first;
+// the neighbours of the week on screen are prefetched so prev/next render at once
+const WEEK_CACHE_SIZE = 8;
+const weekCache = new Map();
+// Bumped whenever cached weeks are patched or dropped, so an older prefetch is discarded
+let weekCacheVersion = 0;
+
+// Tasks/Focus data fetched with the first week load, used once by kanban.js / pomodoro.js
+const BOOTSTRAP_PATHS = ["/api/focus/stats", "/api/focus/today", "/api/kanban"];
+let prefetched = {};
+
+// The server buckets focus sessions by the user's local day (get_user_timezone)
+document.cookie = `tz=${
+  Intl.DateTimeFormat().resolvedOptions().timeZone
+}; path=/; max-age=31536000; SameSite=Lax`;
+
+/* ===== ICON SETTINGS ===== */
+function openIconSettings() {
+    const modal = document.getElementById('app-settings-modal');
+    if(modal) {
+        modal.classList.add('active');
+        // Load current size
+        const savedSize = localStorage.getItem('iconSize') || 24;
+        const slider = document.getElementById('icon-size-slider');
+        if(slider) slider.value = savedSize;
+    } else {
+        console.error("Modal not found!");
+    }
+}
+
+function closeIconSettings() {
+    const modal = document.getElementById('app-settings-modal');
+    if(modal) modal.classList.remove('active');
+}
+
+function updateIconSize(size) {
+    document.documentElement.style.setProperty('--icon-size-base', size + 'px');
+    localStorage.setItem('iconSize', size);
+}
+
+// Toggle theme between light (milky) and dark (mocha)
+function toggleTheme() {
+    const html = document.documentElement;
+    const isDark = html.getAttribute('data-theme') === 'dark';
+
+    if (isDark) {
+        html.removeAttribute('data-theme');
+        localStorage.setItem('theme', 'light');
+    } else {
+        html.setAttribute('data-theme', 'dark');
+        localStorage.setItem('theme', 'dark');
+    }
 
-// Initialize app
-document.addEventListener("DOMContentLoaded", () => {
-  initializeApp();
+    // Update checkbox state
+    const toggle = document.getElementById('theme-toggle');
+    if (toggle) {
+        toggle.checked = !isDark;
+    }
+}
+
+// Initialize icon size and theme
+document.addEventListener('DOMContentLoaded', () => {
+    // Load saved icon size
+    const savedSize = localStorage.getItem('iconSize') || 24;
+    document.documentElement.style.setProperty('--icon-size-base', savedSize + 'px');
+
+    // Load saved theme - default is light (no system preference check)
+    const savedTheme = localStorage.getItem('theme');
+    if (savedTheme === 'dark') {
+        document.documentElement.setAttribute('data-theme', 'dark');
+        const toggle = document.getElementById('theme-toggle');
+        if (toggle) toggle.checked = true;
+    }
+    // Light theme is default - no need to check system preference
 });
 
-async function initializeApp() {
-  // Set current week start
-  currentWeekStart = getWeekStart(new Date());
+// ===== LAZY LOADING =====
+// Chart.js and charts.js are only needed once week data has arrived
+const CHART_SCRIPTS = [
+  "https://cdn.jsdelivr.net/npm/chart.js",
+  "/static/js/charts.js",
+];
+
+// Views whose markup (/views/<name>) and scripts are fetched on first visit
+const VIEW_SCRIPTS = {
+  kanban: ["/static/js/kanban.js"],
+  focus: ["/static/js/pomodoro.js"],
+};
 
-  // Load week data
-  await loadWeekData();
+// Filled in by view scripts: viewHooks[view] = { init(), show() }
+const viewHooks = {};
+const scriptLoads = {};
+const viewLoads = {};
 
-  // Setup event listeners
-  setupEventListeners();
+function loadScript(src) {
+  if (!scriptLoads[src]) {
+    scriptLoads[src] = new Promise((resolve, reject) => {
+      const s = document.createElement("script");
+      s.src = src;
+      s.onload = resolve;
+      s.onerror = () => {
+        delete scriptLoads[src];
+        s.remove();
+        reject(new Error(`Failed to load ${src}`));
+      };
+      document.head.appendChild(s);
+    });
+  }
+  return scriptLoads[src];
 }
 
-function setupEventListeners() {
-  // Week navigation
-  document
-    .getElementById("prev-week-btn")
-    .addEventListener("click", () => navigateWeek(-1));
-  document
-    .getElementById("next-week-btn")
-    .addEventListener("click", () => navigateWeek(1));
+async function loadScripts(srcs) {
+  // Sequential on purpose: charts.js needs Chart to exist
+  for (const src of srcs) {
+    await loadScript(src);
+  }
+}
 
-  // Add task button
-  document
-    .getElementById("add-task-btn")
-    .addEventListener("click", openAddTaskModal);
+function ensureCharts() {
+  return loadScripts(CHART_SCRIPTS);
+}
 
-  // Download report button
-  document
-    .getElementById("download-report-btn")
-    .addEventListener("click", downloadReport);
+function drawCharts(trendData) {
+  ensureCharts()
+    .then(() => updateCharts(trendData))
+    .catch((e) => console.error("Chart load error:", e));
+}
+
+function ensureView(view) {
+  if (!VIEW_SCRIPTS[view]) return Promise.resolve();
+
+  if (!viewLoads[view]) {
+    viewLoads[view] = (async () => {
+      const r = await fetch(`/views/${view}`);
+      if (!r.ok) throw new Error(`Failed to load ${view} view`);
+      const tpl = document.createElement("template");
+      tpl.innerHTML = await r.text();
+
+      await loadScripts(VIEW_SCRIPTS[view]);
+
+      // Modals go to <body>: .view is transformed, which would trap
+      // position: fixed children inside it
+      const modals = tpl.content.querySelector("[data-view-modals]");
+      if (modals) {
+        modals.remove();
+        document.body.append(...modals.childNodes);
+      }
+      document.getElementById(`${view}-view`).replaceChildren(tpl.content);
+
+      viewHooks[view]?.init?.();
+    })().catch((e) => {
+      delete viewLoads[view];
+      throw e;
+    });
+  }
+  return viewLoads[view];
+}
+
+// ===== INIT =====
+document.addEventListener("DOMContentLoaded", init);
+
+function init() {
+  weekStart = getCurrentWeekStart();
+  loadWeek();
+  connectEvents();
+  document.getElementById("task-form").onsubmit = saveTask;
+  document.getElementById("prog-form").onsubmit = saveProg;
+
+  // Start fetching a view as soon as the user reaches for its toggle
+  Object.keys(VIEW_SCRIPTS).forEach((view) => {
+    document.getElementById(`${view}-toggle`).addEventListener(
+      "pointerenter",
+      () => ensureView(view).catch(() => {}),
+      { once: true }
+    );
+  });
+
+  // Request notification permission
+  if ("Notification" in window && Notification.permission === "default") {
+    Notification.requestPermission();
+  }
+}
+
+// ===== LIVE UPDATES =====
+// Change events from /api/events (services/events.py), only opened where the
+// server has EVENTS_ENABLED (the page's data-live-updates). Views register a
+// handler per event type and patch their state from it. Events are only a
+// hint: they reach the streams of the worker process that made the change, so
+// the tab that writes still re-fetches, and other tabs resync when they come
+// back after a while or their stream reconnects to another worker.
+const eventHandlers = {};
+// A tab hidden this long may have missed changes made on other workers
+const RESYNC_AFTER_HIDDEN_MS = 60000;
+
+function resyncViews() {
+  Object.values(eventHandlers).forEach((handler) => handler({ action: "resync" }));
+}
+
+function connectEvents() {
+  // With or without a stream, a tab that was away a while may be out of date
+  let hiddenAt = null;
+  document.addEventListener("visibilitychange", () => {
+    if (document.hidden) {
+      hiddenAt = Date.now();
+    } else if (hiddenAt !== null && Date.now() - hiddenAt >= RESYNC_AFTER_HIDDEN_MS) {
+      hiddenAt = null;
+      resyncViews();
+    }
+  });
+
+  if (document.body.dataset.liveUpdates !== "on" || !("EventSource" in window)) return;
+
+  const source = new EventSource("/api/events");
+
+  ["progress", "focus", "kanban"].forEach((type) => {
+    source.addEventListener(type, (e) => {
+      if (eventHandlers[type]) eventHandlers[type](JSON.parse(e.data));
+    });
+  });
 
-  // Metric type change (show/hide unit field)
-  document.querySelectorAll('input[name="metric-type"]').forEach((radio) => {
-    radio.addEventListener("change", handleMetricTypeChange);
+  // Events were missed (another worker, a restart or a slow tab): every view re-fetches
+  source.addEventListener("resync", resyncViews);
+}
+
+eventHandlers.progress = (event) => {
+  if (event.action === "resync") {
+    healthHistory = null;
+    clearWeekCache();
+    loadWeekWithoutAnimation();
+    return;
+  }
+
+  const log = event.log;
+  if (!log || !weekData) return;
+  delete statsCache[log.task_id];
+  healthHistory = null;
+
+  // The week on screen is also in weekCache; patch every cached copy of the day
+  weekCacheVersion++;
+  let shown = false;
+  new Set([weekData, ...weekCache.values()]).forEach((week) => {
+    const task = week.tasks.find((t) => t.id === log.task_id);
+    const day = task?.days.find((d) => d.date === log.log_date);
+    if (!day) return;
+    day.log = event.action === "deleted" ? null : log;
+    if (week === weekData) shown = true;
   });
+  if (!shown) return;
+
+  renderHabits();
+  scheduleWeekRefresh();
+};
+
+// ===== WEEK CACHE =====
+function cacheWeek(week) {
+  weekCache.delete(week.week_start);
+  weekCache.set(week.week_start, week);
+  while (weekCache.size > WEEK_CACHE_SIZE) {
+    weekCache.delete(weekCache.keys().next().value);
+  }
+}
+
+function cachedWeek(start) {
+  const week = weekCache.get(start);
+  if (week) cacheWeek(week); // now the most recently used
+  return week;
+}
+
+function clearWeekCache() {
+  weekCache.clear();
+  weekCacheVersion++;
+}
+
+function shiftWeek(start, weeks) {
+  const d = new Date(start);
+  d.setDate(d.getDate() + weeks * 7);
+  return d;
+}
+
+// Fetch the weeks either side of the one on screen in one request (/api/progress/weeks)
+async function prefetchNeighbourWeeks() {
+  const prev = fmt(shiftWeek(weekStart, -1));
+  const next = fmt(shiftWeek(weekStart, 1));
+  if (weekCache.has(prev) && weekCache.has(next)) return;
+
+  const version = weekCacheVersion;
+  try {
+    const r = await fetch(`/api/progress/weeks?date=${prev}&count=3`);
+    if (!r.ok) return;
+    const { weeks } = await r.json();
+    if (version !== weekCacheVersion) return; // a change landed meanwhile
+    // Keep the shown week's object: it is the one live updates patch
+    weeks.filter((w) => w.week_start !== weekData?.week_start).forEach(cacheWeek);
+  } catch (e) {
+    // Navigation falls back to fetching the week
+  }
+}
+
+// Health scores and the trend charts aggregate many logs, so a patched cell
+// leaves them stale; re-fetch them once per burst of changes
+let weekRefreshTimer = null;
+
+function scheduleWeekRefresh() {
+  clearTimeout(weekRefreshTimer);
+  weekRefreshTimer = setTimeout(async () => {
+    const start = fmt(weekStart);
+    const version = weekCacheVersion;
+    try {
+      const { weekData: week, trendData } = await fetchWeekAndTrend(start);
+      cachedSummaryData = trendData;
+      drawCharts(trendData);
+      if (fmt(weekStart) !== start || version !== weekCacheVersion) return;
+
+      weekData = week;
+      cacheWeek(week);
+      // Health is as of today, so every cached week shows the same scores
+      const health = new Map(week.tasks.map((t) => [t.id, t.health_score]));
+      weekCache.forEach((cached) =>
+        cached.tasks.forEach((t) => {
+          if (health.has(t.id)) t.health_score = health.get(t.id);
+        })
+      );
+      renderHabits();
+    } catch (e) {
+      console.error("Week refresh error:", e);
+    }
+  }, 1500);
+}
+
+// ===== VIEW SWITCHING =====
+function switchView(view) {
+  currentView = view;
 
-  // Frequency change (show/hide custom days)
-  document.querySelectorAll('input[name="frequency"]').forEach((radio) => {
-    radio.addEventListener("change", handleFrequencyChange);
+  ["habits", "kanban", "focus"].forEach((v) => {
+    document.getElementById(`${v}-view`).classList.toggle("active", v === view);
+    document.getElementById(`${v}-toggle`).classList.toggle("active", v === view);
   });
+
+  if (!VIEW_SCRIPTS[view]) return;
+
+  ensureView(view)
+    .then(() => {
+      if (currentView === view) viewHooks[view].show();
+    })
+    .catch((e) => {
+      console.error("View load error:", e);
+      toast("error loading view", "error");
+    });
 }
 
-// Week navigation
-function getWeekStart(date) {
-  const d = new Date(date);
-  const day = d.getDay(); // 0 = Sunday
-  const diff = d.getDate() - day;
-  return new Date(d.setDate(diff));
+function handleAddClick() {
+  if (currentView === "habits") {
+    openAddModal();
+  } else if (currentView === "kanban") {
+    ensureView("kanban").then(openKanbanModal);
+  } else if (currentView === "focus") {
+    ensureView("focus").then(openQuickAddModal);
+  }
 }
 
-function formatDate(date) {
-  return date.toISOString().split("T")[0];
+// ===== UTILITY FUNCTIONS =====
+function getCurrentWeekStart() {
+  const now = new Date();
+  const day = now.getDay();
+  const diff = now.getDate() - day;
+  const start = new Date(now.getFullYear(), now.getMonth(), diff);
+  start.setHours(0, 0, 0, 0);
+  return start;
 }
 
-function formatDateDisplay(dateStr) {
-  const date = new Date(dateStr);
-  return date.toLocaleDateString("en-US", { month: "short", day: "numeric" });
+function fmt(d) {
+  const year = d.getFullYear();
+  const month = String(d.getMonth() + 1).padStart(2, "0");
+  const day = String(d.getDate()).padStart(2, "0");
+  return `${year}-${month}-${day}`;
+}
+
+function fmtShort(s) {
+  const parts = s.split("-");
+  const d = new Date(
+    parseInt(parts[0]),
+    parseInt(parts[1]) - 1,
+    parseInt(parts[2])
+  );
+  return d.toLocaleDateString("en-US", {
+    month: "short",
+    day: "numeric",
+  });
 }
 
-function formatFullDate(dateStr) {
-  const date = new Date(dateStr);
-  return date.toLocaleDateString("en-US", {
+function fmtFull(s) {
+  const parts = s.split("-");
+  const d = new Date(
+    parseInt(parts[0]),
+    parseInt(parts[1]) - 1,
+    parseInt(parts[2])
+  );
+  return d.toLocaleDateString("en-US", {
     weekday: "long",
     month: "long",
     day: "numeric",
-    year: "numeric",
   });
 }
 
-async function navigateWeek(direction) {
-  // Cancel any pending navigation request
-  if (navigationController) {
-    navigationController.abort();
-  }
-  
-  // Update the week immediately
-  const newStart = new Date(currentWeekStart);
-  newStart.setDate(newStart.getDate() + direction * 7);
-  currentWeekStart = newStart;
-  
-  // Update the week label immediately for responsiveness
-  const weekEnd = new Date(currentWeekStart);
-  weekEnd.setDate(weekEnd.getDate() + 6);
-  const startLabel = formatDateDisplay(formatDate(currentWeekStart));
-  const endLabel = formatDateDisplay(formatDate(weekEnd));
-  const year = currentWeekStart.getFullYear();
-  document.getElementById("week-label").innerHTML = 
-    `<img src="/static/icons/icon_calendar.png" style="width: 16px; height: 16px; vertical-align: middle; margin-right: 4px;"> ${startLabel} - ${endLabel}, ${year}`;
-  
-  await loadWeekData();
-}
-
-async function loadWeekData() {
-  // Create new abort controller for this request
-  navigationController = new AbortController();
-  const currentController = navigationController;
-  const requestedWeekStart = formatDate(currentWeekStart);
-  
-  try {
-    const response = await fetch(`/api/progress/week?date=${requestedWeekStart}`, {
-      signal: currentController.signal
-    });
+function getTodayStr() {
+  return fmt(new Date());
+}
+
+function openModal(id) {
+  document.getElementById(id).classList.add("active");
+}
+function closeModal(id) {
+  document.getElementById(id).classList.remove("active");
+}
+
+function toast(msg, type = "info") {
+  const c = document.getElementById("toasts");
+  const t = document.createElement("div");
+  t.className = `toast ${type}`;
+  t.textContent = msg;
+  c.appendChild(t);
+  setTimeout(() => t.remove(), 3000);
+}
 
-    if (!response.ok) throw new Error("Failed to load week data");
+// ===== HABITS FUNCTIONALITY =====
 
-    const data = await response.json();
-    
-    // Only apply if this is still the current request (not aborted or superseded)
-    if (currentController === navigationController && formatDate(currentWeekStart) === requestedWeekStart) {
-      weekData = data;
-      renderWeekView();
-      updateCharts();
-    }
-  } catch (error) {
-    // Ignore abort errors - they're expected when navigating quickly
-    if (error.name === 'AbortError') {
-      return;
+// Track if this is the first load (after login)
+let isFirstLoad = true;
+
+// Coffee loading animation helpers
+function showCoffeeLoading() {
+  const loader = document.getElementById('coffee-loading');
+  const table = document.querySelector('#habits-card table');
+
+  if (loader) {
+    if (isFirstLoad) {
+      // First load: Hide table, show standalone animation
+      if (table) {
+        table.style.display = 'none';
+        table.classList.remove('habits-table-reveal');
+      }
+      loader.classList.add('first-load');
+    } else {
+      // Subsequent loads: Overlay on existing content
+      if (table) {
+        table.classList.remove('habits-table-reveal');
+      }
+      loader.classList.remove('first-load');
     }
-    showToast("Failed to load data: " + error.message, "error");
+    // Step 1: Reset to initial state and make VISIBLE with pool at 0%
+    loader.classList.remove('hidden', 'draining', 'filling');
+    loader.classList.add('visible');
+
+    // Step 2: Wait for browser to paint the 0% state
+    // Step 3: Add 'filling' class to animate pool rising from 0% to 100%
+    requestAnimationFrame(() => {
+      requestAnimationFrame(() => {
+        loader.classList.add('filling');
+      });
+    });
   }
 }
 
-function renderWeekView() {
-  // Update week label
-  const weekEnd = new Date(currentWeekStart);
-  weekEnd.setDate(weekEnd.getDate() + 6);
+function hideCoffeeLoading() {
+  const loader = document.getElementById('coffee-loading');
+  const table = document.querySelector('#habits-card table');
+
+  if (loader) {
+    // Immediately show content underneath and switch loader to overlay
+    if (isFirstLoad && table) {
+      table.style.display = ''; // Make table take up space immediately
+      isFirstLoad = false;
+    }
 
-  const startLabel = formatDateDisplay(weekData.week_start);
-  const endLabel = formatDateDisplay(weekData.week_end);
-  const year = new Date(weekData.week_start).getFullYear();
-  document.getElementById(
-    "week-label"
-  ).innerHTML = `<img src=\"/static/icons/icon_calendar.png\" style=\"width: 16px; height: 16px; vertical-align: middle; margin-right: 4px;\"> ${startLabel} - ${endLabel}, ${year}`;
+    // Remove first-load to make it absolute (overlaying the now-visible table)
+    loader.classList.remove("first-load");
 
-  // Update day headers with dates
-  for (let i = 0; i < 7; i++) {
-    const dayDate = new Date(currentWeekStart);
-    dayDate.setDate(dayDate.getDate() + i);
-    const dayHeader = document.getElementById(`day-${i}`);
-    const isToday = formatDate(dayDate) === formatDate(new Date());
-    dayHeader.innerHTML = `<span class="${
-      isToday ? "text-primary-600 font-bold" : ""
-    }">${
-      ["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"][i]
-    }</span><br><span class="text-xs ${
-      isToday ? "text-primary-500" : "text-gray-400"
-    }">${dayDate.getDate()}</span>`;
+    // Start draining animation (pool falls from current height to 0%)
+    loader.classList.remove('filling');
+    loader.classList.add('draining');
+
+    // Cleanup after draining animation completes
+    setTimeout(() => {
+      loader.classList.add('hidden');
+      loader.classList.remove('draining', 'visible');
+    }, 600); // 0.6s matches the drain animation duration
   }
+}
 
-  // Render tasks
-  const tbody = document.getElementById("task-table-body");
-  const emptyState = document.getElementById("empty-state");
+// Run GET requests in one round trip; resolves to [{path, status, body}] in order
+async function batchGet(paths) {
+  const r = await fetch("/api/batch", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ requests: paths }),
+  });
+  if (!r.ok) throw new Error("Batch request failed");
+  return (await r.json()).responses;
+}
 
-  if (weekData.tasks.length === 0) {
-    tbody.innerHTML = "";
-    emptyState.classList.remove("hidden");
-    return;
+// Use (and forget) a response fetched ahead of time by loadWeek()
+function takePrefetched(path) {
+  const body = prefetched[path];
+  delete prefetched[path];
+  return body;
+}
+
+// Week data (required) and 4-week trend (optional), plus any extra paths to prefetch
+async function fetchWeekAndTrend(dateStr, extra = []) {
+  const [week, trend, ...rest] = await batchGet([
+    `/api/progress/week?date=${dateStr}`,
+    "/api/reports/summary?weeks=4",
+    ...extra,
+  ]);
+
+  if (week.status !== 200) throw new Error("Failed to load week data");
+
+  rest.forEach((res) => {
+    if (res.status === 200) prefetched[res.path] = res.body;
+  });
+
+  const trendData = trend.status === 200 && trend.body ? trend.body.summary : null;
+  return { weekData: week.body, trendData };
+}
+
+async function loadWeek() {
+  showCoffeeLoading();
+
+  try {
+    // The first load also brings the other views' data in the same round trip
+    const extra = weekData ? [] : BOOTSTRAP_PATHS;
+    let trendData;
+    ({ weekData, trendData } = await fetchWeekAndTrend(fmt(weekStart), extra));
+
+    // Cache the summary data for use in detail modal
+    cachedSummaryData = trendData;
+    healthHistory = null;
+
+    // A full reload follows task changes, which every cached week shows
+    clearWeekCache();
+    cacheWeek(weekData);
+
+    renderHabits();
+    drawCharts(trendData);
+    hideCoffeeLoading();
+    prefetchNeighbourWeeks();
+
+    // Prefetch stats for all habits in background
+    prefetchHabitStats();
+  } catch (e) {
+    console.error("Load error:", e);
+    toast("error loading habits", "error");
+    hideCoffeeLoading();
   }
+}
 
-  emptyState.classList.add("hidden");
-  tbody.innerHTML = weekData.tasks.map((task) => renderTaskRow(task)).join("");
+// Prefetch all habit stats in background for instant detail modal
+async function prefetchHabitStats() {
+  if (!weekData?.tasks) return;
+
+  // Clear old cache
+  statsCache = {};
+
+  // Fetch all stats in parallel (non-blocking, not awaited)
+  weekData.tasks.forEach(async (task) => {
+    try {
+      const r = await fetch(`/api/progress/stats/${task.id}`);
+      if (r.ok) {
+        const data = await r.json();
+        statsCache[task.id] = data.stats;
+      }
+    } catch (e) {
+      // Silently fail - we'll fetch again when modal opens
+    }
+  });
 }
 
-function renderTaskRow(task) {
-  const healthClass = getHealthClass(task.health_score);
-  const healthColor = getHealthColor(task.health_score);
+// Debounce timer for week navigation
+let navDebounceTimer = null;
+let isNavigating = false;
+
+function navWeek(dir) {
+  const newStart = new Date(weekStart);
+  newStart.setDate(newStart.getDate() + dir * 7);
+  weekStart = newStart;
+
+  // Immediately update the week label for instant feedback
+  const endDate = new Date(weekStart);
+  endDate.setDate(endDate.getDate() + 6);
+  document.getElementById("week-label").textContent = 
+    `${fmtShort(fmt(weekStart))} — ${fmtShort(fmt(endDate))}`;
 
-  let daysHtml = "";
+  // Update day headers immediately
+  const days = ["sun", "mon", "tue", "wed", "thu", "fri", "sat"];
+  const todayStr = getTodayStr();
   for (let i = 0; i < 7; i++) {
-    const day = task.days[i];
-    daysHtml += renderTaskCell(task, day, i);
+    const d = new Date(weekStart);
+    d.setDate(d.getDate() + i);
+    const dateStr = fmt(d);
+    const isToday = dateStr === todayStr;
+    document.getElementById("h" + i).innerHTML =
+      `<span style="${isToday ? "color:var(--brown-dark);font-weight:600" : ""}">${days[i]}</span><br>` +
+      `<span style="font-size:0.75rem;color:${isToday ? "var(--tan-dark)" : "var(--brown-dark)"}">${d.getDate()}</span>`;
   }
 
-  return `
-        <tr class="task-row border-b border-gray-100 ${healthClass}" data-task-id="${
-    task.id
-  }">
-            <td class="px-6 py-3">
-                <div class="flex items-center">
-                    <span class="health-indicator" style="background-color: ${healthColor};" 
-                          title="Health: ${Math.round(
-                            task.health_score * 100
-                          )}%"></span>
-                    <div>
-                        <span class="font-medium text-gray-900">${escapeHtml(
-                          task.name
-                        )}</span>
-                        ${
-                          task.target_value
-                            ? `<span class="text-xs text-gray-500 ml-2">(${
-                                task.target_value
-                              } ${task.metric_unit || ""})</span>`
-                            : ""
-                        }
-                    </div>
-                </div>
-            </td>
-            ${daysHtml}
-            <td class="px-2 py-3">
-                <div class="flex items-center justify-center space-x-1">
-                    <button onclick="openEditTaskModal(${
-                      task.id
-                    })" class="action-btn text-gray-400 hover:text-gray-600" title="Edit">
-                        <svg class="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M11 5H6a2 2 0 00-2 2v11a2 2 0 002 2h11a2 2 0 002-2v-5m-1.414-9.414a2 2 0 112.828 2.828L11.828 15H9v-2.828l8.586-8.586z"></path>
-                        </svg>
-                    </button>
-                    <button onclick="openDeleteModal(${task.id}, '${escapeHtml(
-    task.name
-  )}')" class="action-btn delete text-gray-400" title="Delete">
-                        <svg class="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M19 7l-.867 12.142A2 2 0 0116.138 21H7.862a2 2 0 01-1.995-1.858L5 7m5 4v6m4-6v6m1-10V4a1 1 0 00-1-1h-4a1 1 0 00-1 1v3M4 7h16"></path>
-                        </svg>
-                    </button>
-                </div>
-            </td>
-        </tr>
-    `;
-}
-
-function renderTaskCell(task, day, dayIndex) {
-  if (!day.is_scheduled) {
-    return `<td class="px-4 py-3 text-center task-cell not-scheduled disabled">—</td>`;
+  // Cancel any pending fetch (debounce)
+  clearTimeout(navDebounceTimer);
+
+  // Prefetched or recently shown: render now, no loading animation
+  const cached = cachedWeek(fmt(weekStart));
+  if (cached) {
+    weekData = cached;
+    renderHabits();
+    drawCharts(cachedSummaryData);
+    if (isNavigating) {
+      isNavigating = false;
+      hideCoffeeLoading();
+    }
+    prefetchNeighbourWeeks();
+    return;
   }
 
-  const isCompleted = day.log && day.log.is_completed;
-  const isMissed = !isCompleted && day.is_past && !day.is_today;
-  const isPending = !isCompleted && (day.is_today || !day.is_past);
+  // Show coffee rising on first click of a navigation sequence
+  if (!isNavigating) {
+    isNavigating = true;
 
-  let icon = "○";
-  let stateClass = "pending";
-  let valueDisplay = "";
+    const loader = document.getElementById('coffee-loading');
+    if (loader) {
+      // Step 1: Reset all animation classes
+      loader.classList.remove('hidden', 'draining', 'filling', 'first-load');
 
-  if (isCompleted) {
-    icon = "✓";
-    stateClass = "completed";
-    if (day.log.metric_value !== null && task.metric_type !== "BOOLEAN") {
-      const displayValue = formatMetricValue(
-        day.log.metric_value,
-        task.metric_type,
-        task.metric_unit
-      );
-      valueDisplay = `<div class="metric-value">${displayValue}</div>`;
+      // Step 2: Add 'visible' to show overlay with pool at 0%
+      loader.classList.add('visible');
+
+      // Step 3: Wait for browser to paint the 0% state, then animate rise
+      requestAnimationFrame(() => {
+        requestAnimationFrame(() => {
+          loader.classList.add('filling');
+        });
+      });
     }
-  } else if (isMissed) {
-    icon = "✗";
-    stateClass = "missed";
   }
 
-  const todayClass = day.is_today ? "today" : "";
-  const clickable = !day.is_past || day.is_today || isCompleted;
-  const disabledClass = !clickable ? "disabled" : "";
-
-  return `
-        <td class="px-4 py-3 text-center">
-            <div class="task-cell ${stateClass} ${todayClass} ${disabledClass}" 
-                 ${
-                   clickable
-                     ? `onclick="openProgressModal(${task.id}, '${day.date}')"`
-                     : ""
-                 }>
-                <div>
-                    <span class="text-lg">${icon}</span>
-                    ${valueDisplay}
-                </div>
-            </div>
-        </td>
-    `;
-}
-
-function formatMetricValue(value, metricType, unit) {
-  if (value === null || value === undefined) return "";
-
-  switch (metricType) {
-    case "TIME":
-      return `${value}${unit ? unit.charAt(0) : "m"}`;
-    case "PROGRESS":
-      return `${Math.round(value)}%`;
-    case "INTENSITY":
-      return `${value}/10`;
-    case "COUNT":
-      return `${value}`;
-    default:
-      return "";
+  // Schedule fetch after 400ms of no clicks
+  // This delay ensures user has stopped navigating before we fetch
+  // The coffee animation stays "filled" until fetch completes
+  navDebounceTimer = setTimeout(() => {
+    loadWeekWithoutAnimation();
+  }, 400);
+}
+
+// Load week data without showing animation (animation already shown)
+async function loadWeekWithoutAnimation() {
+  try {
+    let trendData;
+    ({ weekData, trendData } = await fetchWeekAndTrend(fmt(weekStart)));
+    cachedSummaryData = trendData;
+    cacheWeek(weekData);
+
+    renderHabits();
+    drawCharts(trendData);
+    prefetchNeighbourWeeks();
+  } catch (e) {
+    console.error("Load error:", e);
+    toast("error loading habits", "error");
+  } finally {
+    // Now hide the coffee (data is loaded)
+    isNavigating = false;
+    hideCoffeeLoading();
   }
 }
 
-function getHealthClass(score) {
-  if (score >= 0.8) return "health-excellent";
-  if (score >= 0.6) return "health-good";
-  if (score >= 0.4) return "health-moderate";
-  if (score >= 0.2) return "health-poor";
-  return "health-critical";
+function renderHabits() {
+  document.getElementById("week-label").textContent = `${fmtShort(
+    weekData.week_start
+  )} — ${fmtShort(weekData.week_end)}`;
+
+  const days = ["sun", "mon", "tue", "wed", "thu", "fri", "sat"];
+  const todayStr = getTodayStr();
+
+  for (let i = 0; i < 7; i++) {
+    const d = new Date(weekStart);
+    d.setDate(d.getDate() + i);
+    const dateStr = fmt(d);
+    const isToday = dateStr === todayStr;
+    document.getElementById("h" + i).innerHTML =
+      `<span style="${
+        isToday ? "color:var(--brown-dark);font-weight:600" : ""
+      }">${days[i]}</span><br>` +
+      `<span style="font-size:0.75rem;color:${
+        isToday ? "var(--tan-dark)" : "var(--brown-dark)"
+      }">${d.getDate()}</span>`;
+  }
+
+  const tbody = document.getElementById("tbody");
+  const empty = document.getElementById("empty");
+
+  if (!weekData.tasks || !weekData.tasks.length) {
+    tbody.innerHTML = "";
+    empty.classList.remove("hidden");
+    return;
+  }
+  empty.classList.add("hidden");
+
+  tbody.innerHTML = weekData.tasks
+    .map((t) => {
+      let cells = "";
+      for (let i = 0; i < 7; i++) {
+        const day = t.days[i];
+        if (!day.is_scheduled) {
+          cells += `<td><span class="cell disabled">—</span></td>`;
+        } else {
+          const hasLog = day.log !== null && day.log !== undefined;
+          const isCompleted =
+            hasLog &&
+            (day.log.is_completed === true || day.log.is_completed === 1);
+          const isMissed = !isCompleted && day.is_past && !day.is_today;
+
+          let icon, cls;
+          if (isCompleted) {
+            icon = "✓";
+            cls = "done";
+          } else if (isMissed) {
+            icon = "✗";
+            cls = "missed";
+          } else {
+            icon = "○";
+            cls = "pending";
+          }
+
+          const todayClass = day.is_today ? "today" : "";
+          const canClick = !day.is_past || day.is_today || isCompleted;
+          const onclick = canClick
+            ? `onclick="openProg(${t.id},'${day.date}')"`
+            : "";
+
+          cells += `<td><span class="cell ${cls} ${todayClass}" ${onclick}>${icon}</span></td>`;
+        }
+      }
+      const escapedName = t.name
+        .replace(/'/g, "\\'")
+        .replace(/"/g, '\\"');
+      return `<tr>
+          <td><span class="task-name" onclick="openDetail(${t.id})">${t.name}</span></td>
+          ${cells}
+          <td><button class="delete-btn" onclick="openDel(${t.id},'${escapedName}')"><img src="/static/icons/icon_cross.png" style="width: 12px; height: 12px;"></button></td>
+      </tr>`;
+    })
+    .join("");
 }
 
-function getHealthColor(score) {
-  if (score >= 0.8) return "#22c55e";
-  if (score >= 0.6) return "#84cc16";
-  if (score >= 0.4) return "#eab308";
-  if (score >= 0.2) return "#f97316";
-  return "#ef4444";
+function toggleUnit() {
+  const mt = document.getElementById("metric-type").value;
+  document
+    .getElementById("unit-group")
+    .classList.toggle("hidden", mt === "BOOLEAN");
 }
 
-// Modal controls
-function handleMetricTypeChange(e) {
-  const unitSection = document.getElementById("metric-unit-section");
-  if (e.target.value === "BOOLEAN") {
-    unitSection.classList.add("hidden");
-  } else {
-    unitSection.classList.remove("hidden");
+function openAddModal() {
+  // On Focus page, use the Quick Add modal instead
+  if (currentView === 'focus') {
+    openQuickAddModal();
+    return;
   }
+  document.getElementById("modal-title").textContent = "new habit";
+  document.getElementById("task-form").reset();
+  document.getElementById("task-id").value = "";
+  document.getElementById("unit-group").classList.add("hidden");
+  openModal("task-modal");
 }
 
-function handleFrequencyChange(e) {
-  const customDaysSection = document.getElementById("custom-days-section");
-  if (e.target.value === "CUSTOM") {
-    customDaysSection.classList.remove("hidden");
-  } else {
-    customDaysSection.classList.add("hidden");
+async function saveTask(e) {
+  e.preventDefault();
+  const id = document.getElementById("task-id").value;
+  const mt = document.getElementById("metric-type").value;
+  const data = {
+    name: document.getElementById("task-name").value,
+    metric_type: mt,
+    metric_unit:
+      mt !== "BOOLEAN"
+        ? document.getElementById("metric-unit").value
+        : null,
+    target_value: document.getElementById("target-value").value
+      ? parseFloat(document.getElementById("target-value").value)
+      : null,
+    frequency: document.getElementById("frequency").value,
+  };
+  try {
+    if (id) {
+      delete data.metric_type;
+      await fetch(`/api/tasks/${id}`, {
+        method: "PUT",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify(data),
+      });
+    } else {
+      await fetch("/api/tasks", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify(data),
+      });
+    }
+    closeModal("task-modal");
+    toast("saved!", "success");
+    await loadWeek();
+  } catch (e) {
+    toast("error saving", "error");
   }
 }
 
-// Download report
-async function downloadReport() {
+async function undoProgress(logId) {
+  if (!confirm("Are you sure you want to undo this progress?")) return;
+
   try {
-    showToast("Generating report...", "info");
-    const response = await fetch("/api/reports/pdf?weeks=4");
+    const res = await fetch(`/api/progress/${logId}`, {
+      method: "DELETE",
+    });
+    if (res.ok) {
+      closeModal("prog-modal");
+      loadWeek();
+    } else {
+      console.error("Failed to undo progress");
+    }
+  } catch (e) {
+    console.error(e);
+  }
+}
 
-    if (!response.ok) throw new Error("Failed to generate report");
+function openProg(tid, date) {
+  currentTask = weekData.tasks.find((t) => t.id === tid);
+  if (!currentTask) return;
 
-    const blob = await response.blob();
-    const url = window.URL.createObjectURL(blob);
-    const a = document.createElement("a");
-    a.href = url;
-    a.download = "habitpulse_report.pdf";
-    document.body.appendChild(a);
-    a.click();
-    document.body.removeChild(a);
-    window.URL.revokeObjectURL(url);
+  document.getElementById("prog-tid").value = tid;
+  document.getElementById("prog-date").value = date;
+  document.getElementById("prog-name").textContent = currentTask.name;
+  document.getElementById("prog-name").style.fontFamily = "Caveat";
+  document.getElementById("prog-date-label").textContent = fmtFull(date);
+  document.getElementById("prog-date-label").style.fontFamily = "Caveat";
 
-    showToast("Report downloaded!", "success");
-  } catch (error) {
-    showToast("Failed to download report: " + error.message, "error");
+  const day = currentTask.days.find((d) => d.date === date);
+  const val = day?.log?.metric_value || "";
+  const logId = day?.log?.id;
+  const isCompleted = day?.log?.is_completed;
+  const sec = document.getElementById("prog-input");
+  const btnRow = document.querySelector("#prog-form .btn-row");
+
+  let doneBtnHtml = `<button type="submit" class="btn btn-primary handwritten" style="font-size: 1.2rem;">done <span style="font-weight: bold; margin-left: 4px;">✓</span></button>`;
+
+  if (isCompleted) {
+     // Task is done -> Show Undo UI
+     sec.innerHTML = `
+       <div style="text-align:center;padding:1rem;">
+         <div style="font-family:'Caveat';font-size:1.5rem;color:var(--success);margin-bottom:1rem;">Completed!</div>
+         <div style="font-family:'Caveat';font-size:1.2rem;color:var(--ink);">You've already marked this as done.</div>
+       </div>
+     `;
+     doneBtnHtml = `<button type="button" class="btn btn-danger handwritten" style="font-size: 1.2rem; background-color: var(--danger); color: white; border: none;" onclick="undoProgress(${logId})">mark as undone <span style="font-weight: bold; margin-left: 4px;">✗</span></button>`;
+  } else {
+      // Task is pending -> Show Input UI
+      if (currentTask.metric_type === "BOOLEAN") {
+        sec.innerHTML =
+          '<div style="text-align:center;padding:1rem;color:var(--success);"><span style="font-size: 3rem;">✓</span></div><p style="text-align:center;color:var(--brown); font-family: \'Caveat\', cursive; font-size: 1.5rem;">mark as done</p>';
+      } else if (currentTask.metric_type === "INTENSITY") {
+        sec.innerHTML = `<div class="form-group"><label>intensity</label><input type="range" id="prog-val" min="1" max="10" value="${
+          val || 5
+        }"><div style="text-align:center;font-size:1.5rem;font-family:Caveat" id="int-disp">${
+          val || 5
+        }</div></div>`;
+
+        // Attach listener for Intensity
+        setTimeout(() => {
+          const rng = document.getElementById("prog-val");
+          if (rng) {
+            rng.addEventListener("input", (e) => {
+              document.getElementById("int-disp").textContent = e.target.value;
+            });
+          }
+        }, 0);
+
+      } else if (currentTask.metric_type === "PROGRESS") {
+         sec.innerHTML = `<div class="form-group"><label>progress %</label><input type="number" id="prog-val" min="0" max="100" value="${
+          val || 0
+         }"></div>`;
+      } else { // For other metric types like "NUMBER"
+        sec.innerHTML = `<div class="form-group"><label>${
+          currentTask.metric_unit || "value"
+        }</label><input type="number" id="prog-val" min="0" value="${val}" placeholder="enter value"></div>`;
+      }
   }
-}
 
-// Toast notifications
-function showToast(message, type = "info") {
-  const container = document.getElementById("toast-container");
+  // Update Button Row
+  if (btnRow) {
+       btnRow.innerHTML = `
+      <button
+        type="button"
+        class="btn btn-cancel handwritten"
+        style="font-size: 1.2rem;"
+        onclick="closeModal('prog-modal')"
+      >
+        cancel
+      </button>
+      ${doneBtnHtml}
+       `;
+  }
 
-  const bgColor = {
-    success: "bg-green-500",
-    error: "bg-red-500",
-    info: "bg-primary-500",
-    warning: "bg-yellow-500",
-  }[type];
+  // Update static labels/buttons in modal to be handwritten
+  const progModal = document.getElementById("prog-modal");
+  progModal.querySelector("h2").style.fontFamily = "'Caveat', cursive";
 
-  const icon = {
-    success: '<img src="/static/icons/icon_done.png" style="width: 16px; height: 16px;">',
-    error: '<img src="/static/icons/icon_cross.png" style="width: 16px; height: 16px;">',
-    info: '<img src="/static/icons/icon_document.png" style="width: 16px; height: 16px;">',
-    warning: '<img src="/static/icons/icon_stopwatch.png" style="width: 16px; height: 16px;">',
-  }[type];
+  // Notes label
+  const notesLabel = progModal.querySelector("label[for='prog-notes']");
+  if(notesLabel) {
+      notesLabel.style.fontFamily = "'Caveat', cursive";
+      notesLabel.style.fontSize = "1.3rem";
+  }
 
-  const toast = document.createElement("div");
-  toast.className = `toast ${bgColor} text-white px-4 py-3 rounded-lg shadow-lg flex items-center space-x-2`;
-  toast.innerHTML = `<span>${icon}</span><span>${escapeHtml(message)}</span>`;
+  // Textarea
+  const textarea = progModal.querySelector("textarea");
+  if(textarea) {
+      textarea.style.fontFamily = "'Caveat', cursive";
+      textarea.style.fontSize = "1.2rem";
+  }
 
-  container.appendChild(toast);
+  document.getElementById("prog-notes").value = day?.log?.notes || "";
+  openModal("prog-modal");
+}
 
-  setTimeout(() => {
-    toast.classList.add("toast-exit");
-    setTimeout(() => toast.remove(), 300);
-  }, 3000);
+async function saveProg(e) {
+  e.preventDefault();
+  const taskId = parseInt(document.getElementById("prog-tid").value);
+  const date = document.getElementById("prog-date").value;
+  const valEl = document.getElementById("prog-val");
+  const value =
+    currentTask.metric_type !== "BOOLEAN" && valEl
+      ? parseFloat(valEl.value)
+      : null;
+  const notes = document.getElementById("prog-notes").value || null;
+
+  try {
+    const r = await fetch("/api/progress", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ task_id: taskId, date, value, notes }),
+    });
+    if (!r.ok) throw new Error("Failed to save");
+    closeModal("prog-modal");
+    toast("logged!", "success");
+    await loadWeek();
+  } catch (e) {
+    toast("error saving", "error");
+  }
 }
 
-// Utility functions
-function escapeHtml(text) {
-  const div = document.createElement("div");
-  div.textContent = text;
-  return div.innerHTML;
+async function openDetail(tid) {
+  currentTask = weekData.tasks.find((t) => t.id === tid);
+  if (!currentTask) return;
+
+  const loader = document.getElementById("detail-loading");
+  const content = document.getElementById("detail-content");
+
+  // Destroy existing charts immediately
+  if (detailChart) {
+    detailChart.destroy();
+    detailChart = null;
+  }
+  if (detailHealthChart) {
+    detailHealthChart.destroy();
+    detailHealthChart = null;
+  }
+
+  document.getElementById("detail-title").textContent = currentTask.name;
+
+  // Check if we have cached data
+  const hasCachedStats = statsCache[tid];
+  const hasCachedSummary = cachedSummaryData;
+
+  if (hasCachedStats && hasCachedSummary) {
+    // Use cached data - no loading animation needed!
+    openModal("detail-modal");
+    renderDetailContent(tid, hasCachedStats, { summary: hasCachedSummary }, true);
+  } else {
+    // Show loading with coffee filling animation
+    loader.classList.remove("draining");
+    loader.classList.add("visible", "filling");
+    openModal("detail-modal");
+
+    try {
+      // Fetch only what's missing
+      const fetchPromises = [];
+      if (!hasCachedStats) {
+        fetchPromises.push(fetch(`/api/progress/stats/${tid}`));
+      } else {
+        fetchPromises.push(Promise.resolve({ ok: true, json: () => Promise.resolve({ stats: hasCachedStats }) }));
+      }
+      if (!hasCachedSummary) {
+        fetchPromises.push(fetch("/api/reports/summary?weeks=4"));
+      } else {
+        fetchPromises.push(Promise.resolve({ ok: true, json: () => Promise.resolve({ summary: hasCachedSummary }) }));
+      }
+
+      const [statsResponse, summaryResponse] = await Promise.all(fetchPromises);
+
+      const [statsData, summaryData] = await Promise.all([
+        statsResponse.json(),
+        summaryResponse.json()
+      ]);
+
+      // Cache for next time
+      statsCache[tid] = statsData.stats;
+      if (summaryData.summary) cachedSummaryData = summaryData.summary;
+
+      renderDetailContent(tid, statsData.stats, summaryData);
+
+      // Hide loading with draining animation
+      loader.classList.remove("filling");
+      loader.classList.add("draining");
+
+      // Hide completely after drain animation
+      setTimeout(() => {
+        loader.classList.remove("visible", "draining");
+      }, 800);
+    } catch (e) {
+      console.error("Detail error:", e);
+      document.getElementById("stat-health").textContent = "Error";
+      document.getElementById("stat-streak").textContent = "Error";
+      document.getElementById("stat-total").textContent = "Error";
+      document.getElementById("stat-avg").textContent = "Error";
+      loader.classList.remove("visible", "filling", "draining");
+    }
+  }
 }
 
-// API helper
-async function apiRequest(url, method = "GET", data = null) {
-  const options = {
-    method,
-    headers: {
-      "Content-Type": "application/json",
-    },
-  };
+// Helper to render detail modal content
+function renderDetailContent(tid, stats, summaryData, isCached = false) {
+  document.getElementById("stat-health").textContent =
+    Math.round(stats.health_score * 100) + "%";
+  document.getElementById("stat-streak").textContent =
+    stats.current_streak + " days";
+  document.getElementById("stat-total").textContent =
+    stats.total_completions;
+  document.getElementById("stat-avg").textContent = stats.average_value
+    ? stats.average_value.toFixed(1)
+    : "n/a";
+
+  ensureCharts()
+    .then(() => renderDetailChart(tid, summaryData, isCached))
+    .catch((e) => console.error("Chart load error:", e));
 
-  if (data) {
-    options.body = JSON.stringify(data);
+  Promise.all([ensureCharts(), loadHealthHistory()])
+    .then(([, history]) => {
+      // The modal may have moved on to another habit meanwhile
+      if (currentTask?.id === tid) renderHealthHistoryChart(tid, history, isCached);
+    })
+    .catch((e) => console.error("Health history error:", e));
+}
+
+// One request covers every habit; dropped whenever a log changes
+async function loadHealthHistory() {
+  if (!healthHistory) {
+    const r = await fetch("/api/progress/health-history?days=90");
+    if (!r.ok) throw new Error("Failed to load health history");
+    healthHistory = await r.json();
   }
+  return healthHistory;
+}
 
-  const response = await fetch(url, options);
-  const result = await response.json();
+function editCurrentTask() {
+  if (!currentTask) return;
+  closeModal("detail-modal");
+  document.getElementById("modal-title").textContent = "edit habit";
+  document.getElementById("task-id").value = currentTask.id;
+  document.getElementById("task-name").value = currentTask.name;
+  document.getElementById("metric-type").value = currentTask.metric_type;
+  document.getElementById("metric-unit").value =
+    currentTask.metric_unit || "";
+  document.getElementById("target-value").value =
+    currentTask.target_value || "";
+  document.getElementById("frequency").value = currentTask.frequency;
+  toggleUnit();
+  openModal("task-modal");
+}
 
-  if (!response.ok) {
-    throw new Error(result.error || "Request failed");
+function openDel(id, name) {
+  document.getElementById("del-id").value = id;
+  document.getElementById("del-name").textContent = `"${name}"`;
+  openModal("del-modal");
+}
+
+async function doDelete(perm) {
+  const id = document.getElementById("del-id").value;
+  try {
+    await fetch(`/api/tasks/${id}`, {
+      method: "DELETE",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ permanent: perm }),
+    });
+    closeModal("del-modal");
+    toast(perm ? "deleted" : "archived", "success");
+    await loadWeek();
+  } catch (e) {
+    toast("error", "error");
   }
+}
 
-  return result;
+async function downloadPDF() {
+  toast("generating...", "info");
+  try {
+    const r = await fetch("/api/reports/pdf?weeks=4");
+    const blob = await r.blob();
+    const url = URL.createObjectURL(blob);
+    const a = document.createElement("a");
+    a.href = url;
+    a.download = "habits_report.pdf";
+    a.click();
+    URL.revokeObjectURL(url);
+    toast("downloaded!", "success");
+  } catch (e) {
+    toast("error", "error");
+  }
 }
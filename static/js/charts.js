@@ -1,231 +1,288 @@
 /**
- * HabitPulse - Charts JavaScript
+ * Progspresso - Charts JavaScript
+ *
+ * Loaded by ensureCharts() in app.js, after Chart.js itself.
  */
 
-let weeklyChart = null;
-let trendChart = null;
-
-function updateCharts() {
-    if (!weekData || weekData.tasks.length === 0) {
-        // Clear charts if no data
-        if (weeklyChart) {
-            weeklyChart.destroy();
-            weeklyChart = null;
-        }
-        if (trendChart) {
-            trendChart.destroy();
-            trendChart = null;
-        }
-        return;
+// ===== CHART.JS GLOBAL FONT DEFAULTS =====
+// Apply handwritten Caveat font to all chart elements
+Chart.defaults.font.family = "'Caveat', cursive";
+Chart.defaults.font.size = 16;
+// Use bright golden color that matches "Dec 7 - Dec 13" label
+Chart.defaults.color = '#c4a882';
+
+function updateCharts(trendData) {
+  if (!weekData?.tasks?.length) {
+    if (chart1) {
+      chart1.destroy();
+      chart1 = null;
     }
-    
-    updateWeeklyChart();
-    loadTrendChart();
-}
+    if (chart2) {
+      chart2.destroy();
+      chart2 = null;
+    }
+    return;
+  }
 
-function updateWeeklyChart() {
-    const ctx = document.getElementById('weekly-chart').getContext('2d');
-    
-    // Calculate completion percentages for each task
-    const labels = weekData.tasks.map(t => t.name.length > 15 ? t.name.substring(0, 15) + '...' : t.name);
-    const data = weekData.tasks.map(task => {
-        const scheduledDays = task.days.filter(d => d.is_scheduled).length;
-        const completedDays = task.days.filter(d => d.is_scheduled && d.log && d.log.is_completed).length;
-        return scheduledDays > 0 ? Math.round((completedDays / scheduledDays) * 100) : 0;
-    });
-    
-    const backgroundColors = weekData.tasks.map(task => {
-        const score = task.health_score;
-        if (score >= 0.8) return 'rgba(34, 197, 94, 0.8)';
-        if (score >= 0.6) return 'rgba(132, 204, 22, 0.8)';
-        if (score >= 0.4) return 'rgba(234, 179, 8, 0.8)';
-        if (score >= 0.2) return 'rgba(249, 115, 22, 0.8)';
-        return 'rgba(239, 68, 68, 0.8)';
-    });
-    
-    if (weeklyChart) {
-        weeklyChart.destroy();
+  // === CHART 1: This Week ===
+  const ctx1 = document.getElementById("chart1").getContext("2d");
+  const labels = weekData.tasks.map((t) =>
+    t.name.length > 10 ? t.name.slice(0, 10) + ".." : t.name
+  );
+  const data = weekData.tasks.map((t) => {
+    const sched = t.days.filter((d) => d.is_scheduled).length;
+    const done = t.days.filter(
+      (d) =>
+        d.is_scheduled &&
+        d.log &&
+        (d.log.is_completed === true || d.log.is_completed === 1)
+    ).length;
+    return sched ? Math.round((done / sched) * 100) : 0;
+  });
+
+  // Detect theme for chart colors
+  const isDarkMode = document.documentElement.getAttribute('data-theme') === 'dark';
+  const chartTextColor = isDarkMode ? '#f5f0e6' : '#5a4030'; // cream in dark, brown-dark in light
+  const chartGridColor = isDarkMode ? 'rgba(245, 240, 230, 0.1)' : 'rgba(90, 64, 48, 0.1)';
+
+  if (chart1) chart1.destroy();
+  chart1 = new Chart(ctx1, {
+    type: "bar",
+    data: {
+      labels,
+      datasets: [{ data, backgroundColor: "#C7A575", borderRadius: 4 }],
+    },
+    options: {
+      plugins: { legend: { display: false } },
+      scales: {
+        y: {
+          beginAtZero: true,
+          max: 100,
+          ticks: { 
+            callback: (v) => v + "%",
+            color: chartTextColor
+          },
+          grid: { color: chartGridColor }
+        },
+        x: {
+          ticks: { color: chartTextColor },
+          grid: { color: chartGridColor }
+        },
+      },
+    },
+  });
+
+  // === CHART 2: Last 4 Weeks (render immediately with prefetched data) ===
+  if (trendData?.tasks?.length) {
+    const ctx = document.getElementById("chart2").getContext("2d");
+    const weeks = [];
+    for (let i = 3; i >= 0; i--) {
+      const ws = getCurrentWeekStart();
+      ws.setDate(ws.getDate() - i * 7);
+      weeks.push(fmt(ws));
     }
-    
-    weeklyChart = new Chart(ctx, {
-        type: 'bar',
-        data: {
-            labels: labels,
-            datasets: [{
-                label: 'Completion %',
-                data: data,
-                backgroundColor: backgroundColors,
-                borderRadius: 8,
-                borderSkipped: false
-            }]
+
+    const colors = ["#B99566", "#7C9A6E", "#C27C7C", "#8B7355"];
+    const datasets = trendData.tasks.slice(0, 4).map((t, i) => ({
+      label: t.name.length > 8 ? t.name.slice(0, 8) + ".." : t.name,
+      data: weeks.map((w) => {
+        const wd = t.buckets.find((x) => x.start === w);
+        return weekPercent(wd);
+      }),
+      borderColor: colors[i],
+      backgroundColor: colors[i] + "33",
+      fill: true,
+      tension: 0.4,
+    }));
+
+    if (chart2) chart2.destroy();
+    chart2 = new Chart(ctx, {
+      type: "line",
+      data: { labels: weeks.map((w) => fmtShort(w)), datasets },
+      options: {
+        plugins: {
+          legend: {
+            position: "bottom",
+            labels: { 
+              boxWidth: 8, 
+              font: { size: 10 },
+              color: chartTextColor
+            },
+          },
         },
-        options: {
-            responsive: true,
-            maintainAspectRatio: false,
-            plugins: {
-                legend: {
-                    display: false
-                },
-                tooltip: {
-                    callbacks: {
-                        label: function(context) {
-                            return `${context.parsed.y}% complete`;
-                        }
-                    }
-                }
+        scales: {
+          y: {
+            beginAtZero: true,
+            max: 100,
+            ticks: { 
+              callback: (v) => v + "%",
+              color: chartTextColor
             },
-            scales: {
-                y: {
-                    beginAtZero: true,
-                    max: 100,
-                    ticks: {
-                        callback: function(value) {
-                            return value + '%';
-                        }
-                    },
-                    grid: {
-                        color: 'rgba(0,0,0,0.05)'
-                    }
-                },
-                x: {
-                    grid: {
-                        display: false
-                    }
-                }
-            }
-        }
+            grid: { color: chartGridColor }
+          },
+          x: {
+            ticks: { color: chartTextColor },
+            grid: { color: chartGridColor }
+          },
+        },
+      },
     });
+  }
 }
 
-async function loadTrendChart() {
-    try {
-        const response = await fetch('/api/reports/summary?weeks=4');
-        if (!response.ok) throw new Error('Failed to load trend data');
-        
-        const data = await response.json();
-        renderTrendChart(data.summary);
-    } catch (error) {
-        console.error('Failed to load trend chart:', error);
-    }
+// Line chart of the last 4 weeks for the habit detail modal
+// Completion % of one summary bucket (scheduled_days comes from weekly_task_rollups)
+function weekPercent(wd) {
+  return wd && wd.scheduled_days
+    ? Math.round((wd.completed_days / wd.scheduled_days) * 100)
+    : 0;
 }
 
-function renderTrendChart(summary) {
-    const ctx = document.getElementById('trend-chart').getContext('2d');
-    
-    if (!summary.tasks || summary.tasks.length === 0) {
-        if (trendChart) {
-            trendChart.destroy();
-            trendChart = null;
-        }
-        return;
-    }
-    
-    // Get week labels
+function renderDetailChart(tid, summaryData, isCached = false) {
+  const ctx = document.getElementById("detail-chart").getContext("2d");
+
+  const weeks = [];
+  for (let i = 3; i >= 0; i--) {
+    const ws = getCurrentWeekStart();
+    ws.setDate(ws.getDate() - i * 7);
+    weeks.push(fmt(ws));
+  }
+
+  const taskData = summaryData.summary?.tasks?.find((t) => t.id === tid);
+
+  const data = weeks.map((w) => {
+    const wd = taskData?.buckets?.find((x) => x.start === w);
+    return weekPercent(wd);
+  });
+
+  detailChart = new Chart(ctx, {
+    type: "line",
+    data: {
+      labels: weeks.map((w) => fmtShort(w)),
+      datasets: [
+        {
+          data,
+          borderColor: "#B99566",
+          backgroundColor: "rgba(185,149,102,0.2)",
+          fill: true,
+          tension: 0.4,
+        },
+      ],
+    },
+    options: {
+      plugins: { legend: { display: false } },
+      scales: {
+        y: {
+          beginAtZero: true,
+          max: 100,
+          ticks: { callback: (v) => v + "%" },
+        },
+      },
+      animation: {
+        duration: isCached ? 0 : 300 // No animation if cached
+      }
+    },
+  });
+}
+
+// Daily health score of one habit over the health-history range (90 days)
+function renderHealthHistoryChart(tid, history, isCached = false) {
+  const taskHistory = history.tasks.find((t) => t.id === tid);
+  if (!taskHistory) return;
+
+  const start = new Date(history.start + "T00:00:00");
+  const labels = taskHistory.scores.map((_, i) => {
+    const d = new Date(start);
+    d.setDate(d.getDate() + i);
+    return fmtShort(fmt(d));
+  });
+
+  const ctx = document.getElementById("detail-health-chart").getContext("2d");
+  if (detailHealthChart) detailHealthChart.destroy();
+  detailHealthChart = new Chart(ctx, {
+    type: "line",
+    data: {
+      labels,
+      datasets: [
+        {
+          data: taskHistory.scores.map((s) => Math.round(s * 100)),
+          borderColor: "#7C9A6E",
+          backgroundColor: "rgba(124,154,110,0.15)",
+          fill: true,
+          tension: 0.3,
+          pointRadius: 0,
+        },
+      ],
+    },
+    options: {
+      plugins: {
+        legend: { display: false },
+        title: { display: true, text: `health, last ${labels.length} days` },
+      },
+      scales: {
+        y: {
+          beginAtZero: true,
+          max: 100,
+          ticks: { callback: (v) => v + "%" },
+        },
+        x: { ticks: { maxTicksLimit: 6 } },
+      },
+      animation: {
+        duration: isCached ? 0 : 300
+      }
+    },
+  });
+}
+
+// Kept for backwards compatibility (manual refresh)
+async function loadTrend() {
+  try {
+    const r = await fetch("/api/reports/summary?weeks=4");
+    const d = await r.json();
+    if (!d.summary?.tasks?.length) return;
+
+    const ctx = document.getElementById("chart2").getContext("2d");
     const weeks = [];
-    const weekLabels = [];
     for (let i = 3; i >= 0; i--) {
-        const d = new Date();
-        d.setDate(d.getDate() - (i * 7));
-        const weekStart = getWeekStart(d);
-        weeks.push(formatDate(weekStart));
-        weekLabels.push(formatDateDisplay(formatDate(weekStart)));
-    }
-    
-    // Build datasets for each task
-    const datasets = summary.tasks.slice(0, 5).map((task, index) => {
-        const colors = [
-            'rgba(99, 102, 241, 1)',   // Indigo
-            'rgba(236, 72, 153, 1)',   // Pink
-            'rgba(34, 197, 94, 1)',    // Green
-            'rgba(249, 115, 22, 1)',   // Orange
-            'rgba(6, 182, 212, 1)'     // Cyan
-        ];
-        
-        // Get completion rate for each week
-        const data = weeks.map(weekDate => {
-            const weekData = task.weekly_data.find(w => w.week_start === weekDate);
-            if (!weekData) return 0;
-            
-            // Calculate scheduled days for this task in this week
-            // For simplicity, assume 7 days if daily, etc.
-            let scheduledDays = 7;
-            if (task.frequency === 'WEEKDAYS') scheduledDays = 5;
-            if (task.frequency === 'WEEKENDS') scheduledDays = 2;
-            if (task.frequency === 'CUSTOM' && task.custom_days) {
-                scheduledDays = task.custom_days.split(',').length;
-            }
-            
-            return scheduledDays > 0 ? Math.round((weekData.completed_days / scheduledDays) * 100) : 0;
-        });
-        
-        return {
-            label: task.name.length > 12 ? task.name.substring(0, 12) + '...' : task.name,
-            data: data,
-            borderColor: colors[index % colors.length],
-            backgroundColor: colors[index % colors.length].replace('1)', '0.1)'),
-            fill: true,
-            tension: 0.4,
-            borderWidth: 2,
-            pointRadius: 4,
-            pointHoverRadius: 6
-        };
-    });
-    
-    if (trendChart) {
-        trendChart.destroy();
+      const ws = getCurrentWeekStart();
+      ws.setDate(ws.getDate() - i * 7);
+      weeks.push(fmt(ws));
     }
-    
-    trendChart = new Chart(ctx, {
-        type: 'line',
-        data: {
-            labels: weekLabels,
-            datasets: datasets
+
+    const colors = ["#B99566", "#7C9A6E", "#C27C7C", "#8B7355"];
+    const datasets = d.summary.tasks.slice(0, 4).map((t, i) => ({
+      label: t.name.length > 8 ? t.name.slice(0, 8) + ".." : t.name,
+      data: weeks.map((w) => {
+        const wd = t.buckets.find((x) => x.start === w);
+        return weekPercent(wd);
+      }),
+      borderColor: colors[i],
+      backgroundColor: colors[i] + "33",
+      fill: true,
+      tension: 0.4,
+    }));
+
+    if (chart2) chart2.destroy();
+    chart2 = new Chart(ctx, {
+      type: "line",
+      data: { labels: weeks.map((w) => fmtShort(w)), datasets },
+      options: {
+        plugins: {
+          legend: {
+            position: "bottom",
+            labels: { boxWidth: 8, font: { size: 10 } },
+          },
         },
-        options: {
-            responsive: true,
-            maintainAspectRatio: false,
-            plugins: {
-                legend: {
-                    position: 'bottom',
-                    labels: {
-                        boxWidth: 12,
-                        padding: 15,
-                        font: {
-                            size: 11
-                        }
-                    }
-                },
-                tooltip: {
-                    callbacks: {
-                        label: function(context) {
-                            return `${context.dataset.label}: ${context.parsed.y}%`;
-                        }
-                    }
-                }
-            },
-            scales: {
-                y: {
-                    beginAtZero: true,
-                    max: 100,
-                    ticks: {
-                        callback: function(value) {
-                            return value + '%';
-                        }
-                    },
-                    grid: {
-                        color: 'rgba(0,0,0,0.05)'
-                    }
-                },
-                x: {
-                    grid: {
-                        display: false
-                    }
-                }
-            },
-            interaction: {
-                intersect: false,
-                mode: 'index'
-            }
-        }
+        scales: {
+          y: {
+            beginAtZero: true,
+            max: 100,
+            ticks: { callback: (v) => v + "%" },
+          },
+        },
+      },
     });
+  } catch (e) {
+    console.error("Trend error:", e);
+  }
 }
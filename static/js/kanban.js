@@ -0,0 +1,467 @@
+/**
+ * Progspresso - Kanban board JavaScript
+ *
+ * Loaded on first visit to the Tasks view by ensureView("kanban") in app.js.
+ */
+
+let currentKanbanItem = null;
+
+function triggerKanbanAnimation() {
+  const columns = document.querySelectorAll('.kanban-column');
+  columns.forEach(col => {
+    col.classList.remove('animate-cascade');
+    // Force Reflow (void offsetWidth triggers a paint)
+    void col.offsetWidth; 
+    col.classList.add('animate-cascade');
+  });
+}
+
+// ===== KANBAN FUNCTIONALITY =====
+async function loadKanban() {
+  // Clear board immediately to prevent flicker of old content
+  document.getElementById("items-todo").innerHTML = '';
+  document.getElementById("items-progress").innerHTML = '';
+  document.getElementById("items-done").innerHTML = '';
+
+  try {
+    kanbanData = kanbanFetched ? null : takePrefetched("/api/kanban");
+    if (!kanbanData) {
+      const r = await fetch("/api/kanban");
+      if (!r.ok) throw new Error("Failed to load");
+      kanbanData = await r.json();
+    }
+    kanbanFetched = true; // Mark as fetched
+    renderKanban();
+  } catch (e) {
+    console.error("Kanban load error:", e);
+    toast("error loading tasks", "error");
+  }
+}
+
+// Element id suffix of each column in views/kanban.html
+const KANBAN_COLUMNS = { TODO: "todo", IN_PROGRESS: "progress", DONE: "done" };
+
+function renderKanban() {
+  const todo = kanbanData.TODO || [];
+  const progress = kanbanData.IN_PROGRESS || [];
+  const done = kanbanData.DONE || [];
+
+  // Columns are paged: "20+" until a column's last page is loaded
+  Object.entries(KANBAN_COLUMNS).forEach(([status, name]) => {
+    const cursor = kanbanData.next_cursor?.[status];
+    document.getElementById(`count-${name}`).textContent =
+      (kanbanData[status] || []).length + (cursor ? "+" : "");
+    document.getElementById(`${name}-more`).hidden = !cursor;
+  });
+
+  document.getElementById("items-todo").innerHTML = todo
+    .map((i, index) => renderKanbanCard(i, "TODO", index))
+    .join("");
+  document.getElementById("items-progress").innerHTML = progress
+    .map((i, index) => renderKanbanCard(i, "IN_PROGRESS", index))
+    .join("");
+  document.getElementById("items-done").innerHTML = done
+    .map((i, index) => renderKanbanCard(i, "DONE", index))
+    .join("");
+}
+
+async function loadMoreKanban(status) {
+  const cursor = kanbanData?.next_cursor?.[status];
+  if (!cursor) return;
+  try {
+    const r = await fetch(`/api/kanban/column/${status}?cursor=${encodeURIComponent(cursor)}`);
+    if (!r.ok) throw new Error("Failed to load");
+    const page = await r.json();
+    if (kanbanData.next_cursor[status] !== cursor) return; // reloaded meanwhile
+    const loaded = new Set(kanbanData[status].map((i) => i.id));
+    kanbanData[status].push(...page.items.filter((i) => !loaded.has(i.id)));
+    kanbanData.next_cursor[status] = page.next_cursor;
+    renderKanban();
+  } catch (e) {
+    console.error("Kanban page error:", e);
+    toast("error loading tasks", "error");
+  }
+}
+
+function renderKanbanCard(item, status, index = 0) {
+  const dateStr = fmtShort(item.due_date);
+  let actions = "";
+
+  if (status === "TODO") {
+    actions = `
+          <button class="move-btn" onclick="moveKanban(${item.id}, 'IN_PROGRESS')"              >
+          <img src="/static/icons/icon_play.png" style="width: 24px; height: 24px; vertical-align: middle; margin-right: 6px;"> start
+        </button>
+        <button 
+          class="move-btn done-btn" 
+          onclick="moveKanban(${item.id}, 'DONE')"
+        >
+          <img src="/static/icons/icon_done.png" style="width: 24px; height: 24px; vertical-align: middle; margin-right: 6px;"> done
+        </button>`;
+  } else if (status === "IN_PROGRESS") {
+    actions = `
+        <button class="move-btn" onclick="moveKanban(${item.id}, 'TODO')">
+          <img src="/static/icons/icon_arrow_left.png" style="width: 24px; height: 24px; vertical-align: middle; margin-right: 6px;"> back
+        </button>
+        <button class="move-btn done-btn" onclick="moveKanban(${item.id}, 'DONE')">
+          <img src="/static/icons/icon_done.png" style="width: 24px; height: 24px; vertical-align: middle; margin-right: 6px;"> done
+        </button>`;
+  } else { // status === "DONE"
+    actions = `<button class="move-btn" onclick="moveKanban(${item.id}, 'TODO')">
+      <img src="/static/icons/icon_undo.png" style="width: 24px; height: 24px; vertical-align: middle; margin-right: 6px;"> reopen
+    </button>`;
+  }
+
+  return `
+      <div class="kanban-card task-row-animate" style="animation-delay: ${index * 50}ms" onclick="openKanbanEdit(${item.id})">
+          <div class="kanban-card-title">${item.title}</div>
+          <div class="kanban-card-date">
+            <img src="/static/icons/icon_calendar.png" style="width: 20px; height: 20px; vertical-align: middle; margin-right: 4px;"> ${dateStr}
+          </div>
+          <div class="kanban-card-actions" onclick="event.stopPropagation()">
+              ${actions}
+              <button class="move-btn" style="margin-left:auto" onclick="openKanbanDel(${
+                item.id
+              }, '${item.title.replace(/'/g, "\\'")}')"><img src="/static/icons/icon_trash.png" style="width: 24px; height: 24px;"></button>
+          </div>
+      </div>`;
+}
+
+/* ===== CUSTOM DATE PICKER ===== */
+let pickerYear, pickerMonth, selectedDate = null;
+const monthNames = ['January', 'February', 'March', 'April', 'May', 'June', 
+                    'July', 'August', 'September', 'October', 'November', 'December'];
+
+function toggleDatePicker() {
+  const picker = document.getElementById('date-picker');
+  const isActive = picker.classList.contains('active');
+
+  if (isActive) {
+    picker.classList.remove('active');
+  } else {
+    // Initialize to current date or selected date
+    const today = new Date();
+    const existingDate = document.getElementById('kanban-date').value;
+    if (existingDate) {
+      const d = new Date(existingDate);
+      pickerYear = d.getFullYear();
+      pickerMonth = d.getMonth();
+      selectedDate = existingDate;
+    } else {
+      pickerYear = today.getFullYear();
+      pickerMonth = today.getMonth();
+      selectedDate = null;
+    }
+    renderCalendar();
+    picker.classList.add('active');
+    document.getElementById('date-picker-backdrop').classList.add('active');
+  }
+}
+
+function closeDatePicker() {
+  document.getElementById('date-picker').classList.remove('active');
+  document.getElementById('date-picker-backdrop').classList.remove('active');
+}
+
+function renderCalendar() {
+  const grid = document.getElementById('picker-days');
+  const titleEl = document.getElementById('picker-month-year');
+
+  titleEl.textContent = `${monthNames[pickerMonth]} ${pickerYear}`;
+
+  // Get first day of month and total days
+  const firstDay = new Date(pickerYear, pickerMonth, 1).getDay();
+  const daysInMonth = new Date(pickerYear, pickerMonth + 1, 0).getDate();
+  const daysInPrevMonth = new Date(pickerYear, pickerMonth, 0).getDate();
+
+  const todayStr = getTodayStr();
+  let html = '';
+
+  // Previous month days
+  for (let i = firstDay - 1; i >= 0; i--) {
+    const day = daysInPrevMonth - i;
+    html += `<button type="button" class="picker-day other-month" disabled>${day}</button>`;
+  }
+
+  // Current month days
+  for (let day = 1; day <= daysInMonth; day++) {
+    const dateStr = `${pickerYear}-${String(pickerMonth + 1).padStart(2, '0')}-${String(day).padStart(2, '0')}`;
+    const isToday = dateStr === todayStr;
+    const isSelected = dateStr === selectedDate;
+    let classes = 'picker-day';
+    if (isToday) classes += ' today';
+    if (isSelected) classes += ' selected';
+
+    html += `<button type="button" class="${classes}" onclick="selectDay('${dateStr}')">${day}</button>`;
+  }
+
+  // Next month days to fill grid
+  const totalCells = firstDay + daysInMonth;
+  const remainingCells = (7 - (totalCells % 7)) % 7;
+  for (let day = 1; day <= remainingCells; day++) {
+    html += `<button type="button" class="picker-day other-month" disabled>${day}</button>`;
+  }
+
+  grid.innerHTML = html;
+}
+
+function navigateMonth(direction) {
+  pickerMonth += direction;
+  if (pickerMonth < 0) {
+    pickerMonth = 11;
+    pickerYear--;
+  } else if (pickerMonth > 11) {
+    pickerMonth = 0;
+    pickerYear++;
+  }
+  renderCalendar();
+}
+
+function selectDay(dateStr) {
+  selectedDate = dateStr;
+  renderCalendar();
+}
+
+function setDateShortcut(type) {
+  const today = new Date();
+  let targetDate;
+
+  switch (type) {
+    case 'today':
+      targetDate = today;
+      break;
+    case 'tomorrow':
+      targetDate = new Date(today);
+      targetDate.setDate(today.getDate() + 1);
+      break;
+    case 'nextweek':
+      targetDate = new Date(today);
+      targetDate.setDate(today.getDate() + 7);
+      break;
+  }
+
+  selectedDate = fmt(targetDate);
+  pickerYear = targetDate.getFullYear();
+  pickerMonth = targetDate.getMonth();
+  renderCalendar();
+}
+
+function toggleTimeInputs() {
+  const toggle = document.getElementById('time-toggle');
+  const inputs = document.getElementById('time-inputs');
+  const isActive = toggle.classList.contains('active');
+
+  if (isActive) {
+    toggle.classList.remove('active');
+    inputs.classList.remove('active');
+    // Reset to default 11:59 PM
+    document.getElementById('picker-hour').value = 11;
+    document.getElementById('picker-minute').value = 59;
+    document.getElementById('picker-period').value = 'PM';
+  } else {
+    toggle.classList.add('active');
+    inputs.classList.add('active');
+  }
+}
+
+function confirmDateSelection() {
+  if (!selectedDate) {
+    selectedDate = getTodayStr();
+  }
+
+  // Get time values
+  let hour = parseInt(document.getElementById('picker-hour').value) || 11;
+  let minute = parseInt(document.getElementById('picker-minute').value) || 59;
+  const period = document.getElementById('picker-period').value;
+
+  // Convert to 24-hour format
+  if (period === 'PM' && hour !== 12) hour += 12;
+  if (period === 'AM' && hour === 12) hour = 0;
+
+  const timeStr = `${String(hour).padStart(2, '0')}:${String(minute).padStart(2, '0')}`;
+
+  // Update hidden inputs
+  document.getElementById('kanban-date').value = selectedDate;
+  document.getElementById('kanban-time').value = timeStr;
+
+  // Update display
+  const displayDate = new Date(selectedDate);
+  const displayStr = `${monthNames[displayDate.getMonth()].slice(0, 3)} ${displayDate.getDate()}, ${displayDate.getFullYear()}`;
+
+  const timeToggle = document.getElementById('time-toggle');
+  if (timeToggle.classList.contains('active')) {
+    const displayHour = hour > 12 ? hour - 12 : (hour === 0 ? 12 : hour);
+    document.getElementById('kanban-date-display').value = 
+      `${displayStr} at ${displayHour}:${String(minute).padStart(2, '0')} ${period}`;
+  } else {
+    document.getElementById('kanban-date-display').value = displayStr;
+  }
+
+  // Close picker
+  closeDatePicker();
+}
+
+function initDatePickerForEdit(dateStr) {
+  const d = new Date(dateStr);
+  selectedDate = dateStr;
+  pickerYear = d.getFullYear();
+  pickerMonth = d.getMonth();
+
+  // Format display
+  const displayStr = `${monthNames[d.getMonth()].slice(0, 3)} ${d.getDate()}, ${d.getFullYear()}`;
+  document.getElementById('kanban-date-display').value = displayStr;
+  document.getElementById('kanban-date').value = dateStr;
+
+  // Reset time toggle
+  document.getElementById('time-toggle').classList.remove('active');
+  document.getElementById('time-inputs').classList.remove('active');
+  document.getElementById('picker-hour').value = 11;
+  document.getElementById('picker-minute').value = 59;
+  document.getElementById('picker-period').value = 'PM';
+}
+
+// Close date picker when clicking outside
+document.addEventListener('click', function(e) {
+  const wrapper = document.querySelector('.date-picker-wrapper');
+  const picker = document.getElementById('date-picker');
+  if (wrapper && picker && !wrapper.contains(e.target)) {
+    picker.classList.remove('active');
+  }
+});
+
+function openKanbanModal() {
+  document.getElementById("kanban-modal-title").textContent = "new task";
+  document.getElementById("kanban-form").reset();
+  document.getElementById("kanban-id").value = "";
+  // Initialize date picker with today's date
+  initDatePickerForEdit(getTodayStr());
+  openModal("kanban-modal");
+}
+
+function openKanbanEdit(id) {
+  const allItems = [
+    ...(kanbanData.TODO || []),
+    ...(kanbanData.IN_PROGRESS || []),
+    ...(kanbanData.DONE || []),
+  ];
+  currentKanbanItem = allItems.find((i) => i.id === id);
+  if (!currentKanbanItem) return;
+
+  document.getElementById("kanban-modal-title").textContent = "edit task";
+  document.getElementById("kanban-id").value = currentKanbanItem.id;
+  document.getElementById("kanban-title").value = currentKanbanItem.title;
+  document.getElementById("kanban-desc").value =
+    currentKanbanItem.description || "";
+  // Initialize date picker with existing date
+  initDatePickerForEdit(currentKanbanItem.due_date);
+  openModal("kanban-modal");
+}
+
+async function saveKanbanItem(e) {
+  e.preventDefault();
+  const id = document.getElementById("kanban-id").value;
+  const data = {
+    title: document.getElementById("kanban-title").value,
+    description: document.getElementById("kanban-desc").value,
+    due_date: document.getElementById("kanban-date").value,
+  };
+
+  try {
+    if (id) {
+      await fetch(`/api/kanban/${id}`, {
+        method: "PUT",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify(data),
+      });
+    } else {
+      await fetch("/api/kanban", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify(data),
+      });
+    }
+    closeModal("kanban-modal");
+    toast("saved!", "success");
+    await loadKanban();
+  } catch (e) {
+    toast("error saving", "error");
+  }
+}
+
+async function moveKanban(id, newStatus) {
+  try {
+    await fetch(`/api/kanban/${id}/status`, {
+      method: "PUT",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ status: newStatus }),
+    });
+    await loadKanban();
+  } catch (e) {
+    toast("error moving", "error");
+  }
+}
+
+function openKanbanDel(id, title) {
+  document.getElementById("kanban-del-id").value = id;
+  document.getElementById("kanban-del-name").textContent = `"${title}"`;
+  openModal("kanban-del-modal");
+}
+
+async function doKanbanDelete() {
+  const id = document.getElementById("kanban-del-id").value;
+  try {
+    await fetch(`/api/kanban/${id}`, { method: "DELETE" });
+    closeModal("kanban-del-modal");
+    toast("deleted", "success");
+    await loadKanban();
+  } catch (e) {
+    toast("error", "error");
+  }
+}
+
+// Patch the board from another tab's (or this tab's) change
+eventHandlers.kanban = (event) => {
+  if (!kanbanFetched) return; // fetched fresh when the view opens
+  if (event.action === "resync") {
+    loadKanban();
+    return;
+  }
+
+  const changed =
+    event.action === "saved" ? [event.item] :
+    event.action === "reordered" ? event.items : [];
+  const removed = new Set(
+    event.action === "deleted" ? [event.item_id] : changed.map((i) => i.id)
+  );
+
+  ["TODO", "IN_PROGRESS", "DONE"].forEach((status) => {
+    const column = (kanbanData[status] || []).filter((i) => !removed.has(i.id));
+    const byRank = (a, b) =>
+      a.rank_key < b.rank_key ? -1 : a.rank_key > b.rank_key ? 1 : a.id - b.id;
+    const last = column[column.length - 1];
+    changed
+      .filter((i) => i.status === status)
+      // Cards below the loaded part of a column arrive with a later page
+      .filter((i) => !kanbanData.next_cursor?.[status] || !last || byRank(i, last) < 0)
+      .forEach((i) => column.push(i));
+    // Same order as KanbanService._column_query (rank_key is compared byte-wise)
+    column.sort(byRank);
+    kanbanData[status] = column;
+  });
+
+  if (document.getElementById("items-todo")) renderKanban();
+};
+
+viewHooks.kanban = {
+  init() {
+    document.getElementById("kanban-form").onsubmit = saveKanbanItem;
+  },
+  show() {
+    if (!kanbanFetched) {
+      loadKanban().then(() => triggerKanbanAnimation());
+    } else {
+      renderKanban();
+      triggerKanbanAnimation();
+    }
+  },
+};
@@ -1,250 +1,680 @@
-// Pomodoro Timer Functionality
+/**
+ * Progspresso - Focus (Pomodoro) JavaScript
+ *
+ * Loaded on first visit to the Focus view by ensureView("focus") in app.js.
+ */
+
+// Pomodoro state
 let pomodoroState = {
-    isRunning: false,
-    timeLeft: 25 * 60,
-    duration: 25,
-    sessionId: null,
-    linkedTaskId: null,
-    linkedTaskTitle: null,
-    interval: null
+  isRunning: false,
+  timeLeft: 25 * 60,
+  duration: 25,
+  sessionId: null,
+  linkedTaskId: null,
+  linkedTaskTitle: null,
+  interval: null,
 };
 
-// Sound file path - CHANGE THIS TO YOUR PREFERRED SOUND
-const TIMER_SOUND_PATH = '/static/sounds/TIMER_COMPLETE_SOUND.mp3';
+// Task Queue state
+let taskQueue = []; // [{taskId, taskTitle, totalSessions, completedSessions}]
+let todaySessions = []; // as returned by /api/focus/today, newest first
+let todaySessionsCursor = null; // next page of today's sessions, null once all are loaded
+let pendingTask = null; // Task waiting to be added to queue
+let sessionCountInput = 1; // Session count input value
 
-function initPomodoro() {
-    loadFocusStats();
-    loadTodaySessions();
-    updateTimerDisplay();
+// ===== TASK QUEUE FUNCTIONS =====
+function adjustSessionCount(delta) {
+  sessionCountInput = Math.max(1, Math.min(10, sessionCountInput + delta));
+  document.getElementById('session-count-display').textContent = sessionCountInput;
 }
 
-function updateTimerDisplay() {
-    const mins = Math.floor(pomodoroState.timeLeft / 60);
-    const secs = pomodoroState.timeLeft % 60;
-    document.getElementById('timer-display').textContent = 
-        `${mins.toString().padStart(2, '0')}:${secs.toString().padStart(2, '0')}`;
-    
-    // Update progress ring
-    const progress = 1 - (pomodoroState.timeLeft / (pomodoroState.duration * 60));
-    const ring = document.getElementById('timer-ring');
-    if (ring) {
-        const circumference = 2 * Math.PI * 90;
-        ring.style.strokeDashoffset = circumference * (1 - progress);
+function openSessionCountModal(taskId, taskTitle) {
+  pendingTask = { taskId, taskTitle };
+  sessionCountInput = 1;
+  document.getElementById('session-count-display').textContent = '1';
+  document.getElementById('session-task-name').textContent = taskTitle;
+  openModal('session-count-modal');
+}
+
+async function confirmAddToQueue() {
+  if (!pendingTask) return;
+
+  // Auto-move task to "doing" (in-progress) column
+  try {
+    await fetch(`/api/kanban/${pendingTask.taskId}`, {
+      method: 'PUT',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ status: 'doing' })
+    });
+  } catch (e) {
+    console.log('Could not move task to in-progress:', e);
+  }
+
+  // Check if task already in queue
+  const existing = taskQueue.find(t => t.taskId === pendingTask.taskId);
+  if (existing) {
+    existing.totalSessions += sessionCountInput;
+  } else {
+    taskQueue.push({
+      taskId: pendingTask.taskId,
+      taskTitle: pendingTask.taskTitle,
+      totalSessions: sessionCountInput,
+      completedSessions: 0
+    });
+  }
+
+  renderTaskQueue();
+  closeModal('session-count-modal');
+  pendingTask = null;
+
+  // Auto-select first task if none selected
+  if (!pomodoroState.linkedTaskId && taskQueue.length > 0) {
+    selectQueueTask(0);
+  }
+}
+
+// Quick Add Task functions
+let quickSessionCount = 1;
+
+function openQuickAddModal() {
+  quickSessionCount = 1;
+  document.getElementById('quick-session-count').textContent = '1';
+  document.getElementById('quick-task-title').value = '';
+  openModal('quick-add-modal');
+}
+
+function adjustQuickSessions(delta) {
+  quickSessionCount = Math.max(1, Math.min(10, quickSessionCount + delta));
+  document.getElementById('quick-session-count').textContent = quickSessionCount;
+}
+
+async function quickAddTask() {
+  const title = document.getElementById('quick-task-title').value.trim();
+  if (!title) {
+    toast('Please enter a task title', 'error');
+    return;
+  }
+
+  try {
+    // Create task directly in "doing" column
+    const r = await fetch('/api/kanban', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({
+        title: title,
+        status: 'doing',
+        description: '',
+        due_date: new Date().toISOString().split('T')[0]
+      })
+    });
+    const data = await r.json();
+
+    // Add to queue
+    taskQueue.push({
+      taskId: data.item.id,
+      taskTitle: title,
+      totalSessions: quickSessionCount,
+      completedSessions: 0
+    });
+
+    renderTaskQueue();
+    closeModal('quick-add-modal');
+
+    // Auto-select if first task
+    if (taskQueue.length === 1) {
+      selectQueueTask(0);
     }
+
+    toast('Task added to queue!', 'success');
+  } catch (e) {
+    console.error('Failed to create task:', e);
+    toast('Failed to create task', 'error');
+  }
 }
 
-async function startTimer() {
-    if (pomodoroState.isRunning) return;
-    
-    pomodoroState.isRunning = true;
-    document.getElementById('start-btn').classList.add('hidden');
-    document.getElementById('pause-btn').classList.remove('hidden');
-    
-    // Start session in backend
+function renderTaskQueue() {
+  const container = document.getElementById('task-queue-list');
+  if (taskQueue.length === 0) {
+    container.innerHTML = `
+      <div style="text-align: center; color: var(--tan-dark); padding: 1rem 0; font-size: 0.85rem;">
+        <p>No tasks queued yet</p>
+      </div>
+    `;
+    return;
+  }
+
+  container.innerHTML = taskQueue.map((task, idx) => {
+    const isActive = pomodoroState.linkedTaskId === task.taskId;
+    const progress = task.totalSessions > 0 ? Math.round((task.completedSessions / task.totalSessions) * 100) : 0;
+    return `
+      <div class="queue-item" style="
+        display: flex;
+        align-items: center;
+        gap: 0.5rem;
+        padding: 0.5rem;
+        background: ${isActive ? 'var(--tan-light)' : 'var(--cream)'};
+        border: ${isActive ? '2px solid var(--tan-dark)' : '1px solid var(--tan-light)'};
+        border-radius: 8px;
+        margin-bottom: 0.4rem;
+        cursor: pointer;
+        transition: all 0.2s;
+      " onclick="selectQueueTask(${idx})">
+        ${isActive ? '<span style="color: var(--success); font-size: 1.1rem;">▶</span>' : ''}
+        <div style="flex: 1; min-width: 0;">
+          <div style="font-weight: ${isActive ? '600' : '500'}; color: var(--brown-dark); font-size: 0.85rem; overflow: hidden; text-overflow: ellipsis; white-space: nowrap;">${task.taskTitle}</div>
+          <div style="font-size: 0.75rem; color: var(--tan-dark);">
+            ${task.completedSessions}/${task.totalSessions} · ${progress}%
+          </div>
+        </div>
+        <button onclick="event.stopPropagation(); removeQueueItem(${idx})" style="
+          background: none;
+          border: none;
+          cursor: pointer;
+          color: var(--brown);
+          font-size: 1rem;
+          padding: 0.25rem;
+        "><img src="/static/icons/icon_cross.png" style="width: 12px; height: 12px;"></button>
+      </div>
+    `;
+  }).join('');
+}
+
+function selectQueueTask(idx) {
+  if (idx < 0 || idx >= taskQueue.length) return;
+  const task = taskQueue[idx];
+  pomodoroState.linkedTaskId = task.taskId;
+  pomodoroState.linkedTaskTitle = task.taskTitle;
+  renderTaskQueue();
+}
+
+function removeQueueItem(idx) {
+  taskQueue.splice(idx, 1);
+  if (taskQueue.length === 0) {
+    unlinkTask();
+  } else if (idx === 0 || pomodoroState.linkedTaskId === taskQueue[idx]?.taskId) {
+    selectQueueTask(0);
+  }
+  renderTaskQueue();
+}
+
+async function markSessionDone() {
+  // Record the focus session via backend
+  if (pomodoroState.sessionId) {
+    try {
+      await fetch(`/api/focus/complete/${pomodoroState.sessionId}`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ notes: 'Completed via Done button' })
+      });
+    } catch (e) {
+      console.error('Failed to record session:', e);
+    }
+  } else {
+    // If no session was started, create and complete one
     try {
-        const r = await fetch('/api/focus/start', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-                duration_minutes: pomodoroState.duration,
-                kanban_item_id: pomodoroState.linkedTaskId
-            })
+      const r = await fetch('/api/focus/start', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+          duration_minutes: pomodoroState.duration,
+          kanban_item_id: pomodoroState.linkedTaskId
+        })
+      });
+      const data = await r.json();
+      if (data.session && data.session.id) {
+        await fetch(`/api/focus/complete/${data.session.id}`, {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json' },
+          body: JSON.stringify({ notes: 'Manual session via Done button' })
         });
-        const data = await r.json();
-        pomodoroState.sessionId = data.session.id;
-    } catch(e) {
-        console.error('Failed to start session:', e);
+      }
+    } catch (e) {
+      console.error('Failed to create session:', e);
+    }
+  }
+
+  // Find current task in queue and update progress
+  const task = taskQueue.find(t => t.taskId === pomodoroState.linkedTaskId);
+  if (task) {
+    task.completedSessions++;
+
+    // Check if all sessions complete
+    if (task.completedSessions >= task.totalSessions) {
+      document.getElementById('completed-task-name').textContent = task.taskTitle;
+      openModal('more-sessions-modal');
+    }
+  }
+
+  // Reset timer and refresh stats
+  resetTimer();
+  renderTaskQueue();
+  loadFocusStats();
+  loadTodaySessions();
+  toast('Session completed!', 'success');
+}
+
+function removeFromQueue() {
+  const idx = taskQueue.findIndex(t => t.taskId === pomodoroState.linkedTaskId);
+  if (idx !== -1) {
+    taskQueue.splice(idx, 1);
+  }
+  closeModal('more-sessions-modal');
+
+  if (taskQueue.length > 0) {
+    selectQueueTask(0);
+  } else {
+    unlinkTask();
+  }
+  renderTaskQueue();
+}
+
+function promptMoreSessions() {
+  closeModal('more-sessions-modal');
+  const task = taskQueue.find(t => t.taskId === pomodoroState.linkedTaskId);
+  if (task) {
+    openSessionCountModal(task.taskId, task.taskTitle);
+  }
+}
+
+// ===== POMODORO TIMER =====
+function updateTimerDisplay() {
+  const mins = Math.floor(pomodoroState.timeLeft / 60);
+  const secs = pomodoroState.timeLeft % 60;
+  document.getElementById("timer-display").textContent = `${mins
+    .toString()
+    .padStart(2, "0")}:${secs.toString().padStart(2, "0")}`;
+
+  const progress =
+    1 - pomodoroState.timeLeft / (pomodoroState.duration * 60);
+  const ring = document.getElementById("timer-ring");
+  if (ring) {
+    const circumference = 2 * Math.PI * 90;
+    ring.style.strokeDashoffset = circumference * (1 - progress);
+  }
+}
+
+async function startTimer() {
+  if (pomodoroState.isRunning) return;
+
+  pomodoroState.isRunning = true;
+  document.getElementById("start-btn").classList.add("hidden");
+  document.getElementById("prog-modal").classList.remove("hidden");
+
+  // Update static labels/buttons in modal to be handwritten
+  const progModal = document.getElementById("prog-modal");
+  progModal.querySelector("h2").style.fontFamily = "'Caveat', cursive";
+
+  // Notes label
+  const notesLabel = progModal.querySelector("label[for='prog-notes']");
+  if(notesLabel) {
+      notesLabel.style.fontFamily = "'Caveat', cursive";
+      notesLabel.style.fontSize = "1.3rem";
+  }
+
+  // Textarea
+  const textarea = progModal.querySelector("textarea");
+  if(textarea) {
+      textarea.style.fontFamily = "'Caveat', cursive";
+      textarea.style.fontSize = "1.2rem";
+  }
+
+  // Action Buttons
+  const btns = progModal.querySelectorAll("button");
+  btns.forEach(btn => {
+      btn.style.fontFamily = "'Caveat', cursive";
+      btn.style.fontSize = "1.2rem";
+  });
+  document.getElementById("pause-btn").classList.remove("hidden");
+  document.getElementById("done-btn").classList.remove("hidden"); // Show Done button
+  document.querySelector(".timer-circle").classList.add("running"); // Add pulse animation
+
+  try {
+    const r = await fetch("/api/focus/start", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({
+        duration_minutes: pomodoroState.duration,
+        kanban_item_id: pomodoroState.linkedTaskId,
+      }),
+    });
+    const data = await r.json();
+    pomodoroState.sessionId = data.session.id;
+  } catch (e) {
+    console.error("Failed to start session:", e);
+  }
+
+  pomodoroState.interval = setInterval(() => {
+    pomodoroState.timeLeft--;
+    updateTimerDisplay();
+
+    if (pomodoroState.timeLeft <= 0) {
+      completeTimer();
     }
-    
-    pomodoroState.interval = setInterval(() => {
-        pomodoroState.timeLeft--;
-        updateTimerDisplay();
-        
-        if (pomodoroState.timeLeft <= 0) {
-            completeTimer();
-        }
-    }, 1000);
+  }, 1000);
 }
 
 function pauseTimer() {
-    if (!pomodoroState.isRunning) return;
-    
-    pomodoroState.isRunning = false;
-    clearInterval(pomodoroState.interval);
-    document.getElementById('start-btn').classList.remove('hidden');
-    document.getElementById('pause-btn').classList.add('hidden');
+  if (!pomodoroState.isRunning) return;
+
+  pomodoroState.isRunning = false;
+  clearInterval(pomodoroState.interval);
+  document.getElementById("start-btn").classList.remove("hidden");
+  document.getElementById("pause-btn").classList.add("hidden");
+  document.querySelector(".timer-circle").classList.remove("running"); // Remove pulse animation
 }
 
 async function completeTimer() {
-    pauseTimer();
-    playSound();
-    
-    // Complete session in backend
-    if (pomodoroState.sessionId) {
-        try {
-            await fetch(`/api/focus/complete/${pomodoroState.sessionId}`, {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({})
-            });
-        } catch(e) {
-            console.error('Failed to complete session:', e);
-        }
+  pauseTimer();
+  playTimerSound();
+  // Add completion celebration animation
+  const timerCircle = document.querySelector(".timer-circle");
+  timerCircle.classList.add("complete");
+  setTimeout(() => timerCircle.classList.remove("complete"), 600);
+
+  if (pomodoroState.sessionId) {
+    try {
+      await fetch(`/api/focus/complete/${pomodoroState.sessionId}`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({}),
+      });
+    } catch (e) {
+      console.error("Failed to complete session:", e);
     }
-    
-    toast('Focus session complete!', 'success');
-    resetTimer();
-    loadFocusStats();
-    loadTodaySessions();
+  }
+
+  toast("Focus session complete!", "success");
+  resetTimer();
+  loadFocusStats();
+  loadTodaySessions();
 }
 
 function resetTimer() {
-    pauseTimer();
-    pomodoroState.timeLeft = pomodoroState.duration * 60;
-    pomodoroState.sessionId = null;
-    updateTimerDisplay();
+  pauseTimer();
+  pomodoroState.timeLeft = pomodoroState.duration * 60;
+  pomodoroState.sessionId = null;
+  document.getElementById("done-btn").classList.add("hidden"); // Hide Done button
+  updateTimerDisplay();
 }
 
 function setTimerDuration(mins) {
-    pomodoroState.duration = mins;
-    pomodoroState.timeLeft = mins * 60;
+  const previousDuration = pomodoroState.duration;
+  pomodoroState.duration = mins;
+  pomodoroState.timeLeft = mins * 60;
+
+  // Update button states first
+  document.querySelectorAll(".duration-btn").forEach((btn) => {
+    btn.classList.remove("active");
+    if (parseInt(btn.dataset.mins) === mins) btn.classList.add("active");
+  });
+
+  // Get the modal and add exit animation
+  const modal = document.getElementById("timer-settings-modal");
+  const modalBox = modal.querySelector(".modal-box");
+  modalBox.classList.add("exiting");
+
+  // Wait for pop animation to complete, then close and animate timer
+  setTimeout(() => {
+    modalBox.classList.remove("exiting");
+    modal.classList.remove("active");
+
+    // Update timer display
     updateTimerDisplay();
-    closeModal('timer-settings-modal');
-    
-    // Update active button
-    document.querySelectorAll('.duration-btn').forEach(btn => {
-        btn.classList.remove('active');
-        if (parseInt(btn.dataset.mins) === mins) btn.classList.add('active');
-    });
+
+    // Add scroll animation to timer based on direction
+    const timerDisplay = document.getElementById("timer-display");
+    timerDisplay.classList.remove("scroll-up", "scroll-down");
+
+    // Force reflow to restart animation
+    void timerDisplay.offsetWidth;
+
+    if (mins > previousDuration) {
+      timerDisplay.classList.add("scroll-up");
+    } else if (mins < previousDuration) {
+      timerDisplay.classList.add("scroll-down");
+    }
+
+    // Remove animation class after it completes
+    setTimeout(() => {
+      timerDisplay.classList.remove("scroll-up", "scroll-down");
+    }, 400);
+  }, 150);
 }
 
 function linkTask(taskId, taskTitle) {
-    pomodoroState.linkedTaskId = taskId;
-    pomodoroState.linkedTaskTitle = taskTitle;
-    document.getElementById('linked-task').textContent = taskTitle || 'No task linked';
-    closeModal('link-task-modal');
+  // Open session count modal instead of directly linking
+  closeModal("link-task-modal");
+  openSessionCountModal(taskId, taskTitle);
 }
 
 function unlinkTask() {
-    pomodoroState.linkedTaskId = null;
-    pomodoroState.linkedTaskTitle = null;
-    document.getElementById('linked-task').textContent = 'No task linked';
+  pomodoroState.linkedTaskId = null;
+  pomodoroState.linkedTaskTitle = null;
+  const linkedEl = document.getElementById("linked-task");
+  const btn = document.getElementById("choose-task-btn");
+  linkedEl.textContent = "Choose Task to focus on";
+  btn.style.borderColor = "var(--tan-light)";
+  btn.style.background = "var(--paper)";
 }
 
-function playSound() {
-    try {
-        const audio = new Audio(TIMER_SOUND_PATH);
-        audio.play().catch(() => {
-            // Fallback: browser notification
-            if (Notification.permission === 'granted') {
-                new Notification('Focus Session Complete!', {
-                    body: 'Great work! Take a break.',
-                    icon: '/static/icons/icon_tomato.png'
-                });
-            }
+function playTimerSound() {
+  try {
+    // Try to play sound - replace TIMER_COMPLETE_SOUND.mp3 with your own
+    const audio = new Audio("/static/sounds/TIMER_COMPLETE_SOUND.mp3");
+    audio.play().catch(() => {
+      if (Notification.permission === "granted") {
+        new Notification("Focus Session Complete!", {
+          body: "Great work! Take a break.",
         });
-    } catch(e) {
-        console.log('Sound not available');
-    }
+      }
+    });
+  } catch (e) {
+    console.log("Sound not available");
+  }
 }
 
 async function loadFocusStats() {
-    try {
-        const r = await fetch('/api/focus/stats');
-        const data = await r.json();
-        const stats = data.stats;
-        
-        document.getElementById('today-hours').textContent = stats.today_hours + 'h';
-        document.getElementById('week-hours').textContent = stats.week_hours + 'h';
-        document.getElementById('focus-streak').textContent = stats.streak_days + ' days';
-        
-        // Update motivation display
-        const mot = stats.motivation_level;
-        const box = document.getElementById('motivation-box');
-        const img = document.getElementById('motivation-image');
-        const txt = document.getElementById('motivation-text');
-        
-        if (box && img && txt) {
-            box.classList.remove('hidden');
-            img.src = mot.image_url;
-            txt.textContent = mot.message;
-            txt.style.color = 'var(--danger)';
-        }
-    } catch(e) {
-        console.error('Failed to load stats:', e);
-    }
+  try {
+    const data =
+      takePrefetched("/api/focus/stats") ||
+      (await (await fetch("/api/focus/stats")).json());
+    renderFocusStats(data.stats);
+  } catch (e) {
+    console.error("Failed to load stats:", e);
+  }
+}
+
+function renderFocusStats(stats) {
+  document.getElementById("today-hours").textContent =
+    stats.today_hours + "h";
+  document.getElementById("week-hours").textContent =
+    stats.week_hours + "h";
+  document.getElementById("focus-streak").textContent =
+    stats.streak_days + " days";
+
+  const mot = stats.motivation_level;
+  const img = document.getElementById('motivation-image');
+  const txt = document.getElementById('motivation-text');
+
+  if (img && txt && mot) {
+      img.src = mot.image_url;
+      txt.textContent = mot.message;
+      txt.style.color = mot.color || 'var(--brown)';
+  }
+}
+
+// Clear sessions confirmation
+function confirmClearSessions() {
+  if (confirm("Are you sure you want to clear today's sessions? This cannot be undone.")) {
+    clearTodaySessions();
+  }
+}
+
+async function clearTodaySessions() {
+  try {
+    await fetch('/api/focus/clear-today', { method: 'DELETE' });
+    loadTodaySessions();
+    loadFocusStats();
+    toast('Sessions cleared!', 'success');
+  } catch (e) {
+    console.error('Failed to clear sessions:', e);
+    toast('Could not clear sessions', 'error');
+  }
 }
 
 async function loadTodaySessions() {
-    try {
-        const r = await fetch('/api/focus/today');
-        const data = await r.json();
-        const container = document.getElementById('session-history');
-        
-        if (!data.sessions || !data.sessions.length) {
-            container.innerHTML = '<p style="color:var(--brown);text-align:center;padding:1rem">No sessions yet today</p>';
-            return;
-        }
-        
-        container.innerHTML = data.sessions.map(s => `
-            <div class="session-item">
-                <span class="session-task">${s.task_title || 'Free focus'}</span>
-                <span class="session-duration">${s.duration_minutes} min</span>
-                <span class="session-status">${s.is_completed ? '<img src="/static/icons/icon_done.png" style="width: 14px; height: 14px;">' : '...'}</span>
-            </div>
-        `).join('');
-    } catch(e) {
-        console.error('Failed to load sessions:', e);
-    }
+  try {
+    const data =
+      takePrefetched("/api/focus/today") ||
+      (await (await fetch("/api/focus/today")).json());
+    todaySessions = data.sessions || [];
+    todaySessionsCursor = data.next_cursor || null;
+    renderTodaySessions();
+  } catch (e) {
+    console.error("Failed to load sessions:", e);
+  }
 }
 
-function openTimerSettings() {
-    openModal('timer-settings-modal');
-}
-
-function openLinkTaskModal() {
-    // Populate with available tasks
-    const container = document.getElementById('linkable-tasks');
-    const allTasks = [...(kanbanData?.TODO || []), ...(kanbanData?.IN_PROGRESS || [])];
-    
-    if (!allTasks.length) {
-        container.innerHTML = '<p style="text-align:center;color:var(--brown)">No tasks available</p>';
-    } else {
-        container.innerHTML = allTasks.map(t => `
-            <button class="linkable-task-btn" onclick="linkTask(${t.id}, '${t.title.replace(/'/g, "\\'")}')">
-                ${t.title}
-            </button>
-        `).join('');
-    }
-    openModal('link-task-modal');
+async function loadMoreSessions() {
+  const cursor = todaySessionsCursor;
+  if (!cursor) return;
+  try {
+    const r = await fetch(`/api/focus/today?cursor=${encodeURIComponent(cursor)}`);
+    if (!r.ok) throw new Error("Failed to load");
+    const page = await r.json();
+    if (todaySessionsCursor !== cursor) return; // reloaded meanwhile
+    const loaded = new Set(todaySessions.map((s) => s.id));
+    todaySessions.push(...page.sessions.filter((s) => !loaded.has(s.id)));
+    todaySessionsCursor = page.next_cursor || null;
+    renderTodaySessions();
+  } catch (e) {
+    console.error("Failed to load sessions:", e);
+    toast("error loading sessions", "error");
+  }
 }
 
-/* ===== ICON SETTINGS ===== */
-function openIconSettings() {
-    const modal = document.getElementById('app-settings-modal');
-    modal.classList.add('active');
-    
-    // Load current size
-    const savedSize = localStorage.getItem('iconSize') || 24;
-    document.getElementById('icon-size-slider').value = savedSize;
+function renderTodaySessions() {
+  const container = document.getElementById("session-history");
+  // Paged like the kanban columns: "show more" until the last page is loaded
+  document.getElementById("sessions-more").hidden = !todaySessionsCursor;
+
+  if (!todaySessions.length) {
+    container.innerHTML =
+      '<p style="color:var(--brown);text-align:center;padding:1rem">No sessions yet today</p>';
+    return;
+  }
+
+  container.innerHTML = todaySessions
+    .map(
+      (s) => `
+    <div class="session-item">
+      <span class="session-task">${s.task_title || "Free focus"}</span>
+      <span class="session-duration">${s.duration_minutes} min</span>
+      <span class="session-status">${
+        s.is_completed 
+          ? '<img src="/static/icons/icon_done.png" style="width: 14px; height: 14px; vertical-align: middle;">' 
+          : "..."
+      }</span>
+    </div>
+  `
+    )
+    .join("");
 }
 
-function closeIconSettings() {
-    document.getElementById('app-settings-modal').classList.remove('active');
+// Patch today's list and the totals from a focus change event
+// Events don't carry the totals; re-fetch them once per burst of changes
+let focusStatsTimer = null;
+
+function scheduleFocusStatsRefresh() {
+  clearTimeout(focusStatsTimer);
+  focusStatsTimer = setTimeout(loadFocusStats, 500);
 }
 
-function updateIconSize(size) {
-    document.documentElement.style.setProperty('--icon-size-base', size + 'px');
-    localStorage.setItem('iconSize', size);
+eventHandlers.focus = (event) => {
+  if (event.action === "resync") {
+    loadFocusStats();
+    loadTodaySessions();
+    return;
+  }
+
+  // Starting a session doesn't change the totals; completing or removing does
+  if (event.action !== "saved" || event.session?.is_completed) {
+    scheduleFocusStatsRefresh();
+  }
+
+  if (event.action === "cleared") {
+    if (event.local_day === getTodayStr()) {
+      todaySessions = [];
+      todaySessionsCursor = null;
+    }
+  } else if (event.action === "deleted") {
+    todaySessions = todaySessions.filter((s) => s.id !== event.session_id);
+  } else if (event.session && event.session.local_day === getTodayStr()) {
+    const session = event.session;
+    const existing = todaySessions.find((s) => s.id === session.id);
+    if (!session.task_title && session.kanban_item_id) {
+      const item = ["TODO", "IN_PROGRESS", "DONE"]
+        .flatMap((status) => kanbanData?.[status] || [])
+        .find((i) => i.id === session.kanban_item_id);
+      session.task_title = existing?.task_title || item?.title || null;
+    }
+    // Newest first, as returned by /api/focus/today
+    todaySessions = [session, ...todaySessions.filter((s) => s.id !== session.id)].sort(
+      (a, b) => (a.started_at < b.started_at ? 1 : -1)
+    );
+  }
+  renderTodaySessions();
+};
+
+function openTimerSettings() {
+  openModal("timer-settings-modal");
 }
 
-// Initialize icon size
-document.addEventListener('DOMContentLoaded', () => {
-    const savedSize = localStorage.getItem('iconSize') || 24;
-    document.documentElement.style.setProperty('--icon-size-base', savedSize + 'px');
-});
+async function openLinkTaskModal() {
+  // The board is only fetched by kanban.js once the Tasks view is opened
+  if (!kanbanFetched) {
+    try {
+      kanbanData = takePrefetched("/api/kanban");
+      if (!kanbanData) {
+        const r = await fetch("/api/kanban");
+        if (r.ok) kanbanData = await r.json();
+      }
+      if (kanbanData) kanbanFetched = true;
+    } catch (e) {
+      console.error("Failed to load tasks:", e);
+    }
+  }
+
+  const container = document.getElementById("linkable-tasks");
+  const allTasks = [
+    ...(kanbanData?.TODO || []),
+    ...(kanbanData?.IN_PROGRESS || []),
+  ];
 
-// Request notification permission
-if ('Notification' in window && Notification.permission === 'default') {
-    Notification.requestPermission();
+  if (!allTasks.length) {
+    container.innerHTML =
+      '<p style="text-align:center;color:var(--brown)">No tasks available. Add some in Tasks view!</p>';
+  } else {
+    container.innerHTML = allTasks
+      .map(
+        (t) => `
+      <button class="linkable-task-btn" onclick="linkTask(${
+        t.id
+      }, '${t.title.replace(/'/g, "\\'")}')">
+        ${t.title}
+      </button>
+    `
+      )
+      .join("");
+  }
+  openModal("link-task-modal");
 }
+
+viewHooks.focus = {
+  show() {
+    loadFocusStats();
+    loadTodaySessions();
+    // Always update timer display as it's local state
+    updateTimerDisplay();
+  },
+};